@@ -18,16 +18,22 @@
 
     # ClickHouse 데이터 사용
     python run_backtest.py --source clickhouse
+    python run_backtest.py --source clickhouse --cache           # 조회 결과를 .cache/에 저장해 재실행 시 재사용
+    python run_backtest.py --source clickhouse --refresh-cache   # 캐시 무시하고 재조회 후 다시 저장
 
     # 여러 전략 비교
     python run_backtest.py --compare split_buy ma_strategy
     python run_backtest.py --compare split_buy ma_strategy --sample
+    python run_backtest.py --compare split_buy ma_strategy ma_cross --jobs 3   # 병렬 실행
 
     # 등록된 전략 목록 확인
     python run_backtest.py --list
 """
 
 import argparse
+import hashlib
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import date
 from pathlib import Path
 
@@ -38,8 +44,64 @@ from trading_system.backtest.engine import BacktestEngine
 from trading_system.backtest.metrics import BacktestMetrics
 from trading_system.strategies import create_strategy, list_strategies
 from trading_system.utils.config import Config
-from trading_system.utils.logger import setup_logger
-from trading_system.data.clickhouse_provider import ClickHouseDataProvider
+from trading_system.utils.logger import init_worker_logger, setup_logger
+
+
+def _simulate_price_path(
+    rng: np.random.Generator,
+    n: int,
+    initial_price: float,
+    volatility: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """랜덤워크 종가 경로 + 시가/고가/저가/거래량 배열 생성.
+
+    각 단계를 out= 인자로 제자리 연산하여 중간 임시 배열 생성을 최소화한다.
+    전역 난수 상태 대신 전달받은 rng만 사용하므로 여러 스레드에서 동시에 호출해도 안전.
+
+    Returns:
+        (open, high, low, close, volume) 배열 튜플. 가격은 원 단위로 반올림된 float32,
+        거래량은 int32.
+    """
+    close = rng.normal(0.0002, volatility, n)
+    close += 1
+    np.cumprod(close, out=close)
+    close *= initial_price
+
+    # 고가/저가/시가 노이즈를 (3, n) 표준정규 난수 한 번으로 생성
+    eps = rng.standard_normal((3, n))
+    high, low, open_price = eps
+
+    np.abs(high, out=high)
+    high *= 0.01
+    high += 1
+    high *= close
+
+    np.abs(low, out=low)
+    low *= -0.01
+    low += 1
+    low *= close
+
+    open_price *= 0.005
+    open_price += 1
+    open_price *= close
+
+    volume = rng.lognormal(12, 1, n).astype(np.int32)
+
+    # 반올림과 float32 변환을 한 번의 패스로 처리
+    prices = np.empty((4, n), dtype=np.float32)
+    for i, arr in enumerate((open_price, high, low, close)):
+        np.rint(arr, out=prices[i], casting="same_kind")
+
+    return prices[0], prices[1], prices[2], prices[3], volume
+
+
+def _ticker_seed(ticker: str) -> int:
+    """종목 코드로부터 고정 시드 계산.
+
+    내장 hash()는 프로세스마다(PYTHONHASHSEED) 값이 달라지므로
+    실행할 때마다 같은 샘플 데이터가 나오도록 blake2b 해시를 사용.
+    """
+    return int.from_bytes(hashlib.blake2b(ticker.encode(), digest_size=4).digest(), "little")
 
 
 def generate_sample_data(
@@ -48,34 +110,31 @@ def generate_sample_data(
     end_date: date,
     initial_price: float = 70000,
     volatility: float = 0.02,
+    dates: np.ndarray | None = None,
 ) -> pd.DataFrame:
-    """백테스트용 샘플 주가 데이터 생성."""
-    np.random.seed(hash(ticker) % 2**32)
-
-    dates = pd.bdate_range(start=start_date, end=end_date)
-    n = len(dates)
-
-    returns = np.random.normal(0.0002, volatility, n)
-    prices = initial_price * np.cumprod(1 + returns)
-
-    data = []
-    for i, d in enumerate(dates):
-        close = prices[i]
-        high = close * (1 + abs(np.random.normal(0, 0.01)))
-        low = close * (1 - abs(np.random.normal(0, 0.01)))
-        open_price = close * (1 + np.random.normal(0, 0.005))
-        volume = int(np.random.lognormal(12, 1))
-
-        data.append({
-            "date": d.date(),
-            "open": round(open_price, 0),
-            "high": round(high, 0),
-            "low": round(low, 0),
-            "close": round(close, 0),
-            "volume": volume,
-        })
-
-    return pd.DataFrame(data)
+    """백테스트용 샘플 주가 데이터 생성.
+
+    dates: 미리 계산한 영업일 배열 (datetime64). 여러 종목 생성 시
+           pd.bdate_range를 종목마다 다시 계산하지 않도록 load_data에서 전달.
+           None이면 start_date ~ end_date로 계산.
+    """
+    rng = np.random.default_rng(_ticker_seed(ticker))
+
+    if dates is None:
+        dates = pd.bdate_range(start=start_date, end=end_date).to_numpy()
+    open_price, high, low, close, volume = _simulate_price_path(rng, len(dates), initial_price, volatility)
+
+    # 타입이 정해진 컬럼 배열을 그대로 넘겨 dtype 추론/복사를 생략
+    # date는 object(date) 배열 대신 datetime64 (ClickHouse 경로와 동일한 형태)
+    # 가격은 float32, 거래량은 int32로 저장하여 메모리/대역폭을 절반으로
+    return pd.DataFrame({
+        "date": dates,
+        "open": open_price,
+        "high": high,
+        "low": low,
+        "close": close,
+        "volume": volume,
+    }, copy=False)
 
 
 def parse_param(param_str: str) -> tuple[str, object]:
@@ -98,53 +157,105 @@ def parse_param(param_str: str) -> tuple[str, object]:
         return key, value
 
 
-def load_data(config: Config, source: str) -> dict[str, pd.DataFrame]:
+# ClickHouse 조회 결과 디스크 캐시 위치 (실행 위치와 무관하게 프로젝트 루트 기준)
+CACHE_DIR = Path(__file__).resolve().parent / ".cache"
+
+
+def _fetch_clickhouse_ohlcv(
+    config: Config,
+    tickers: list[str],
+    start: date,
+    end: date,
+    use_cache: bool = False,
+    refresh: bool = False,
+) -> pd.DataFrame:
+    """ClickHouse에서 여러 종목 OHLCV 조회.
+
+    use_cache=True (--cache)이면 결과를 디스크에 캐시하여 재실행 시 재사용한다.
+    캐시 키는 (종목, 기간, use_adjusted_close, DB 위치)로 만들며 데이터 갱신은 감지하지 못하므로,
+    데이터 업데이트 후에는 refresh=True (--refresh-cache)로 다시 조회해 캐시를 덮어쓴다.
+    """
+    use_cache = use_cache or refresh
+    key_src = repr((
+        sorted(tickers), str(start), str(end), config.database.use_adjusted_close,
+        config.database.host, config.database.port, config.database.database,
+    ))
+    key = hashlib.sha1(key_src.encode()).hexdigest()[:16]
+    cache_path = CACHE_DIR / f"ohlcv_{key}.pkl"
+
+    if use_cache and not refresh and cache_path.exists():
+        print(f"  캐시 사용: {cache_path}")
+        return pd.read_pickle(cache_path)
+
+    # clickhouse_connect 임포트 비용이 크므로 실제로 조회할 때만 임포트
+    from trading_system.data.clickhouse_provider import ClickHouseDataProvider
+
+    provider = ClickHouseDataProvider(
+        host=config.database.host,
+        port=config.database.port,
+        database=config.database.database,
+        user=config.database.user,
+        password=config.database.password,
+        use_adjusted_close=config.database.use_adjusted_close,
+    )
+    # 종목별 왕복 대신 한 번의 쿼리로 전체 조회
+    df_all = provider.get_ohlcv_multi(tickers, start, end)
+
+    # 빈 결과는 캐시하지 않음 (데이터 수집 후 바로 재실행하는 경우 대비)
+    if use_cache and not df_all.empty:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        df_all.to_pickle(cache_path)
+    return df_all
+
+
+def load_data(
+    config: Config,
+    source: str,
+    start: date,
+    end: date,
+    use_cache: bool = False,
+    refresh_cache: bool = False,
+) -> dict[str, pd.DataFrame]:
     """데이터 소스에서 OHLCV 데이터 로드."""
-    start = date.fromisoformat(config.backtest.start_date)
-    end = date.fromisoformat(config.backtest.end_date)
     tickers = config.strategy.tickers or ["005930.KS", "000660.KS"]
 
     if source == "sample":
         print("샘플 데이터 생성 중...")
-        data = {}
-        for ticker in tickers:
-            initial_price = 70000 if "005930" in ticker else 150000
-            data[ticker] = generate_sample_data(
-                ticker=ticker,
-                start_date=start,
-                end_date=end,
-                initial_price=initial_price,
+        # 영업일 계산은 모든 종목에 공통이므로 한 번만
+        dates = pd.bdate_range(start=start, end=end).to_numpy()
+        # 종목별 생성은 서로 독립적이므로 병렬 실행
+        with ThreadPoolExecutor() as executor:
+            frames = executor.map(
+                lambda ticker: generate_sample_data(
+                    ticker=ticker,
+                    start_date=start,
+                    end_date=end,
+                    initial_price=70000 if "005930" in ticker else 150000,
+                    dates=dates,
+                ),
+                tickers,
             )
-            print(f"  {ticker}: {len(data[ticker])}일 데이터")
+            data = dict(zip(tickers, frames))
+        for ticker, df in data.items():
+            print(f"  {ticker}: {len(df)}일 데이터")
         return data
 
     elif source == "clickhouse":
         print("ClickHouse에서 데이터 조회 중...")
-        provider = ClickHouseDataProvider(
-            host=config.database.host,
-            port=config.database.port,
-            database=config.database.database,
-            user=config.database.user,
-            password=config.database.password,
-            use_adjusted_close=config.database.use_adjusted_close,
-        )
-
-        available_tickers = provider.get_tickers()
-        print(f"  ClickHouse에 저장된 티커: {available_tickers}")
+        df_all = _fetch_clickhouse_ohlcv(config, tickers, start, end, use_cache=use_cache, refresh=refresh_cache)
+        groups = {
+            ticker: group.drop(columns="ticker").reset_index(drop=True)
+            for ticker, group in df_all.groupby("ticker", sort=False)
+        }
 
+        # 종목 순서는 config의 tickers 순서를 유지 (엔진의 종목 처리 순서에 영향)
         data = {}
         for ticker in tickers:
-            if ticker not in available_tickers:
-                print(f"  [SKIP] {ticker}: ClickHouse에 데이터 없음")
+            if ticker not in groups:
+                print(f"  [SKIP] {ticker}: 기간 내 ClickHouse 데이터 없음")
                 continue
-
-            df = provider.get_ohlcv(ticker, start, end)
-            if df.empty:
-                print(f"  [SKIP] {ticker}: 기간 내 데이터 없음")
-                continue
-
-            data[ticker] = df
-            print(f"  {ticker}: {len(df)}일 데이터 로드")
+            data[ticker] = groups[ticker]
+            print(f"  {ticker}: {len(data[ticker])}일 데이터 로드")
 
         if not data:
             print("\n오류: 백테스트할 데이터가 없습니다.")
@@ -157,11 +268,15 @@ def load_data(config: Config, source: str) -> dict[str, pd.DataFrame]:
         return {}
 
 
-def run_single(config: Config, strategy_name: str, strategy_params: dict, data: dict[str, pd.DataFrame]) -> BacktestMetrics | None:
+def run_single(
+    config: Config,
+    strategy_name: str,
+    strategy_params: dict,
+    data: dict[str, pd.DataFrame],
+    start: date,
+    end: date,
+) -> BacktestMetrics | None:
     """단일 전략 백테스트 실행."""
-    start = date.fromisoformat(config.backtest.start_date)
-    end = date.fromisoformat(config.backtest.end_date)
-
     strategy = create_strategy(strategy_name, params=strategy_params)
 
     engine = BacktestEngine(
@@ -174,12 +289,16 @@ def run_single(config: Config, strategy_name: str, strategy_params: dict, data:
     metrics = engine.run_backtest(strategy, data, start, end)
 
     # 거래 내역 요약
-    report = engine.generate_report()
-    trades = report["trades"]
-    buy_trades = [t for t in trades if t["side"] == "buy"]
-    sell_trades = [t for t in trades if t["side"] == "sell"]
+    # 한 번 순회로 매수 횟수 집계 + 매도 거래 분리 (거래 내역 전체 리스트는 만들지 않음)
+    buy_count = 0
+    sell_trades = []
+    for t in engine.iter_trades():
+        if t["side"] == "buy":
+            buy_count += 1
+        else:
+            sell_trades.append(t)
 
-    return metrics, len(buy_trades), len(sell_trades), sell_trades
+    return metrics, buy_count, len(sell_trades), sell_trades
 
 
 def print_single_result(strategy_name: str, metrics: BacktestMetrics, buy_count: int, sell_count: int, sell_trades: list):
@@ -198,21 +317,25 @@ def print_single_result(strategy_name: str, metrics: BacktestMetrics, buy_count:
 
 
 def print_comparison(results: dict[str, BacktestMetrics], config: Config):
-    """여러 전략 비교 결과 출력."""
+    """여러 전략 비교 결과 출력. 표 전체를 한 문자열로 만들어 한 번에 출력."""
     tickers = config.strategy.tickers or ["(default)"]
     period = f"{config.backtest.start_date} ~ {config.backtest.end_date}"
 
     names = list(results.keys())
     col_width = max(14, max(len(n) for n in names) + 2)
-
-    print(f"\n{'=' * (20 + col_width * len(names))}")
-    print(f"전략 비교 결과 ({', '.join(tickers)}, {period})")
-    print(f"{'=' * (20 + col_width * len(names))}")
+    col_fmt = f"{{:>{col_width}}}".format
+    border = "=" * (20 + col_width * len(names))
 
     # 헤더
-    header = f"{'':>20}" + "".join(f"{n:>{col_width}}" for n in names)
-    print(header)
-    print("-" * len(header))
+    header = f"{'':>20}" + "".join(col_fmt(n) for n in names)
+    lines = [
+        "",
+        border,
+        f"전략 비교 결과 ({', '.join(tickers)}, {period})",
+        border,
+        header,
+        "-" * len(header),
+    ]
 
     # 지표 행
     rows = [
@@ -229,11 +352,12 @@ def print_comparison(results: dict[str, BacktestMetrics], config: Config):
         ("최대 연속 손실", lambda m: f"{m.max_consecutive_losses}"),
     ]
 
+    metrics_list = [results[n] for n in names]
     for label, fmt in rows:
-        row = f"{label:>20}" + "".join(f"{fmt(results[n]):>{col_width}}" for n in names)
-        print(row)
+        lines.append(f"{label:>20}" + "".join(col_fmt(fmt(m)) for m in metrics_list))
 
-    print(f"{'=' * (20 + col_width * len(names))}")
+    lines.append(border)
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
@@ -243,7 +367,10 @@ def main():
     parser.add_argument("-p", "--param", action="append", default=[], help="파라미터 오버라이드 (예: -p ma_period=200)")
     parser.add_argument("--sample", action="store_true", help="샘플 데이터로 테스트")
     parser.add_argument("--source", type=str, default="sample", choices=["sample", "clickhouse"], help="데이터 소스")
+    parser.add_argument("--cache", action="store_true", help="ClickHouse 조회 결과를 .cache/에 저장하고 재사용")
+    parser.add_argument("--refresh-cache", action="store_true", help="ClickHouse 조회 캐시를 무시하고 다시 조회 (--cache 포함)")
     parser.add_argument("--compare", nargs="+", metavar="STRATEGY", help="여러 전략 비교 (예: --compare split_buy ma_strategy)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="--compare 시 병렬 실행할 프로세스 수 (기본: 1)")
     parser.add_argument("--list", action="store_true", help="등록된 전략 목록 출력")
     args = parser.parse_args()
 
@@ -269,19 +396,41 @@ def main():
     if args.sample:
         args.source = "sample"
 
+    # 백테스트 기간 (한 번만 파싱하여 load_data / run_single에 전달)
+    start = date.fromisoformat(config.backtest.start_date)
+    end = date.fromisoformat(config.backtest.end_date)
+
     # 데이터 로드 (한 번만)
-    data = load_data(config, args.source)
+    data = load_data(config, args.source, start, end, use_cache=args.cache, refresh_cache=args.refresh_cache)
     if not data:
         return
 
     # ─── 비교 모드 ───────────────────────────────────────────────────────
     if args.compare:
         print(f"\n{len(args.compare)}개 전략 비교 실행...")
+        # 비교 모드에서는 config의 params를 기본으로 사용
+        if args.jobs > 1:
+            # 전략끼리는 독립적이므로 프로세스 단위로 병렬 실행 (CPU 바운드 → GIL 회피)
+            print(f"  {min(args.jobs, len(args.compare))}개 프로세스로 병렬 실행")
+            # 워커는 로그 큐 리스너를 물려받지 못하므로 파일 로그를 바로 기록하도록 다시 설정
+            with ProcessPoolExecutor(
+                max_workers=args.jobs,
+                initializer=init_worker_logger,
+                initargs=(logger.name, config.log_level, config.log_dir),
+            ) as executor:
+                futures = {
+                    name: executor.submit(run_single, config, name, config.strategy.params, data, start, end)
+                    for name in args.compare
+                }
+                outputs = {name: future.result() for name, future in futures.items()}
+        else:
+            outputs = {}
+            for name in args.compare:
+                print(f"\n--- {name} 실행 중 ---")
+                outputs[name] = run_single(config, name, config.strategy.params, data, start, end)
+
         results = {}
-        for name in args.compare:
-            print(f"\n--- {name} 실행 중 ---")
-            # 비교 모드에서는 config의 params를 기본으로 사용
-            result = run_single(config, name, config.strategy.params, data)
+        for name, result in outputs.items():
             if result:
                 metrics, _, _, _ = result
                 results[name] = metrics
@@ -293,16 +442,15 @@ def main():
     strategy_name = args.strategy or config.strategy.name
     strategy_params = dict(config.strategy.params)
 
-    # CLI 파라미터 오버라이드
-    for p in args.param:
-        key, value = parse_param(p)
-        strategy_params[key] = value
+    # CLI 파라미터 오버라이드 (한 번만 파싱)
+    overrides = dict(parse_param(p) for p in args.param)
+    strategy_params.update(overrides)
 
     print(f"\n전략: {strategy_name}")
-    if args.param:
-        print(f"파라미터 오버라이드: {dict(parse_param(p) for p in args.param)}")
+    if overrides:
+        print(f"파라미터 오버라이드: {overrides}")
 
-    result = run_single(config, strategy_name, strategy_params, data)
+    result = run_single(config, strategy_name, strategy_params, data, start, end)
     if result:
         metrics, buy_count, sell_count, sell_trades = result
         print_single_result(strategy_name, metrics, buy_count, sell_count, sell_trades)
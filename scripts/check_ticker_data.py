@@ -9,124 +9,125 @@ import argparse
 import sys
 from pathlib import Path
 from datetime import date, datetime
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 
-# Add project root to path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+# trading_system is meant to be installed with `pip install -e .`
+# (fall back to adding the project root to sys.path when it is not)
+try:
+    import trading_system  # noqa: F401
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from trading_system.ingestion.clickhouse_schema import get_client, get_date_range
+from trading_system.ingestion.clickhouse_schema import get_client, get_date_range, get_ohlcv_source
 import yaml
 
+# Prefer the libyaml C loader when available (much faster than pure Python)
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 
 class TickerDataChecker:
     """Check if ticker data exists and is valid"""
 
     def __init__(self, client):
         self.client = client
-
-    def get_available_tickers(self) -> List[str]:
-        """Get list of all tickers with data in ClickHouse"""
-        query = "SELECT DISTINCT ticker FROM stock_ohlcv ORDER BY ticker"
-        result = self.client.query(query)
-        return [row[0] for row in result.result_rows]
-
-    def check_ticker_exists(self, ticker: str) -> bool:
-        """Check if ticker has any data"""
-        query = "SELECT COUNT(*) FROM stock_ohlcv WHERE ticker = %(ticker)s"
-        result = self.client.query(query, parameters={"ticker": ticker})
-        count = result.result_rows[0][0]
-        return count > 0
-
-    def get_ticker_info(self, ticker: str) -> Dict:
-        """Get detailed information about ticker data"""
-        query = """
+        # 'stock_ohlcv FINAL', or plain 'stock_ohlcv' if the table is not migrated yet
+        self.ohlcv_source = get_ohlcv_source(client)
+
+    def get_bulk_info(
+        self,
+        tickers: Optional[List[str]] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Dict[str, Dict]:
+        """Get data info for many tickers in a single grouped query.
+
+        Date range coverage is computed in the same scan with conditional
+        aggregates (countIf/minIf/maxIf) when start_date and end_date are given.
+        Tickers without any data are not present in the returned dict.
+        """
+        check_range = start_date is not None and end_date is not None
+        range_cond = "date >= %(start_date)s AND date <= %(end_date)s"
+        range_columns = f""",
+                countIf({range_cond}) as records_in_range,
+                minIf(date, {range_cond}) as actual_start,
+                maxIf(date, {range_cond}) as actual_end""" if check_range else ""
+        # PREWHERE: read only the granules of the requested tickers before
+        # decompressing the price/volume columns. FINAL (when supported) collapses
+        # re-ingested (ticker, date) rows that have not been merged yet.
+        where = "PREWHERE ticker IN %(tickers)s" if tickers is not None else ""
+
+        query = f"""
             SELECT
+                ticker,
                 COUNT(*) as record_count,
                 MIN(date) as first_date,
                 MAX(date) as last_date,
                 MIN(close) as min_price,
                 MAX(close) as max_price,
-                AVG(volume) as avg_volume
-            FROM stock_ohlcv
-            WHERE ticker = %(ticker)s
-        """
-        result = self.client.query(query, parameters={"ticker": ticker})
-
-        if not result.result_rows:
-            return None
-
-        row = result.result_rows[0]
-        return {
-            'ticker': ticker,
-            'record_count': row[0],
-            'first_date': row[1],
-            'last_date': row[2],
-            'min_price': row[3],
-            'max_price': row[4],
-            'avg_volume': row[5],
-            'exists': row[0] > 0
-        }
-
-    def check_date_range_coverage(self, ticker: str, start_date: date, end_date: date) -> Dict:
-        """Check if ticker has data for the requested date range"""
-        query = """
-            SELECT
-                COUNT(*) as records_in_range,
-                MIN(date) as actual_start,
-                MAX(date) as actual_end
-            FROM stock_ohlcv
-            WHERE ticker = %(ticker)s
-              AND date >= %(start_date)s
-              AND date <= %(end_date)s
+                AVG(volume) as avg_volume{range_columns}
+            FROM {self.ohlcv_source}
+            {where}
+            GROUP BY ticker
+            ORDER BY ticker
         """
-        result = self.client.query(query, parameters={
-            "ticker": ticker,
-            "start_date": start_date,
-            "end_date": end_date
-        })
-
-        if not result.result_rows:
-            return {
-                'has_data': False,
-                'records_in_range': 0,
-                'actual_start': None,
-                'actual_end': None
+        parameters = {}
+        if tickers is not None:
+            parameters["tickers"] = tuple(tickers)
+        if check_range:
+            parameters["start_date"] = start_date
+            parameters["end_date"] = end_date
+        result = self.client.query(query, parameters=parameters)
+
+        infos = {}
+        for row in result.result_rows:
+            info = {
+                'ticker': row[0],
+                'record_count': row[1],
+                'first_date': row[2],
+                'last_date': row[3],
+                'min_price': row[4],
+                'max_price': row[5],
+                'avg_volume': row[6],
+                'exists': row[1] > 0
             }
-
-        row = result.result_rows[0]
-        return {
-            'has_data': row[0] > 0,
-            'records_in_range': row[0],
-            'actual_start': row[1],
-            'actual_end': row[2]
-        }
-
-    def check_ingestion_status(self, ticker: str) -> Dict:
-        """Check ingestion log for ticker"""
+            if check_range:
+                has_data = row[7] > 0
+                info['coverage'] = {
+                    'has_data': has_data,
+                    'records_in_range': row[7],
+                    'actual_start': row[8] if has_data else None,
+                    'actual_end': row[9] if has_data else None
+                }
+            infos[row[0]] = info
+        return infos
+
+    def get_bulk_ingestion_status(self, tickers: List[str]) -> Dict[str, Dict]:
+        """Get the latest ingestion log entry for many tickers in one query"""
         query = """
             SELECT
-                last_date,
-                last_ingestion,
-                record_count,
-                status
+                ticker,
+                argMax(last_date, last_ingestion) as last_date,
+                max(last_ingestion) as last_ingestion,
+                argMax(record_count, last_ingestion) as record_count,
+                argMax(status, last_ingestion) as status
             FROM ingestion_log
-            WHERE ticker = %(ticker)s
-            ORDER BY last_ingestion DESC
-            LIMIT 1
+            WHERE ticker IN %(tickers)s
+            GROUP BY ticker
         """
-        result = self.client.query(query, parameters={"ticker": ticker})
-
-        if not result.result_rows:
-            return {'has_log': False}
+        result = self.client.query(query, parameters={"tickers": tuple(tickers)})
 
-        row = result.result_rows[0]
         return {
-            'has_log': True,
-            'last_date': row[0],
-            'last_ingestion': row[1],
-            'record_count': row[2],
-            'status': row[3]
+            row[0]: {
+                'has_log': True,
+                'last_date': row[1],
+                'last_ingestion': row[2],
+                'record_count': row[3],
+                'status': row[4]
+            }
+            for row in result.result_rows
         }
 
 
@@ -134,7 +135,7 @@ def load_config(config_path: str) -> dict:
     """Load config.yaml"""
     try:
         with open(config_path, 'r') as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=YamlLoader)
     except Exception as e:
         print(f"Error loading config: {e}")
         return {}
@@ -214,10 +215,9 @@ def main():
     if args.list_all:
         print("Available tickers in ClickHouse:")
         print("=" * 50)
-        available = checker.get_available_tickers()
+        available = checker.get_bulk_info()
         if available:
-            for ticker in available:
-                info = checker.get_ticker_info(ticker)
+            for ticker, info in available.items():
                 print(f"  {ticker:15s} | {info['record_count']:6d} records | "
                       f"{format_date(info['first_date'])} to {format_date(info['last_date'])}")
             print(f"\nTotal: {len(available)} tickers")
@@ -254,14 +254,18 @@ def main():
     all_available = True
     results = []
 
+    # One grouped query instead of N per-ticker queries (plus one for the ingestion log)
+    check_range = start_date is not None and end_date is not None
+    infos = checker.get_bulk_info(tickers, start_date, end_date)
+    logs = checker.get_bulk_ingestion_status(tickers) if args.verbose else {}
+
     for ticker in tickers:
         print(f"Checking {ticker}...")
         print("-" * 70)
 
-        # Check if exists
-        exists = checker.check_ticker_exists(ticker)
+        info = infos.get(ticker)
 
-        if not exists:
+        if info is None:
             print(f"  ✗ No data found in ClickHouse")
             all_available = False
             results.append({
@@ -272,16 +276,14 @@ def main():
             print()
             continue
 
-        # Get ticker info
-        info = checker.get_ticker_info(ticker)
         print(f"  ✓ Data exists")
         print(f"  Records:    {info['record_count']:,}")
         print(f"  Date Range: {format_date(info['first_date'])} to {format_date(info['last_date'])}")
         print(f"  Price Range: ${info['min_price']:.2f} - ${info['max_price']:.2f}")
 
         # Check date range coverage if specified
-        if start_date and end_date:
-            coverage = checker.check_date_range_coverage(ticker, start_date, end_date)
+        if check_range:
+            coverage = info['coverage']
             if coverage['has_data']:
                 print(f"  ✓ Has data for requested range ({start_date} to {end_date})")
                 print(f"    Records in range: {coverage['records_in_range']}")
@@ -292,7 +294,7 @@ def main():
 
         # Check ingestion log
         if args.verbose:
-            log = checker.check_ingestion_status(ticker)
+            log = logs.get(ticker, {'has_log': False})
             if log['has_log']:
                 print(f"  Last Update: {log['last_ingestion']}")
                 print(f"  Last Date:   {format_date(log['last_date'])}")
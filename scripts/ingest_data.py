@@ -8,12 +8,23 @@ from datetime import date, datetime, timedelta
 from pathlib import Path
 import logging
 
-# 프로젝트 루트를 sys.path에 추가
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
-
-from trading_system.ingestion.clickhouse_schema import get_client, initialize_schema
-from trading_system.ingestion.yahoo_finance import fetch_ticker_data
+import pandas as pd
+
+# trading_system은 `pip install -e .`로 설치해서 사용
+# (설치하지 않은 경우에만 프로젝트 루트를 sys.path에 추가)
+try:
+    import trading_system  # noqa: F401
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from trading_system.ingestion.clickhouse_schema import (
+    INGESTION_LOG_COLUMNS,
+    flush_ingestion_log,
+    get_client,
+    insert_ohlcv_df,
+    initialize_schema,
+)
+from trading_system.ingestion.yahoo_finance import fetch_ticker_batch, fetch_ticker_data
 
 logging.basicConfig(
     level=logging.INFO,
@@ -21,6 +32,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Yahoo Finance 동시 요청 수 (rate limit을 고려하여 작게 유지)
+FETCH_WORKERS = 4
+
+# yf.download 한 번에 묶어서 수집할 티커 수
+FETCH_BATCH_SIZE = 100
+
 
 def insert_ohlcv_data(client, ticker: str, df) -> int:
     """
@@ -29,7 +46,7 @@ def insert_ohlcv_data(client, ticker: str, df) -> int:
     Args:
         client: ClickHouse 클라이언트
         ticker: 티커 심볼
-        df: OHLCV DataFrame
+        df: fetch_ticker_data가 반환한 OHLCV DataFrame
 
     Returns:
         삽입된 레코드 수
@@ -38,29 +55,19 @@ def insert_ohlcv_data(client, ticker: str, df) -> int:
         logger.warning(f"No data to insert for {ticker}")
         return 0
 
-    # DataFrame을 ClickHouse 형식으로 변환
-    # ticker 컬럼 추가
-    df = df.copy()
-    df['ticker'] = ticker
-
-    # 컬럼 순서 맞추기 (adjusted_close로 이름 변경)
-    df = df.rename(columns={'adj_close': 'adjusted_close'})
-
-    # ClickHouse에 삽입할 컬럼 선택
-    columns = ['ticker', 'date', 'open', 'high', 'low', 'close', 'adjusted_close', 'volume']
-    data = df[columns].values.tolist()
-
+    # fetch_ticker_data가 이미 stock_ohlcv 컬럼 순서(ticker 포함)로 반환하므로 변환 없이 삽입
     try:
-        # 배치 삽입
-        client.insert('stock_ohlcv', data, column_names=columns)
-        logger.info(f"Inserted {len(data)} rows for {ticker}")
-        return len(data)
+        # 배치 삽입 (행 리스트로 변환하지 않고 컬럼 단위로 전송, 연결 오류 시 재시도)
+        inserted = insert_ohlcv_df(client, df)
+        logger.debug("Inserted %d rows for %s", inserted, ticker)
+        return inserted
     except Exception as e:
         logger.error(f"Error inserting data for {ticker}: {e}")
         raise
 
 
-def update_ingestion_log(client, ticker: str, last_date: date, record_count: int, status: str = 'success'):
+def update_ingestion_log(client, ticker: str, last_date: date, record_count: int, status: str = 'success',
+                         log_rows: list = None):
     """
     ingestion_log 테이블 업데이트
 
@@ -70,24 +77,31 @@ def update_ingestion_log(client, ticker: str, last_date: date, record_count: int
         last_date: 마지막 데이터 날짜
         record_count: 삽입된 레코드 수
         status: 상태 ('success' 또는 'failed')
+        log_rows: 지정하면 바로 삽입하지 않고 이 리스트에 행을 추가
+                  (flush_ingestion_log로 한 번에 삽입)
     """
-    data = [[
+    row = [
         ticker,
         last_date,
         datetime.now(),
         record_count,
         status
-    ]]
+    ]
+
+    if log_rows is not None:
+        log_rows.append(row)
+        return
 
     try:
-        client.insert('ingestion_log', data, column_names=['ticker', 'last_date', 'last_ingestion', 'record_count', 'status'])
+        client.insert('ingestion_log', [row], column_names=INGESTION_LOG_COLUMNS)
         logger.info(f"Updated ingestion_log for {ticker}")
     except Exception as e:
         logger.error(f"Error updating ingestion_log for {ticker}: {e}")
         # 로그 업데이트 실패는 치명적이지 않으므로 예외를 발생시키지 않음
 
 
-def ingest_ticker(client, ticker: str, start_date: date, end_date: date) -> bool:
+def ingest_ticker(client, ticker: str, start_date: date, end_date: date, df=None,
+                  log_rows: list = None) -> bool:
     """
     단일 티커의 데이터를 수집하고 ClickHouse에 저장
 
@@ -96,37 +110,38 @@ def ingest_ticker(client, ticker: str, start_date: date, end_date: date) -> bool
         ticker: 티커 심볼
         start_date: 시작 날짜
         end_date: 종료 날짜
+        df: 미리 수집한 OHLCV DataFrame (None이면 여기서 수집)
+        log_rows: ingestion_log 행을 모을 리스트 (None이면 즉시 삽입)
 
     Returns:
         성공 시 True, 실패 시 False
     """
-    logger.info(f"Starting ingestion for {ticker} ({start_date} to {end_date})")
+    logger.debug("Starting ingestion for %s (%s to %s)", ticker, start_date, end_date)
 
     try:
-        # 1. Yahoo Finance에서 데이터 수집
-        df = fetch_ticker_data(ticker, start_date, end_date)
+        # 1. Yahoo Finance에서 데이터 수집 (미리 수집한 데이터가 없을 때만)
+        if df is None:
+            df = fetch_ticker_data(ticker, start_date, end_date)
 
         if df is None or df.empty:
             logger.warning(f"No data fetched for {ticker}")
-            update_ingestion_log(client, ticker, end_date, 0, 'failed')
+            update_ingestion_log(client, ticker, end_date, 0, 'failed', log_rows)
             return False
 
         # 2. ClickHouse에 데이터 삽입
         record_count = insert_ohlcv_data(client, ticker, df)
 
         # 3. ingestion_log 업데이트
-        last_date = df['date'].max()
-        if isinstance(last_date, str):
-            last_date = datetime.strptime(last_date, '%Y-%m-%d').date()
+        last_date = pd.Timestamp(df['date'].max()).date()
 
-        update_ingestion_log(client, ticker, last_date, record_count, 'success')
+        update_ingestion_log(client, ticker, last_date, record_count, 'success', log_rows)
 
         logger.info(f"Successfully ingested {record_count} rows for {ticker}")
         return True
 
     except Exception as e:
         logger.error(f"Error ingesting {ticker}: {e}", exc_info=True)
-        update_ingestion_log(client, ticker, end_date, 0, 'failed')
+        update_ingestion_log(client, ticker, end_date, 0, 'failed', log_rows)
         return False
 
 
@@ -164,6 +179,12 @@ def main():
 
     # 기타
     parser.add_argument('--init-schema', action='store_true', help='Initialize schema before ingestion')
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=FETCH_WORKERS,
+        help=f'Concurrent Yahoo Finance requests (default: {FETCH_WORKERS})'
+    )
 
     args = parser.parse_args()
 
@@ -186,6 +207,7 @@ def main():
     logger.info(f"Ingestion parameters:")
     logger.info(f"  Tickers: {tickers}")
     logger.info(f"  Date range: {start_date} to {end_date}")
+    logger.info(f"  Fetch workers: {args.workers}")
     logger.info(f"  ClickHouse: {args.host}:{args.port}/{args.database}")
 
     try:
@@ -205,14 +227,26 @@ def main():
             logger.info("Schema initialized")
 
         # 각 티커별 데이터 수집
+        # Yahoo 요청은 FETCH_BATCH_SIZE개씩 yf.download 한 번으로 묶어서 받고,
+        # ClickHouse 저장은 메인 스레드에서 하나의 client로 처리
+        # (일괄 수집에 실패한 티커는 ingest_ticker가 개별 수집 + 재시도)
+        # ingestion_log는 티커마다 1행씩 삽입하지 않고 모아서 마지막에 한 번에 삽입
         success_count = 0
         fail_count = 0
-
-        for ticker in tickers:
-            if ingest_ticker(client, ticker, start_date, end_date):
-                success_count += 1
-            else:
-                fail_count += 1
+        log_rows = []
+
+        try:
+            for i in range(0, len(tickers), FETCH_BATCH_SIZE):
+                chunk = tickers[i:i + FETCH_BATCH_SIZE]
+                frames = fetch_ticker_batch(chunk, start_date, end_date, threads=max(1, args.workers))
+                for ticker in chunk:
+                    if ingest_ticker(client, ticker, start_date, end_date,
+                                     df=frames.get(ticker), log_rows=log_rows):
+                        success_count += 1
+                    else:
+                        fail_count += 1
+        finally:
+            flush_ingestion_log(client, log_rows)
 
         # 결과 요약
         logger.info("=" * 60)
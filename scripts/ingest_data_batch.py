@@ -5,15 +5,25 @@ Yahoo Finance 데이터를 ClickHouse로 배치 수집하는 스크립트
 """
 import argparse
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import date, datetime, timedelta
 from pathlib import Path
 import logging
 
-# 프로젝트 루트를 sys.path에 추가
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
-
-from trading_system.ingestion.clickhouse_schema import get_client, initialize_schema
+# trading_system은 `pip install -e .`로 설치해서 사용
+# (설치하지 않은 경우에만 프로젝트 루트를 sys.path에 추가)
+try:
+    import trading_system  # noqa: F401
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from trading_system.ingestion.clickhouse_schema import (
+    OHLCV_INSERT_COLUMNS,
+    OHLCV_INSERT_COLUMN_TYPES,
+    get_client,
+    insert_ohlcv_df,
+    initialize_schema,
+)
 from trading_system.ingestion.yahoo_finance import fetch_ticker_data
 import pandas as pd
 
@@ -23,16 +33,46 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# ClickHouse 블록 크기(65,536행)에 맞춘 기본 Native 블록 크기.
+# 티커 하나의 전체 이력(수십 년 ≈ 1만 행)은 보통 블록 하나로 전송된다.
+DEFAULT_BATCH_SIZE = 65536
+
+# 수집 워커 프로세스 수 (Yahoo rate limit을 고려하여 작게 유지)
+FETCH_WORKERS = 4
+
+
+def create_ohlcv_insert_context(client, batch_size: int = DEFAULT_BATCH_SIZE):
+    """
+    stock_ohlcv용 insert context 생성 (실행 동안 모든 티커가 재사용)
 
-def insert_ohlcv_data_batch(client, ticker: str, df, batch_size: int = 100) -> int:
+    하나의 INSERT 요청 안에서 batch_size행 단위 Native 블록으로 나눠 스트리밍한다
+    (배치마다 별도 요청을 보내지 않고, 직렬화 버퍼도 블록 하나 크기만 유지).
+
+    Args:
+        client: ClickHouse 클라이언트
+        batch_size: 블록 크기 (행 단위)
+
+    Returns:
+        InsertContext
+    """
+    context = client.create_insert_context(
+        'stock_ohlcv', OHLCV_INSERT_COLUMNS, column_type_names=OHLCV_INSERT_COLUMN_TYPES
+    )
+    context.req_block_size = batch_size
+    return context
+
+
+def insert_ohlcv_data_batch(client, ticker: str, df, batch_size: int = DEFAULT_BATCH_SIZE,
+                            context=None) -> int:
     """
     OHLCV 데이터를 ClickHouse에 배치 삽입
 
     Args:
         client: ClickHouse 클라이언트
         ticker: 티커 심볼
-        df: OHLCV DataFrame
-        batch_size: 배치 크기 (일 단위)
+        df: fetch_ticker_data가 반환한 OHLCV DataFrame
+        batch_size: 블록 크기 (행 단위, 1000 미만은 블록 수만 늘어나므로 비권장)
+        context: create_ohlcv_insert_context로 만든 context (None이면 새로 생성)
 
     Returns:
         삽입된 레코드 수
@@ -41,34 +81,21 @@ def insert_ohlcv_data_batch(client, ticker: str, df, batch_size: int = 100) -> i
         logger.warning(f"No data to insert for {ticker}")
         return 0
 
-    # DataFrame을 ClickHouse 형식으로 변환
-    df = df.copy()
-    df['ticker'] = ticker
-
-    # 컬럼 순서 맞추기
-    df = df.rename(columns={'adj_close': 'adjusted_close'})
-
-    # ClickHouse에 삽입할 컬럼 선택
-    columns = ['ticker', 'date', 'open', 'high', 'low', 'close', 'adjusted_close', 'volume']
-
-    # 배치로 나눠서 삽입
+    # fetch_ticker_data가 이미 stock_ohlcv 컬럼 순서(OHLCV_INSERT_COLUMNS)로 반환하므로 변환 없이 삽입
     total_rows = len(df)
-    inserted = 0
 
-    for i in range(0, total_rows, batch_size):
-        batch_df = df.iloc[i:i+batch_size]
-        data = batch_df[columns].values.tolist()
+    if context is None:
+        context = create_ohlcv_insert_context(client, batch_size)
 
-        try:
-            client.insert('stock_ohlcv', data, column_names=columns)
-            inserted += len(data)
-            logger.info(f"Inserted batch {i//batch_size + 1}: {len(data)} rows (total: {inserted}/{total_rows})")
-        except Exception as e:
-            logger.error(f"Error inserting batch {i//batch_size + 1} for {ticker}: {e}")
-            raise
+    try:
+        insert_ohlcv_df(client, df, context=context)
+    except Exception as e:
+        logger.error(f"Error inserting data for {ticker}: {e}")
+        raise
 
-    logger.info(f"Successfully inserted {inserted} total rows for {ticker}")
-    return inserted
+    logger.debug("Successfully inserted %d total rows for %s (%d blocks)",
+                 total_rows, ticker, -(-total_rows // batch_size))
+    return total_rows
 
 
 def update_ingestion_log(client, ticker: str, start_date: date, end_date: date,
@@ -95,15 +122,17 @@ def update_ingestion_log(client, ticker: str, start_date: date, end_date: date,
 
 
 def ingest_ticker_batch(client, ticker: str, start_date: date, end_date: date,
-                       batch_size: int = 100) -> bool:
+                       batch_size: int = DEFAULT_BATCH_SIZE, df=None, context=None) -> bool:
     """
     단일 티커의 데이터를 배치 수집하고 ClickHouse에 저장
+    (df를 넘기면 수집을 건너뛰고 저장만 수행, context는 insert_ohlcv_data_batch로 전달)
     """
-    logger.info(f"Starting ingestion for {ticker} ({start_date} to {end_date})")
+    logger.debug("Starting ingestion for %s (%s to %s)", ticker, start_date, end_date)
 
     try:
-        # 1. Yahoo Finance에서 데이터 수집
-        df = fetch_ticker_data(ticker, start_date, end_date)
+        # 1. Yahoo Finance에서 데이터 수집 (미리 수집한 데이터가 없을 때만)
+        if df is None:
+            df = fetch_ticker_data(ticker, start_date, end_date)
 
         if df is None or df.empty:
             logger.warning(f"No data fetched for {ticker}")
@@ -111,7 +140,7 @@ def ingest_ticker_batch(client, ticker: str, start_date: date, end_date: date,
             return False
 
         # 2. ClickHouse에 데이터 배치 삽입
-        record_count = insert_ohlcv_data_batch(client, ticker, df, batch_size)
+        record_count = insert_ohlcv_data_batch(client, ticker, df, batch_size, context)
 
         # 3. ingestion_log 업데이트
         update_ingestion_log(client, ticker, start_date, end_date, record_count, 'success')
@@ -136,8 +165,12 @@ def main():
                        help='Start date in YYYY-MM-DD format (default: 1970-01-01)')
     parser.add_argument('--end-date', type=str, default=None,
                        help='End date in YYYY-MM-DD format (default: today)')
-    parser.add_argument('--batch-size', type=int, default=100,
-                       help='Batch size for insertion (default: 100 days)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                       help=f'Rows per Native block within a single streamed insert '
+                            f'(default: {DEFAULT_BATCH_SIZE}, values below 1000 only add blocks)')
+
+    parser.add_argument('--workers', type=int, default=FETCH_WORKERS,
+                       help=f'Worker processes for fetching/parsing (default: {FETCH_WORKERS}, 1 = sequential)')
 
     # ClickHouse 연결 정보
     parser.add_argument('--host', type=str, default='localhost')
@@ -165,7 +198,8 @@ def main():
     logger.info(f"Ingestion parameters:")
     logger.info(f"  Tickers: {tickers}")
     logger.info(f"  Date range: {start_date} to {end_date}")
-    logger.info(f"  Batch size: {args.batch_size} days")
+    logger.info(f"  Batch size: {args.batch_size} rows")
+    logger.info(f"  Fetch workers: {args.workers}")
     logger.info(f"  ClickHouse: {args.host}:{args.port}/{args.database}")
 
     try:
@@ -180,10 +214,30 @@ def main():
         logger.info("Connected to ClickHouse")
 
         # 각 티커별 데이터 수집
+        # 수집 + DataFrame 변환(JSON 파싱, 타입 변환)은 GIL에 묶이지 않도록 워커 프로세스에서,
+        # ClickHouse 저장은 완료된 순서대로 메인 프로세스에서 하나의 client로 처리
         success_count = 0
-        for ticker in tickers:
-            if ingest_ticker_batch(client, ticker, start_date, end_date, args.batch_size):
-                success_count += 1
+        context = create_ohlcv_insert_context(client, args.batch_size)
+        if args.workers > 1 and len(tickers) > 1:
+            with ProcessPoolExecutor(max_workers=args.workers) as executor:
+                futures = {
+                    executor.submit(fetch_ticker_data, ticker, start_date, end_date): ticker
+                    for ticker in tickers
+                }
+                for future in as_completed(futures):
+                    ticker = futures[future]
+                    df = future.result()
+                    if df is None:
+                        logger.warning(f"No data fetched for {ticker}")
+                        update_ingestion_log(client, ticker, start_date, end_date, 0, 'failed')
+                    elif ingest_ticker_batch(client, ticker, start_date, end_date, args.batch_size,
+                                                 df=df, context=context):
+                        success_count += 1
+        else:
+            for ticker in tickers:
+                if ingest_ticker_batch(client, ticker, start_date, end_date, args.batch_size,
+                                       context=context):
+                    success_count += 1
 
         logger.info("=" * 60)
         logger.info(f"Ingestion completed:")
@@ -6,9 +6,12 @@ import sys
 from datetime import date
 from pathlib import Path
 
-# 프로젝트 루트를 sys.path에 추가
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+# trading_system은 `pip install -e .`로 설치해서 사용
+# (설치하지 않은 경우에만 프로젝트 루트를 sys.path에 추가)
+try:
+    import trading_system  # noqa: F401
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from trading_system.data.clickhouse_provider import ClickHouseDataProvider
 
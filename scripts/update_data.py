@@ -2,23 +2,36 @@
 """
 ClickHouse의 주식 데이터를 자동으로 업데이트하는 스크립트
 - ingestion_log를 조회하여 마지막 수집 날짜 확인
-- 마지막 날짜 이후부터 오늘까지 증분 데이터 수집
-- 중복 방지 로직 포함
+- 마지막 날짜 직전 며칠(REFETCH_OVERLAP_DAYS)부터 오늘까지 증분 데이터 수집
+- 겹친 구간은 stock_ohlcv(ReplacingMergeTree)에서 중복 제거
+  (아직 변환하지 않은 MergeTree 테이블이면 겹치지 않고 마지막 날짜 다음날부터 수집)
 """
 import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, datetime, timedelta
 from pathlib import Path
 import logging
+
+import pandas as pd
 import yaml
 
-# 프로젝트 루트를 sys.path에 추가
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+# trading_system은 `pip install -e .`로 설치해서 사용
+# (설치하지 않은 경우에만 프로젝트 루트를 sys.path에 추가)
+try:
+    import trading_system  # noqa: F401
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from trading_system.ingestion.clickhouse_schema import (
+    INGESTION_LOG_COLUMNS,
+    OHLCV_TABLE_ENGINE,
+    flush_ingestion_log,
     get_client,
+    get_table_engine,
+    insert_ohlcv_df,
     get_last_ingestion_date,
+    get_last_ingestion_dates,
     get_date_range
 )
 from trading_system.ingestion.yahoo_finance import fetch_ticker_data
@@ -29,6 +42,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# libyaml이 있으면 C 로더 사용 (순수 Python 로더보다 훨씬 빠름)
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# Yahoo Finance 동시 요청 수 (rate limit을 고려하여 작게 유지)
+FETCH_WORKERS = 4
+
+# 증분 업데이트 시 마지막 수집일 이전 구간을 겹쳐서 재수집하는 일수
+# (stock_ohlcv가 ReplacingMergeTree이므로 겹친 행은 중복되지 않고 최신 값으로 대체됨)
+REFETCH_OVERLAP_DAYS = 7
+
 
 def load_config(config_path: str) -> dict:
     """
@@ -42,7 +68,7 @@ def load_config(config_path: str) -> dict:
     """
     try:
         with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=YamlLoader)
         return config
     except Exception as e:
         logger.error(f"Failed to load config file: {e}")
@@ -56,7 +82,7 @@ def insert_ohlcv_data(client, ticker: str, df) -> int:
     Args:
         client: ClickHouse 클라이언트
         ticker: 티커 심볼
-        df: OHLCV DataFrame
+        df: fetch_ticker_data가 반환한 OHLCV DataFrame
 
     Returns:
         삽입된 레코드 수
@@ -65,28 +91,19 @@ def insert_ohlcv_data(client, ticker: str, df) -> int:
         logger.warning(f"No data to insert for {ticker}")
         return 0
 
-    # DataFrame을 ClickHouse 형식으로 변환
-    df = df.copy()
-    df['ticker'] = ticker
-
-    # 컬럼 순서 맞추기 (adjusted_close로 이름 변경)
-    df = df.rename(columns={'adj_close': 'adjusted_close'})
-
-    # ClickHouse에 삽입할 컬럼 선택
-    columns = ['ticker', 'date', 'open', 'high', 'low', 'close', 'adjusted_close', 'volume']
-    data = df[columns].values.tolist()
-
+    # fetch_ticker_data가 이미 stock_ohlcv 컬럼 순서(ticker 포함)로 반환하므로 변환 없이 삽입
     try:
-        # 배치 삽입
-        client.insert('stock_ohlcv', data, column_names=columns)
-        logger.info(f"Inserted {len(data)} rows for {ticker}")
-        return len(data)
+        # 배치 삽입 (행 리스트로 변환하지 않고 컬럼 단위로 전송, 연결 오류 시 재시도)
+        inserted = insert_ohlcv_df(client, df)
+        logger.debug("Inserted %d rows for %s", inserted, ticker)
+        return inserted
     except Exception as e:
         logger.error(f"Error inserting data for {ticker}: {e}")
         raise
 
 
-def update_ingestion_log(client, ticker: str, last_date: date, record_count: int, status: str = 'success'):
+def update_ingestion_log(client, ticker: str, last_date: date, record_count: int, status: str = 'success',
+                         log_rows: list = None):
     """
     ingestion_log 테이블 업데이트
 
@@ -96,23 +113,30 @@ def update_ingestion_log(client, ticker: str, last_date: date, record_count: int
         last_date: 마지막 데이터 날짜
         record_count: 삽입된 레코드 수
         status: 상태 ('success' 또는 'failed')
+        log_rows: 지정하면 바로 삽입하지 않고 이 리스트에 행을 추가
+                  (flush_ingestion_log로 한 번에 삽입)
     """
-    data = [[
+    row = [
         ticker,
         last_date,
         datetime.now(),
         record_count,
         status
-    ]]
+    ]
+
+    if log_rows is not None:
+        log_rows.append(row)
+        return
 
     try:
-        client.insert('ingestion_log', data, column_names=['ticker', 'last_date', 'last_ingestion', 'record_count', 'status'])
+        client.insert('ingestion_log', [row], column_names=INGESTION_LOG_COLUMNS)
         logger.info(f"Updated ingestion_log for {ticker}")
     except Exception as e:
         logger.error(f"Error updating ingestion_log for {ticker}: {e}")
 
 
-def get_update_date_range(client, ticker: str, max_lookback_days: int = 20000) -> tuple:
+def get_update_date_range(client, ticker: str, max_lookback_days: int = 20000,
+                          last_dates: dict = None, overlap_days: int = REFETCH_OVERLAP_DAYS) -> tuple:
     """
     업데이트할 날짜 범위 계산
 
@@ -120,6 +144,10 @@ def get_update_date_range(client, ticker: str, max_lookback_days: int = 20000) -
         client: ClickHouse 클라이언트
         ticker: 티커 심볼
         max_lookback_days: 최대 lookback 일수 (첫 수집인 경우)
+        last_dates: get_last_ingestion_dates로 미리 조회한 {ticker: 마지막 수집 날짜}
+                    (None이면 이 티커만 조회)
+        overlap_days: 마지막 수집일 이전으로 겹쳐서 재수집할 일수
+                      (0이면 마지막 수집일 다음날부터)
 
     Returns:
         (start_date, end_date, is_first_ingestion) 튜플
@@ -127,17 +155,25 @@ def get_update_date_range(client, ticker: str, max_lookback_days: int = 20000) -
     today = date.today()
 
     # ingestion_log에서 마지막 수집 날짜 확인
-    last_ingestion_date = get_last_ingestion_date(client, ticker)
+    if last_dates is None:
+        last_ingestion_date = get_last_ingestion_date(client, ticker)
+    else:
+        last_ingestion_date = last_dates.get(ticker)
 
     if last_ingestion_date:
-        # 증분 업데이트: 마지막 수집일 다음날부터 오늘까지
-        start_date = last_ingestion_date + timedelta(days=1)
-
         # 이미 최신 데이터가 있는 경우
-        if start_date > today:
+        if last_ingestion_date >= today:
             logger.info(f"{ticker}: Already up-to-date (last date: {last_ingestion_date})")
             return None, None, False
 
+        if overlap_days > 0:
+            # 증분 업데이트: 마지막 수집일 overlap_days일 전부터 오늘까지
+            # (직전 수집 이후 수정된 봉도 함께 갱신)
+            start_date = last_ingestion_date - timedelta(days=overlap_days)
+        else:
+            # 중복 제거가 안 되는 테이블: 마지막 수집일 다음날부터 오늘까지
+            start_date = last_ingestion_date + timedelta(days=1)
+
         logger.info(f"{ticker}: Incremental update from {start_date} to {today}")
         return start_date, today, False
     else:
@@ -147,43 +183,35 @@ def get_update_date_range(client, ticker: str, max_lookback_days: int = 20000) -
         return start_date, today, True
 
 
-def update_ticker(client, ticker: str, max_lookback_days: int = 20000) -> bool:
+def store_ticker_update(client, ticker: str, df, start_date: date, end_date: date,
+                        log_rows: list = None) -> bool:
     """
-    단일 티커의 데이터를 증분 업데이트
+    수집한 증분 데이터를 ClickHouse에 저장하고 ingestion_log 갱신
 
     Args:
         client: ClickHouse 클라이언트
         ticker: 티커 심볼
-        max_lookback_days: 첫 수집 시 lookback 일수
+        df: Yahoo Finance에서 수집한 DataFrame (실패 시 None)
+        start_date: 수집 시작 날짜
+        end_date: 수집 종료 날짜
+        log_rows: ingestion_log 행을 모을 리스트 (None이면 즉시 삽입)
 
     Returns:
-        성공 시 True, 실패 또는 스킵 시 False
+        성공 시 True, 실패 시 False
     """
     try:
-        # 업데이트할 날짜 범위 계산
-        start_date, end_date, is_first = get_update_date_range(client, ticker, max_lookback_days)
-
-        # 업데이트할 데이터가 없으면 스킵
-        if start_date is None or end_date is None:
-            return True  # 이미 최신이므로 성공으로 간주
-
-        # Yahoo Finance에서 데이터 수집
-        df = fetch_ticker_data(ticker, start_date, end_date)
-
         if df is None or df.empty:
             logger.warning(f"{ticker}: No data fetched for {start_date} to {end_date}")
-            update_ingestion_log(client, ticker, end_date, 0, 'failed')
+            update_ingestion_log(client, ticker, end_date, 0, 'failed', log_rows)
             return False
 
         # ClickHouse에 데이터 삽입
         record_count = insert_ohlcv_data(client, ticker, df)
 
         # ingestion_log 업데이트
-        last_date = df['date'].max()
-        if isinstance(last_date, str):
-            last_date = datetime.strptime(last_date, '%Y-%m-%d').date()
+        last_date = pd.Timestamp(df['date'].max()).date()
 
-        update_ingestion_log(client, ticker, last_date, record_count, 'success')
+        update_ingestion_log(client, ticker, last_date, record_count, 'success', log_rows)
 
         logger.info(f"{ticker}: Successfully updated {record_count} rows")
         return True
@@ -191,12 +219,105 @@ def update_ticker(client, ticker: str, max_lookback_days: int = 20000) -> bool:
     except Exception as e:
         logger.error(f"{ticker}: Error during update: {e}", exc_info=True)
         try:
-            update_ingestion_log(client, ticker, date.today(), 0, 'failed')
+            update_ingestion_log(client, ticker, date.today(), 0, 'failed', log_rows)
         except:
             pass
         return False
 
 
+def update_ticker(client, ticker: str, max_lookback_days: int = 20000,
+                  overlap_days: int = REFETCH_OVERLAP_DAYS) -> bool:
+    """
+    단일 티커의 데이터를 증분 업데이트
+
+    Args:
+        client: ClickHouse 클라이언트
+        ticker: 티커 심볼
+        max_lookback_days: 첫 수집 시 lookback 일수
+        overlap_days: 마지막 수집일 이전으로 겹쳐서 재수집할 일수
+
+    Returns:
+        성공 시 True, 실패 또는 스킵 시 False
+    """
+    try:
+        # 업데이트할 날짜 범위 계산
+        start_date, end_date, is_first = get_update_date_range(
+            client, ticker, max_lookback_days, overlap_days=overlap_days
+        )
+    except Exception as e:
+        logger.error(f"{ticker}: Error during update: {e}", exc_info=True)
+        return False
+
+    # 업데이트할 데이터가 없으면 스킵
+    if start_date is None or end_date is None:
+        return True  # 이미 최신이므로 성공으로 간주
+
+    # Yahoo Finance에서 데이터 수집
+    df = fetch_ticker_data(ticker, start_date, end_date)
+    return store_ticker_update(client, ticker, df, start_date, end_date)
+
+
+def update_tickers(client, tickers: list, max_lookback_days: int = 20000,
+                   max_workers: int = FETCH_WORKERS, overlap_days: int = REFETCH_OVERLAP_DAYS) -> tuple:
+    """
+    여러 티커를 증분 업데이트. Yahoo 요청은 스레드로 동시에 진행.
+
+    날짜 범위 조회와 ClickHouse 저장은 메인 스레드에서 하나의 client로 처리하고,
+    I/O 대기가 긴 Yahoo Finance 수집만 max_workers개까지 동시에 실행한다.
+
+    Args:
+        client: ClickHouse 클라이언트
+        tickers: 티커 심볼 리스트
+        max_lookback_days: 첫 수집 시 lookback 일수
+        max_workers: Yahoo Finance 동시 요청 수
+        overlap_days: 마지막 수집일 이전으로 겹쳐서 재수집할 일수
+
+    Returns:
+        (success_count, fail_count) 튜플
+    """
+    success_count = 0
+    fail_count = 0
+
+    # 1. 티커별 업데이트 범위 계산 (이미 최신이면 성공으로 간주)
+    #    마지막 수집 날짜는 티커마다 조회하지 않고 한 번의 쿼리로 가져온다
+    last_dates = get_last_ingestion_dates(client, tickers)
+    pending = {}
+    for ticker in tickers:
+        try:
+            start_date, end_date, _ = get_update_date_range(
+                client, ticker, max_lookback_days, last_dates, overlap_days
+            )
+        except Exception as e:
+            logger.error(f"{ticker}: Error during update: {e}", exc_info=True)
+            fail_count += 1
+            continue
+        if start_date is None or end_date is None:
+            success_count += 1
+        else:
+            pending[ticker] = (start_date, end_date)
+
+    # 2. 수집은 동시에, 저장은 완료된 순서대로
+    #    ingestion_log 행은 모아서 마지막에 한 번의 INSERT로 기록
+    log_rows = []
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {
+                executor.submit(fetch_ticker_data, ticker, start_date, end_date): ticker
+                for ticker, (start_date, end_date) in pending.items()
+            }
+            for future in as_completed(futures):
+                ticker = futures[future]
+                start_date, end_date = pending[ticker]
+                if store_ticker_update(client, ticker, future.result(), start_date, end_date, log_rows):
+                    success_count += 1
+                else:
+                    fail_count += 1
+    finally:
+        flush_ingestion_log(client, log_rows)
+
+    return success_count, fail_count
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Update stock data in ClickHouse with incremental ingestion'
@@ -230,6 +351,12 @@ def main():
         type=int,
         help='Max lookback days for first ingestion (overrides config)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=FETCH_WORKERS,
+        help=f'Concurrent Yahoo Finance requests (default: {FETCH_WORKERS})'
+    )
 
     args = parser.parse_args()
 
@@ -263,9 +390,12 @@ def main():
         logger.info(f"Update parameters:")
         logger.info(f"  Tickers: {tickers}")
         logger.info(f"  Max lookback days: {max_lookback_days}")
+        logger.info(f"  Fetch workers: {args.workers}")
         logger.info(f"  ClickHouse: {host}:{port}/{database}")
 
-        # ClickHouse 연결
+        # ClickHouse 연결 (모든 티커가 이 client 하나를 재사용)
+        # 스레드로 병렬화하더라도 티커마다 get_client를 호출하지 말 것
+        # (연결 생성 비용 + 세션 충돌). 필요하면 워커당 하나만 생성한다.
         client = get_client(
             host=host,
             port=port,
@@ -275,17 +405,20 @@ def main():
         )
         logger.info("Connected to ClickHouse")
 
+        # 겹침 재수집은 stock_ohlcv가 ReplacingMergeTree일 때만 (MergeTree면 겹친 행이 중복 저장됨)
+        overlap_days = REFETCH_OVERLAP_DAYS
+        engine = get_table_engine(client, 'stock_ohlcv')
+        if engine != OHLCV_TABLE_ENGINE:
+            logger.warning(
+                f"stock_ohlcv engine is {engine}, not {OHLCV_TABLE_ENGINE}: "
+                f"refetch overlap disabled. Run initialize_schema() to migrate (see CRON_SETUP.md)."
+            )
+            overlap_days = 0
+
         # 각 티커별 데이터 업데이트
-        success_count = 0
-        fail_count = 0
-        skip_count = 0
-
-        for ticker in tickers:
-            result = update_ticker(client, ticker, max_lookback_days)
-            if result:
-                success_count += 1
-            else:
-                fail_count += 1
+        success_count, fail_count = update_tickers(
+            client, tickers, max_lookback_days, args.workers, overlap_days
+        )
 
         # 결과 요약
         logger.info("=" * 60)
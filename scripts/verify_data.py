@@ -7,172 +7,159 @@ import sys
 from pathlib import Path
 from datetime import date, timedelta
 
-# 프로젝트 루트를 sys.path에 추가
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
-
-from trading_system.ingestion.clickhouse_schema import get_client
+# trading_system은 `pip install -e .`로 설치해서 사용
+# (설치하지 않은 경우에만 프로젝트 루트를 sys.path에 추가)
+try:
+    import trading_system  # noqa: F401
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from trading_system.ingestion.clickhouse_schema import get_client, get_ohlcv_source
 import pandas as pd
 
 
+def _ticker_filter(ticker: str = None) -> tuple:
+    """티커 조건절과 바인딩 파라미터 생성 (전체 조회 시 조건 없음)"""
+    if ticker:
+        return "WHERE ticker = %(ticker)s", {"ticker": ticker}
+    return "", {}
+
+
 class DataVerifier:
-    """데이터 품질 검증 클래스"""
+    """데이터 품질 검증 클래스
+
+    표 형태 결과는 query_df로 받아 행 튜플을 거치지 않고 컬럼 단위로 DataFrame을 구성한다.
+    (컬럼 이름/순서는 SELECT 절의 별칭을 그대로 따른다)
+
+    stock_ohlcv가 ReplacingMergeTree이면 FINAL로 읽으므로, 증분 업데이트의 겹침 재수집으로
+    아직 병합되지 않은 행은 중복으로 보고되지 않는다.
+    """
 
     def __init__(self, client):
         self.client = client
+        # 'stock_ohlcv FINAL' (변환 전 MergeTree 테이블이면 'stock_ohlcv')
+        self.ohlcv_source = get_ohlcv_source(client)
 
-    def get_ticker_statistics(self, ticker: str = None) -> pd.DataFrame:
-        """티커별 통계 조회"""
-        if ticker:
-            query = """
-                SELECT
-                    ticker,
-                    COUNT(*) as record_count,
-                    MIN(date) as min_date,
-                    MAX(date) as max_date,
-                    AVG(close) as avg_close,
-                    MIN(close) as min_close,
-                    MAX(close) as max_close,
-                    AVG(volume) as avg_volume
-                FROM stock_ohlcv
-                WHERE ticker = %(ticker)s
-                GROUP BY ticker
-            """
-            result = self.client.query(query, parameters={"ticker": ticker})
-        else:
-            query = """
+    def get_statistics_and_duplicates(self, ticker: str = None) -> tuple:
+        """티커별 통계와 중복 데이터를 한 번의 스캔으로 조회
+
+        (ticker, date)별로 먼저 집계한 뒤 티커 단위로 다시 합치므로
+        통계와 중복 (ticker, date) 목록이 같은 스캔 결과에서 나온다.
+
+        Returns:
+            (통계 DataFrame, 중복 데이터 DataFrame)
+        """
+        where_clause, params = _ticker_filter(ticker)
+
+        query = f"""
+            SELECT
+                ticker,
+                sum(c) as record_count,
+                MIN(date) as min_date,
+                MAX(date) as max_date,
+                sum(sum_close) / sum(c) as avg_close,
+                MIN(min_close) as min_close,
+                MAX(max_close) as max_close,
+                sum(sum_volume) / sum(c) as avg_volume,
+                groupArrayIf((date, c), c > 1) as duplicates
+            FROM (
                 SELECT
                     ticker,
-                    COUNT(*) as record_count,
-                    MIN(date) as min_date,
-                    MAX(date) as max_date,
-                    AVG(close) as avg_close,
-                    MIN(close) as min_close,
-                    MAX(close) as max_close,
-                    AVG(volume) as avg_volume
-                FROM stock_ohlcv
-                GROUP BY ticker
-                ORDER BY ticker
-            """
-            result = self.client.query(query)
-
-        df = pd.DataFrame(
-            result.result_rows,
-            columns=['ticker', 'record_count', 'min_date', 'max_date',
-                     'avg_close', 'min_close', 'max_close', 'avg_volume']
+                    date,
+                    count() as c,
+                    sum(close) as sum_close,
+                    min(close) as min_close,
+                    max(close) as max_close,
+                    sum(volume) as sum_volume
+                FROM {self.ohlcv_source}
+                {where_clause}
+                GROUP BY ticker, date
+            )
+            GROUP BY ticker
+            ORDER BY ticker
+        """
+        df = self.client.query_df(query, parameters=params)
+        if df.empty:
+            return df, pd.DataFrame(columns=['ticker', 'date', 'count'])
+
+        duplicate_rows = sorted(
+            (row_ticker, dup_date, count)
+            for row_ticker, dups in zip(df['ticker'], df['duplicates'])
+            for dup_date, count in dups
         )
-        return df
+        duplicates_df = pd.DataFrame(duplicate_rows, columns=['ticker', 'date', 'count'])
+
+        return df.drop(columns=['duplicates']), duplicates_df
+
+    def get_ticker_statistics(self, ticker: str = None) -> pd.DataFrame:
+        """티커별 통계 조회"""
+        return self.get_statistics_and_duplicates(ticker)[0]
 
     def check_duplicates(self, ticker: str = None) -> pd.DataFrame:
         """중복 데이터 확인"""
-        if ticker:
-            query = """
-                SELECT ticker, date, COUNT(*) as count
-                FROM stock_ohlcv
-                WHERE ticker = %(ticker)s
-                GROUP BY ticker, date
-                HAVING count > 1
-                ORDER BY date
-            """
-            result = self.client.query(query, parameters={"ticker": ticker})
-        else:
-            query = """
-                SELECT ticker, date, COUNT(*) as count
-                FROM stock_ohlcv
-                GROUP BY ticker, date
-                HAVING count > 1
-                ORDER BY ticker, date
-            """
-            result = self.client.query(query)
-
-        df = pd.DataFrame(
-            result.result_rows,
-            columns=['ticker', 'date', 'count']
-        )
-        return df
+        return self.get_statistics_and_duplicates(ticker)[1]
 
     def check_invalid_prices(self, ticker: str = None) -> dict:
         """잘못된 가격 데이터 확인 (음수, 0, high < low 등)"""
-        base_where = f"ticker = '{ticker}'" if ticker else "1=1"
-
-        # 음수/0 가격
-        query_negative = f"""
-            SELECT COUNT(*) FROM stock_ohlcv
-            WHERE {base_where} AND (open <= 0 OR high <= 0 OR low <= 0 OR close <= 0)
-        """
-
-        # high < low
-        query_high_low = f"""
-            SELECT COUNT(*) FROM stock_ohlcv
-            WHERE {base_where} AND high < low
-        """
+        where_clause, params = _ticker_filter(ticker)
 
-        # close < low or close > high
-        query_close_range = f"""
-            SELECT COUNT(*) FROM stock_ohlcv
-            WHERE {base_where} AND (close < low OR close > high)
-        """
-
-        # open < low or open > high
-        query_open_range = f"""
-            SELECT COUNT(*) FROM stock_ohlcv
-            WHERE {base_where} AND (open < low OR open > high)
-        """
-
-        # 음수 volume
-        query_negative_volume = f"""
-            SELECT COUNT(*) FROM stock_ohlcv
-            WHERE {base_where} AND volume < 0
+        # 검사 항목별로 따로 조회하지 않고 조건부 집계 한 번으로 테이블을 한 번만 스캔
+        query = f"""
+            SELECT
+                countIf(open <= 0 OR high <= 0 OR low <= 0 OR close <= 0),
+                countIf(high < low),
+                countIf(close < low OR close > high),
+                countIf(open < low OR open > high),
+                countIf(volume < 0)
+            FROM {self.ohlcv_source}
+            {where_clause}
         """
+        row = self.client.query(query, parameters=params).result_rows[0]
 
-        return {
-            'negative_or_zero_prices': self.client.command(query_negative),
-            'high_less_than_low': self.client.command(query_high_low),
-            'close_out_of_range': self.client.command(query_close_range),
-            'open_out_of_range': self.client.command(query_open_range),
-            'negative_volume': self.client.command(query_negative_volume),
-        }
+        return dict(zip(
+            ['negative_or_zero_prices', 'high_less_than_low', 'close_out_of_range',
+             'open_out_of_range', 'negative_volume'],
+            row
+        ))
 
     def check_null_values(self, ticker: str = None) -> dict:
         """NULL 값 확인"""
-        base_where = f"ticker = '{ticker}'" if ticker else "1=1"
+        where_clause, params = _ticker_filter(ticker)
 
         columns = ['open', 'high', 'low', 'close', 'adjusted_close', 'volume']
-        null_counts = {}
-
-        for col in columns:
-            query = f"""
-                SELECT COUNT(*) FROM stock_ohlcv
-                WHERE {base_where} AND {col} IS NULL
-            """
-            null_counts[col] = self.client.command(query)
+        null_aggregates = ", ".join(f"countIf({col} IS NULL)" for col in columns)
+        query = f"""
+            SELECT {null_aggregates}
+            FROM {self.ohlcv_source}
+            {where_clause}
+        """
+        row = self.client.query(query, parameters=params).result_rows[0]
 
-        return null_counts
+        return dict(zip(columns, row))
 
     def find_date_gaps(self, ticker: str) -> list:
         """날짜 간격(gap) 찾기 (5일 이상 차이나는 경우)"""
-        query = """
-            SELECT
-                date as current_date,
-                lagInFrame(date) OVER (ORDER BY date) as prev_date,
-                dateDiff('day', lagInFrame(date) OVER (ORDER BY date), date) as gap_days
-            FROM stock_ohlcv
-            WHERE ticker = %(ticker)s
-            ORDER BY date
+        # gap 필터링을 SQL에서 처리해 gap 행만 전송받는다
+        query = f"""
+            SELECT prev_date, current_date, gap_days
+            FROM (
+                SELECT
+                    date as current_date,
+                    lagInFrame(date) OVER (ORDER BY date) as prev_date,
+                    dateDiff('day', lagInFrame(date) OVER (ORDER BY date), date) as gap_days,
+                    row_number() OVER (ORDER BY date) as row_num
+                FROM {self.ohlcv_source}
+                WHERE ticker = %(ticker)s
+            )
+            WHERE row_num > 1 AND gap_days > 5  -- 주말 제외 5일 이상 gap
+            ORDER BY current_date
         """
         result = self.client.query(query, parameters={"ticker": ticker})
 
-        gaps = []
-        for row in result.result_rows:
-            current_date, prev_date, gap_days = row
-            if prev_date and gap_days > 5:  # 주말 제외 5일 이상 gap
-                gaps.append({
-                    'prev_date': prev_date,
-                    'current_date': current_date,
-                    'gap_days': gap_days
-                })
-
-        return gaps
+        return [
+            {'prev_date': prev_date, 'current_date': current_date, 'gap_days': gap_days}
+            for prev_date, current_date, gap_days in result.result_rows
+        ]
 
     def get_ingestion_log(self) -> pd.DataFrame:
         """ingestion_log 테이블 조회"""
@@ -186,13 +173,7 @@ class DataVerifier:
             FROM ingestion_log
             ORDER BY last_ingestion DESC
         """
-        result = self.client.query(query)
-
-        df = pd.DataFrame(
-            result.result_rows,
-            columns=['ticker', 'last_date', 'last_ingestion', 'record_count', 'status']
-        )
-        return df
+        return self.client.query_df(query)
 
 
 def print_section(title: str):
@@ -239,7 +220,8 @@ def main():
 
     # 1. 티커별 통계
     print_section("1. 티커별 통계")
-    stats_df = verifier.get_ticker_statistics(args.ticker)
+    # 통계와 중복 확인은 같은 스캔에서 함께 조회
+    stats_df, duplicates_df = verifier.get_statistics_and_duplicates(args.ticker)
     if not stats_df.empty:
         print(stats_df.to_string(index=False))
     else:
@@ -247,7 +229,6 @@ def main():
 
     # 2. 중복 데이터 확인
     print_section("2. 중복 데이터 확인")
-    duplicates_df = verifier.check_duplicates(args.ticker)
     if not duplicates_df.empty:
         print(f"⚠️  Found {len(duplicates_df)} duplicate records:")
         print(duplicates_df.to_string(index=False))
@@ -303,8 +284,9 @@ def main():
 
     # 요약
     print_section("검증 완료")
-    total_records = verifier.client.command("SELECT COUNT(*) FROM stock_ohlcv")
-    total_tickers = verifier.client.command("SELECT COUNT(DISTINCT ticker) FROM stock_ohlcv")
+    total_records, total_tickers = verifier.client.query(
+        f"SELECT COUNT(*), COUNT(DISTINCT ticker) FROM {verifier.ohlcv_source}"
+    ).result_rows[0]
     print(f"Total records: {total_records}")
     print(f"Total tickers: {total_tickers}")
     print()
@@ -8,12 +8,14 @@
 [ 실행 흐름 ]
     run_backtest() 호출 시:
         1. 모든 종목의 거래일 합집합 추출
-        2. 각 거래일에 대해 _simulate_day() 호출
+        2. 종목별 종가를 거래일 × 종목 행렬(prices)로 정렬
+        3. 각 거래일에 대해 _simulate_day() 호출
            → 종목별로 strategy.generate_signal() 호출
+             (supports_fast_path 전략이면 generate_signal_fast()를 DataFrame 대신 종가/거래량 배열 뷰로 호출)
            → Signal이 BUY/SELL이면 _execute_buy/sell() 실행
            → portfolio에 거래 반영
-        3. 일별 총 자산 가치 기록 (daily_values)
-        4. metrics.calculate_metrics()로 성과 지표 계산
+        4. 일별 총 자산 가치 기록 (daily_values)
+        5. metrics.calculate_metrics()로 성과 지표 계산
 
 [ 의존성 ]
     - core/trading_strategy.py::TradingStrategy (전략 인터페이스)
@@ -26,8 +28,9 @@
 
 import logging
 from datetime import date
-from typing import Any
+from typing import Any, Iterator
 
+import numpy as np
 import pandas as pd
 
 from trading_system.backtest.metrics import BacktestMetrics, calculate_metrics
@@ -52,10 +55,14 @@ class BacktestEngine:
         self.tax_rate = tax_rate
         self.slippage_rate = slippage_rate
 
+        # 체결가 계산용 상수 (매 주문마다 다시 계산하지 않도록 미리 계산)
+        self._buy_price_factor = 1 + slippage_rate    # 매수 시 불리하게 (가격↑)
+        self._sell_price_factor = 1 - slippage_rate   # 매도 시 불리하게 (가격↓)
+
         # 백테스트 실행 후 채워지는 결과
         self.portfolio: Portfolio | None = None       # 최종 포트폴리오 상태
-        self.daily_values: list[float] = []           # 일별 총 자산 (MDD/샤프 계산용)
-        self.daily_dates: list[date] = []             # 일별 날짜
+        self.daily_values: np.ndarray = np.empty(0)   # 일별 총 자산 (MDD/샤프 계산용)
+        self.daily_dates: np.ndarray = np.empty(0, dtype="datetime64[D]")  # 일별 날짜
         self.metrics: BacktestMetrics | None = None   # 최종 성과 지표
 
     def run_backtest(
@@ -77,18 +84,31 @@ class BacktestEngine:
             BacktestMetrics: 성과 지표
         """
         self.portfolio = Portfolio(self.initial_cash)
-        self.daily_values = []
-        self.daily_dates = []
-
-        # 전체 거래일 추출
-        all_dates: set[date] = set()
-        for df in data.values():
-            df_copy = df.copy()
-            df_copy["date"] = pd.to_datetime(df_copy["date"]).dt.date
-            dates = df_copy[(df_copy["date"] >= start_date) & (df_copy["date"] <= end_date)]["date"]
-            all_dates.update(dates)
-
-        trading_dates = sorted(all_dates)
+        self.daily_values = np.empty(0)
+        self.daily_dates = np.empty(0, dtype="datetime64[D]")
+
+        # 종목별 데이터 전처리 + 전체 거래일 추출 (한 번의 순회)
+        #   입력 DataFrame은 변경하지 않으므로 복사하지 않고, 날짜 변환도 종목당 한 번만 수행
+        #   (pandas Copy-on-Write(3.0 기본)에서는 assign/reset_index가 나머지 컬럼 버퍼를 원본과 공유한다.
+        #    DB에서 날짜순으로 조회한 데이터는 이미 정렬되어 있으므로 재정렬도 생략)
+        lo, hi = np.datetime64(start_date, "D"), np.datetime64(end_date, "D")
+        ticker_data: dict[str, pd.DataFrame] = {}
+        ticker_dates: dict[str, np.ndarray] = {}
+        in_range_dates: list[np.ndarray] = []
+        for ticker, df in data.items():
+            df_sorted = df.assign(date=pd.to_datetime(df["date"]))
+            if not df_sorted["date"].is_monotonic_increasing:
+                df_sorted = df_sorted.sort_values("date")
+            df_sorted = df_sorted.reset_index(drop=True)
+            dates = df_sorted["date"].to_numpy(dtype="datetime64[D]")
+            df_sorted["date"] = df_sorted["date"].dt.date
+            ticker_data[ticker] = df_sorted
+            ticker_dates[ticker] = dates
+            strategy.prepare(ticker, df_sorted)
+            in_range_dates.append(dates[(dates >= lo) & (dates <= hi)])
+
+        date_array = np.unique(np.concatenate(in_range_dates)) if in_range_dates else np.array([], dtype="datetime64[D]")
+        trading_dates: list[date] = date_array.tolist()
 
         if not trading_dates:
             logger.warning("거래일이 없습니다.")
@@ -96,26 +116,55 @@ class BacktestEngine:
 
         logger.info(f"백테스트 시작: {trading_dates[0]} ~ {trading_dates[-1]} ({len(trading_dates)}일)")
 
-        # 종목별 데이터 전처리
-        ticker_data: dict[str, pd.DataFrame] = {}
-        for ticker, df in data.items():
-            df_copy = df.copy()
-            df_copy["date"] = pd.to_datetime(df_copy["date"]).dt.date
-            df_copy = df_copy.sort_values("date").reset_index(drop=True)
-            ticker_data[ticker] = df_copy
-
-        # 일별 시뮬레이션
-        for current_date in trading_dates:
-            self._simulate_day(strategy, ticker_data, current_date)
+        # 거래일 × 종목 행렬 구성 (SoA)
+        #   prices[i, t]: i번째 거래일의 종목 t 종가 (해당일 데이터 없으면 NaN)
+        #   rows[i, t]:   그 종가가 있는 ticker_data[t]의 행 위치 (없으면 -1)
+        # 매일 종목별 DataFrame을 날짜로 다시 걸러내는 대신 행렬 인덱싱으로 조회한다.
+        # 종목 날짜 → 거래일 위치는 정렬된 거래일 배열에 대한 searchsorted로 한 번에 계산
+        tickers = list(ticker_data)
+        prices = np.full((len(trading_dates), len(tickers)), np.nan)
+        rows = np.full((len(trading_dates), len(tickers)), -1, dtype=np.int64)
+        for t, ticker in enumerate(tickers):
+            dates = ticker_dates[ticker]
+            pos = np.searchsorted(date_array, dates)
+            matched = date_array[np.minimum(pos, len(date_array) - 1)] == dates
+            in_range = np.flatnonzero(matched)
+            # 같은 날짜가 여러 행이면 첫 행 기준 (역순으로 써서 앞 행이 남도록)
+            in_range = in_range[::-1]
+            prices[pos[in_range], t] = ticker_data[ticker]["close"].to_numpy(dtype=np.float64)[in_range]
+            rows[pos[in_range], t] = in_range
+
+        # 일별 시뮬레이션 (거래일 수를 알고 있으므로 결과 배열을 미리 할당)
+        self.daily_values = np.empty(len(trading_dates), dtype=np.float64)
+        self.daily_dates = date_array
+        ticker_cols = {ticker: t for t, ticker in enumerate(tickers)}
+        max_buy_count = int(strategy.params.get("split_count", 0))
+        position_infos = {
+            ticker: PositionInfo(ticker=ticker, max_buy_count=max_buy_count) for ticker in tickers
+        }
+        # 종목별 Position도 미리 만들어 두어 매매 루프에서는 생성 분기를 타지 않도록
+        for ticker in tickers:
+            self.portfolio.get_position(ticker)
+        # generate_signal_fast를 구현한 전략에는 DataFrame 슬라이스 대신 종목별 종가/거래량 배열의 뷰를 넘긴다
+        if strategy.supports_fast_path:
+            arrays = [
+                (ticker_data[ticker]["close"].to_numpy(), ticker_data[ticker]["volume"].to_numpy())
+                for ticker in tickers
+            ]
+        else:
+            arrays = None
+        for i, current_date in enumerate(trading_dates):
+            self._simulate_day(
+                strategy, ticker_data, tickers, position_infos, prices[i], rows[i], current_date, arrays
+            )
 
             # 일별 자산 가치 기록
-            total_value = self._calculate_total_value(ticker_data, current_date)
-            self.daily_values.append(total_value)
-            self.daily_dates.append(current_date)
+            self.daily_values[i] = self._calculate_total_value(ticker_cols, prices[i])
 
         # 성과 지표 계산
         self.metrics = calculate_metrics(
-            trade_history=self.portfolio.trade_history,
+            trade_history=None,
+            sell_profits=self.portfolio.profit_array(side="sell"),
             daily_values=self.daily_values,
             initial_cash=self.initial_cash,
             trading_days=len(trading_dates),
@@ -128,47 +177,63 @@ class BacktestEngine:
         self,
         strategy: TradingStrategy,
         ticker_data: dict[str, pd.DataFrame],
+        tickers: list[str],
+        position_infos: dict[str, PositionInfo],
+        day_prices: np.ndarray,
+        day_rows: np.ndarray,
         current_date: date,
+        arrays: list[tuple[np.ndarray, np.ndarray]] | None = None,
     ) -> None:
-        """하루 시뮬레이션. 모든 종목에 대해 시그널 생성 → 주문 실행."""
-        for ticker, df in ticker_data.items():
-            # 전략에 전달할 데이터: 현재일까지의 과거 데이터 (미래 데이터 누출 방지)
-            mask = df["date"] <= current_date
-            available_data = df[mask]
+        """하루 시뮬레이션. 모든 종목에 대해 시그널 생성 → 주문 실행.
 
-            if available_data.empty:
-                continue
+        day_prices/day_rows는 run_backtest에서 만든 prices/rows 행렬의 현재일 행.
+        position_infos는 run_backtest에서 종목별로 한 번 만든 PositionInfo (매일 값만 갱신).
+        arrays가 있으면 (tickers 순서의 종목별 (종가, 거래량) 배열) generate_signal_fast를 호출.
+        """
+        lookback = int(strategy.params.get("ma_period", 30)) + 30
 
+        # 종목 루프 안에서 반복 조회하는 속성은 지역 변수로 바인딩
+        portfolio = self.portfolio
+        get_position = portfolio.get_position
+        generate_signal = strategy.generate_signal
+        generate_signal_fast = strategy.generate_signal_fast if arrays is not None else None
+
+        for t, ticker in enumerate(tickers):
             # 현재일 데이터 존재 여부 확인
-            today_data = df[df["date"] == current_date]
-            if today_data.empty:
+            row = int(day_rows[t])
+            if row < 0:
                 continue
 
-            current_price = float(today_data.iloc[0]["close"])
+            current_price = float(day_prices[t])
 
-            # 포지션 정보 구성
-            position = self.portfolio.get_position(ticker)
-            position_info = PositionInfo(
-                ticker=ticker,
-                quantity=position.quantity,
-                avg_price=position.avg_price,
-                buy_count=position.buy_count,
-                max_buy_count=int(strategy.params.get("split_count", 0)),
-            )
+            # 포지션 정보 갱신 (종목별로 미리 만든 객체를 재사용)
+            position = get_position(ticker)
+            position_info = position_infos[ticker]
+            position_info.quantity = position.quantity
+            position_info.avg_price = position.avg_price
+            position_info.buy_count = position.buy_count
 
             # 시그널 생성
-            lookback = int(strategy.params.get("ma_period", 30)) + 30
-            signal = strategy.generate_signal(
-                market_data=available_data.tail(lookback),
-                position_info=position_info,
-                available_cash=self.portfolio.cash,
-            )
+            # 전략에 전달할 데이터: 현재일까지의 과거 데이터 (미래 데이터 누출 방지)
+            # 날짜순 정렬되어 있으므로 현재일 행까지 위치로 잘라낸다
+            start = max(0, row + 1 - lookback)
+            if arrays is not None:
+                closes, volumes = arrays[t]
+                signal = generate_signal_fast(
+                    closes[start:row + 1], volumes[start:row + 1], row, position_info, portfolio.cash
+                )
+            else:
+                signal = generate_signal(
+                    market_data=ticker_data[ticker].iloc[start:row + 1],
+                    position_info=position_info,
+                    available_cash=portfolio.cash,
+                )
 
             # 시그널 실행
             if signal.signal_type == SignalType.BUY:
-                self._execute_buy(ticker, signal.quantity, current_price, str(current_date), signal.reason)
+                self._execute_buy(ticker, signal.quantity, current_price, str(current_date), str(signal.reason))
             elif signal.signal_type == SignalType.SELL:
-                self._execute_sell(ticker, signal.quantity, current_price, str(current_date), signal.reason)
+                self._execute_sell(ticker, signal.quantity, current_price, str(current_date), str(signal.reason))
 
     def _execute_buy(
         self,
@@ -179,7 +244,7 @@ class BacktestEngine:
         reason: str,
     ) -> None:
         """매수 실행. 슬리피지(가격↑) + 수수료 적용 후 portfolio에 반영."""
-        exec_price = price * (1 + self.slippage_rate)  # 매수 시 불리하게
+        exec_price = price * self._buy_price_factor
         commission = exec_price * quantity * self.commission_rate
 
         success = self.portfolio.execute_buy(
@@ -202,9 +267,10 @@ class BacktestEngine:
         reason: str,
     ) -> None:
         """매도 실행. 슬리피지(가격↓) + 수수료 + 세금 적용 후 portfolio에 반영."""
-        exec_price = price * (1 - self.slippage_rate)  # 매도 시 불리하게
-        commission = exec_price * quantity * self.commission_rate
-        tax = exec_price * quantity * self.tax_rate  # 매도세
+        exec_price = price * self._sell_price_factor
+        amount = exec_price * quantity
+        commission = amount * self.commission_rate
+        tax = amount * self.tax_rate  # 매도세
 
         success = self.portfolio.execute_sell(
             ticker=ticker,
@@ -220,44 +286,56 @@ class BacktestEngine:
 
     def _calculate_total_value(
         self,
-        ticker_data: dict[str, pd.DataFrame],
-        current_date: date,
+        ticker_cols: dict[str, int],
+        day_prices: np.ndarray,
     ) -> float:
-        """현재일 기준 총 자산 가치 계산."""
+        """현재일 기준 총 자산 가치 계산.
+
+        현재일 종가가 없는 보유 종목은 평균 매입가로 평가.
+        """
         total = self.portfolio.cash
-        for ticker in self.portfolio.get_holding_tickers():
-            position = self.portfolio.get_position(ticker)
-            if ticker in ticker_data:
-                df = ticker_data[ticker]
-                today = df[df["date"] == current_date]
-                if not today.empty:
-                    price = float(today.iloc[0]["close"])
-                else:
-                    price = position.avg_price
+        # 전체 positions가 아닌 현재 보유 종목만 순회
+        holdings = self.portfolio.holdings
+        if not holdings:
+            return total
+
+        # 보유 수량/평균가 벡터를 만들어 종가 행과 내적
+        quantities = np.zeros(len(day_prices))
+        fallback = np.zeros(len(day_prices))
+        for ticker, position in holdings.items():
+            t = ticker_cols.get(ticker)
+            if t is None:
+                total += position.quantity * position.avg_price
             else:
-                price = position.avg_price
-            total += position.quantity * price
-        return total
+                quantities[t] = position.quantity
+                fallback[t] = position.avg_price
+        prices = np.where(np.isnan(day_prices), fallback, day_prices)
+        return total + float(prices @ quantities)
 
-    def generate_report(self) -> dict[str, Any]:
-        """백테스트 리포트 생성."""
+    def generate_report(self, include_trades: bool = True) -> dict[str, Any]:
+        """백테스트 리포트 생성.
+
+        Args:
+            include_trades: False면 거래 내역(trades) 변환을 생략 (지표/요약만 필요할 때)
+        """
         if self.metrics is None or self.portfolio is None:
             return {"error": "백테스트를 먼저 실행하세요."}
 
-        return {
+        report = {
             "metrics": self.metrics.to_dict(),
             "portfolio_summary": self.portfolio.get_summary(),
-            "trade_count": len(self.portfolio.trade_history),
-            "trades": [
-                {
-                    "date": t.date,
-                    "ticker": t.ticker,
-                    "side": t.side,
-                    "quantity": t.quantity,
-                    "price": t.price,
-                    "profit": t.profit,
-                    "reason": t.reason,
-                }
-                for t in self.portfolio.trade_history
-            ],
+            "trade_count": self.portfolio.trade_count,
         }
+        if include_trades:
+            report["trades"] = list(self.iter_trades())
+        return report
+
+    def iter_trades(self) -> Iterator[dict[str, Any]]:
+        """거래 내역을 dict로 하나씩 생성 (전체 리스트를 만들지 않음)."""
+        if self.portfolio is None:
+            return
+        # TradeRecord 객체를 만들지 않고 컬럼 리스트를 묶어서 순회
+        keys = ("date", "ticker", "side", "quantity", "price", "profit", "reason")
+        columns = [self.portfolio.trade_column(k) for k in keys]
+        for values in zip(*columns):
+            yield dict(zip(keys, values))
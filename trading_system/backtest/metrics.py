@@ -16,8 +16,9 @@
     - backtest/engine.py::BacktestEngine.run_backtest() 완료 시 호출
 
 [ 입력 데이터 ]
-    - trade_history: data/portfolio.py::Portfolio.trade_history (매도 거래만 분석)
-    - daily_values: engine.py에서 매일 기록한 총 자산 리스트
+    - sell_profits: data/portfolio.py::Portfolio.profit_array(side="sell") (매도 거래만 분석)
+      또는 trade_history: Portfolio.trade_history (TradeRecord 리스트)
+    - daily_values: engine.py에서 매일 기록한 총 자산 배열
 """
 
 from dataclasses import dataclass
@@ -78,26 +79,31 @@ class BacktestMetrics:
 
 
 def calculate_metrics(
-    trade_history: list[TradeRecord],
-    daily_values: list[float],
+    trade_history: list[TradeRecord] | None,
+    daily_values: np.ndarray | list[float],
     initial_cash: float,
     trading_days: int,
+    sell_profits: np.ndarray | None = None,
 ) -> BacktestMetrics:
     """성과 지표 계산. engine.py에서 백테스트 완료 후 호출됨.
 
     Args:
-        trade_history: Portfolio.trade_history (매수+매도 전체)
-        daily_values: 일별 총 자산 리스트 (현금 + 보유종목 평가)
+        trade_history: Portfolio.trade_history (매수+매도 전체). sell_profits를 주면 None 가능
+        daily_values: 일별 총 자산 배열 (현금 + 보유종목 평가)
         initial_cash: 초기 자금
         trading_days: 백테스트 기간 중 총 거래일 수
+        sell_profits: 매도 거래별 실현 손익 배열 (Portfolio.profit_array(side="sell")).
+            주어지면 trade_history 대신 사용 (TradeRecord 객체를 순회하지 않음)
     """
     metrics = BacktestMetrics()
 
-    if not daily_values:
+    # 파이썬 루프 대신 NumPy 배열 연산으로 일괄 계산 (engine은 이미 float64 배열을 넘기므로 복사 없음)
+    values = np.asarray(daily_values, dtype=np.float64)
+    if values.size == 0:
         return metrics
 
     # ─── 수익률 계산 ─────────────────────────────────────────────────────
-    final_value = daily_values[-1]
+    final_value = float(values[-1])
     metrics.total_return = (final_value - initial_cash) / initial_cash * 100
 
     # 연환산: (최종/초기)^(1/년수) - 1
@@ -109,71 +115,62 @@ def calculate_metrics(
 
     # ─── 샤프 비율 ────────────────────────────────────────────────────────
     # 일별 수익률로 계산. 샤프 = (평균 초과수익 / 표준편차) * sqrt(252)
-    daily_returns = []
-    for i in range(1, len(daily_values)):
-        if daily_values[i - 1] > 0:
-            ret = (daily_values[i] - daily_values[i - 1]) / daily_values[i - 1]
-            daily_returns.append(ret)
-
-    if daily_returns:
-        returns_arr = np.array(daily_returns)
+    prev = values[:-1]
+    valid = prev > 0
+    returns_arr = (values[1:][valid] - prev[valid]) / prev[valid]
+
+    if returns_arr.size:
         risk_free_daily = 0.03 / 252
-        excess_returns = returns_arr - risk_free_daily
-        std = np.std(excess_returns)
+        # 표준편차는 상수 이동에 불변이므로 초과수익 배열을 따로 만들지 않고
+        # 수익률 자체의 평균/표준편차에서 무위험 수익률만 뺀다
+        std = np.std(returns_arr)
         if std > 1e-10:
-            metrics.sharpe_ratio = np.mean(excess_returns) / std * np.sqrt(252)
+            metrics.sharpe_ratio = (np.mean(returns_arr) - risk_free_daily) / std * np.sqrt(252)
 
     # ─── MDD (Maximum Drawdown) ────────────────────────────────────────────
     # 고점 대비 최대 하락폭. 낮을수록 좋음.
-    if daily_values:
-        peak = daily_values[0]
-        max_dd = 0.0
-        for value in daily_values:
-            if value > peak:
-                peak = value
-            dd = (peak - value) / peak * 100
-            if dd > max_dd:
-                max_dd = dd
-        metrics.max_drawdown = max_dd
+    peak = np.maximum.accumulate(values)
+    drawdowns = (peak - values) / peak * 100
+    metrics.max_drawdown = max(float(drawdowns.max()), 0.0)
 
     # ─── 거래 기반 지표 (매도 거래만 분석) ─────────────────────────────────
     # 매수는 비용 발생일 뿐, 수익 실현은 매도 시에만 발생
-    sell_trades = [t for t in trade_history if t.side == "sell"]
-    metrics.total_trades = len(sell_trades)
-
-    if sell_trades:
-        profits = [t.profit for t in sell_trades]
-        winners = [p for p in profits if p > 0]
-        losers = [p for p in profits if p <= 0]
-
-        metrics.winning_trades = len(winners)
-        metrics.losing_trades = len(losers)
-        metrics.win_rate = len(winners) / len(sell_trades) * 100
-
-        if winners:
-            metrics.avg_profit = sum(winners) / len(winners)
-        if losers:
-            metrics.avg_loss = sum(losers) / len(losers)
-
-        total_profit = sum(winners) if winners else 0
-        total_loss = abs(sum(losers)) if losers else 0
+    if sell_profits is None:
+        sell_profits = np.array([t.profit for t in trade_history if t.side == "sell"], dtype=np.float64)
+    profits = np.asarray(sell_profits, dtype=np.float64)
+    metrics.total_trades = int(profits.size)
+
+    if profits.size:
+        is_win = profits > 0
+        winners = profits[is_win]
+        losers = profits[~is_win]
+
+        metrics.winning_trades = int(winners.size)
+        metrics.losing_trades = int(losers.size)
+        metrics.win_rate = winners.size / profits.size * 100
+
+        if winners.size:
+            metrics.avg_profit = float(winners.mean())
+        if losers.size:
+            metrics.avg_loss = float(losers.mean())
+
+        total_profit = float(winners.sum())
+        total_loss = abs(float(losers.sum()))
         metrics.profit_factor = total_profit / total_loss if total_loss > 0 else float("inf")
 
         # 연속 승패
-        consecutive_wins = 0
-        consecutive_losses = 0
-        max_wins = 0
-        max_losses = 0
-        for p in profits:
-            if p > 0:
-                consecutive_wins += 1
-                consecutive_losses = 0
-                max_wins = max(max_wins, consecutive_wins)
-            else:
-                consecutive_losses += 1
-                consecutive_wins = 0
-                max_losses = max(max_losses, consecutive_losses)
-        metrics.max_consecutive_wins = max_wins
-        metrics.max_consecutive_losses = max_losses
+        metrics.max_consecutive_wins = _max_streak(is_win)
+        metrics.max_consecutive_losses = _max_streak(~is_win)
 
     return metrics
+
+
+def _max_streak(flags: np.ndarray) -> int:
+    """bool 배열에서 True가 연속된 최대 길이."""
+    if not flags.any():
+        return 0
+    # 양 끝을 False로 감싼 뒤 False→True(시작), True→False(끝) 경계 위치의 차이가 연속 길이
+    edges = np.diff(np.concatenate(([0], flags.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return int((ends - starts).max())
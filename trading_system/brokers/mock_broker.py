@@ -21,10 +21,11 @@
     실제 증권사 연동 시 이 파일 대신 kis_broker.py 등을 사용
 """
 
-import uuid
+import time
 from datetime import date
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 
 from trading_system.core.broker_api import (
@@ -40,6 +41,9 @@ from trading_system.core.data_provider import DataProvider, OHLCV
 
 # ─── Mock 데이터 제공자 ──────────────────────────────────────────────────────
 
+PRICE_COLUMNS = ("open", "high", "low", "close")
+
+
 class MockDataProvider(DataProvider):
     """DataFrame 기반 Mock 데이터 제공자.
 
@@ -52,19 +56,44 @@ class MockDataProvider(DataProvider):
 
     def __init__(self):
         self._data: dict[str, pd.DataFrame] = {}  # ticker → OHLCV DataFrame
+        self._dates: dict[str, np.ndarray] = {}    # ticker → 정렬된 날짜 배열 (datetime64[D], 범위 조회용)
+        self._row_idx: dict[str, dict[date, int]] = {}  # ticker → {날짜: 행 위치} (당일 조회용)
         self._current_date: Optional[date] = None  # 시뮬레이션 현재일
 
     def load_data(self, ticker: str, df: pd.DataFrame) -> None:
         """데이터 로드.
 
+        입력 DataFrame은 복사하지 않고 날짜/가격 컬럼만 변환한 새 프레임으로 보관한다.
+        (pandas Copy-on-Write로 나머지 컬럼 버퍼는 원본과 공유되며, 어느 쪽을 수정해도 서로 영향 없음)
+
         Args:
             ticker: 종목 코드
             df: OHLCV DataFrame (columns: date, open, high, low, close, volume)
         """
-        df = df.copy()
         if "date" in df.columns:
-            df["date"] = pd.to_datetime(df["date"]).dt.date
-        self._data[ticker] = df.sort_values("date").reset_index(drop=True)
+            dates = df["date"]
+            if pd.api.types.is_string_dtype(dates):
+                # 날짜 문자열은 고유값만 파싱한 뒤 매핑 (행 수가 아닌 거래일 수만큼만 파싱)
+                uniq = pd.unique(dates)
+                parsed = dict(zip(uniq, pd.to_datetime(uniq, cache=True).date))
+                df = df.assign(date=dates.map(parsed))
+            else:
+                df = df.assign(date=pd.to_datetime(dates).dt.date)
+        # 가격은 float32로 저장 (유효숫자 7자리면 주가에 충분, 메모리/스캔 대역폭 절반)
+        # volume은 지수(^GSPC 등)에서 int32 범위를 넘으므로 그대로 둔다
+        price_columns = [c for c in PRICE_COLUMNS if c in df.columns and df[c].dtype != np.float32]
+        if price_columns:
+            df = df.astype({c: np.float32 for c in price_columns})
+
+        # 이미 날짜순이면 재정렬(전체 컬럼 복사)을 생략
+        if not df["date"].is_monotonic_increasing:
+            df = df.sort_values("date")
+        df = df.reset_index(drop=True)
+        self._data[ticker] = df
+        # 매 조회마다 날짜 컬럼 전체를 비교하지 않도록 인덱스를 미리 구성
+        self._dates[ticker] = df["date"].to_numpy(dtype="datetime64[D]")
+        # 같은 날짜가 여러 행이면 첫 행 기준 (역순으로 채워 앞 행이 남도록)
+        self._row_idx[ticker] = {d: i for i, d in reversed(list(enumerate(df["date"])))}
 
     def set_current_date(self, current_date: date) -> None:
         """현재 날짜 설정 (백테스트 시뮬레이션용)."""
@@ -81,27 +110,30 @@ class MockDataProvider(DataProvider):
             return pd.DataFrame(columns=["date", "open", "high", "low", "close", "volume"])
 
         df = self._data[ticker]
-        mask = (df["date"] >= start_date) & (df["date"] <= end_date)
-        return df[mask].copy().reset_index(drop=True)
+        # 정렬된 날짜 배열에서 이진 탐색으로 구간 위치를 찾아 슬라이스
+        dates = self._dates[ticker]
+        lo = np.searchsorted(dates, np.datetime64(start_date, "D"), side="left")
+        hi = np.searchsorted(dates, np.datetime64(end_date, "D"), side="right")
+        # 위치 슬라이스는 복사 없이 원본 버퍼를 공유 (Copy-on-Write라 호출자가 수정해도 저장본은 안전)
+        return df.iloc[lo:hi].reset_index(drop=True)
 
     def get_current_ohlcv(self, ticker: str) -> OHLCV:
         """당일 OHLCV 조회."""
         if ticker not in self._data or self._current_date is None:
             raise ValueError(f"No data for {ticker} on {self._current_date}")
 
-        df = self._data[ticker]
-        row = df[df["date"] == self._current_date]
-        if row.empty:
+        i = self._row_idx[ticker].get(self._current_date)
+        if i is None:
             raise ValueError(f"No data for {ticker} on {self._current_date}")
 
-        r = row.iloc[0]
+        df = self._data[ticker]
         return OHLCV(
-            date=r["date"],
-            open=float(r["open"]),
-            high=float(r["high"]),
-            low=float(r["low"]),
-            close=float(r["close"]),
-            volume=int(r["volume"]),
+            date=df["date"].iat[i],
+            open=float(df["open"].iat[i]),
+            high=float(df["high"].iat[i]),
+            low=float(df["low"].iat[i]),
+            close=float(df["close"].iat[i]),
+            volume=int(df["volume"].iat[i]),
         )
 
     def get_tickers(self) -> list[str]:
@@ -133,9 +165,26 @@ class MockBroker(BrokerAPI):
         self.tax_rate = tax_rate
         self.slippage_rate = slippage_rate
 
-        self._holdings: dict[str, Holding] = {}       # ticker → Holding
+        # 체결가 계산용 상수 (매 주문마다 다시 계산하지 않도록 미리 계산)
+        self._buy_price_factor = 1 + slippage_rate
+        self._sell_price_factor = 1 - slippage_rate
+
+        # 보유 종목은 종목별 객체 대신 컬럼 배열(SoA)로 관리 → 평가금액을 내적 한 번으로 계산
+        #   _rows[ticker] = i 이면 _qty[i], _total_cost[i], _current_price[i]가 해당 종목 값
+        #   평균 매수가는 누적 매수금액 / 수량으로 필요할 때만 계산 (매수마다 가중평균을 다시 나누지 않음)
+        #   앞쪽 _n개 행만 유효 (매도로 0주가 되면 마지막 행을 그 자리로 옮김)
+        self._rows: dict[str, int] = {}               # ticker → 행 위치
+        self._tickers: list[str] = []                 # 행 위치 → ticker
+        self._qty = np.zeros(16, dtype=np.int64)
+        self._total_cost = np.zeros(16, dtype=np.float64)
+        self._current_price = np.zeros(16, dtype=np.float64)
+        self._n = 0
         self._orders: dict[str, OrderResult] = {}     # order_id → OrderResult
-        self._prices: dict[str, float] = {}           # ticker → 현재가 (set_price로 설정)
+        # 주문 ID 일련번호 (uuid4 대신 카운터, 시작값은 실행 간 겹치지 않도록 현재 시각 기반)
+        self._next_id = int(time.time()) << 24
+        # 현재가 (set_price로 설정): 종목별 행 위치 + float64 배열 (주문마다 dict 값 조회 대신 배열 인덱싱)
+        self._price_rows: dict[str, int] = {}         # ticker → _price_arr 위치
+        self._price_arr = np.zeros(16, dtype=np.float64)
         self._connected = False
 
     def connect(self) -> bool:
@@ -145,14 +194,21 @@ class MockBroker(BrokerAPI):
     def disconnect(self) -> None:
         self._connected = False
 
+    def _new_order_id(self) -> str:
+        """Mock 주문 ID 발급."""
+        self._next_id += 1
+        return f"M{self._next_id:x}"
+
     def set_price(self, ticker: str, price: float) -> None:
         """종목 현재가 설정 (시뮬레이션용)."""
-        self._prices[ticker] = price
+        i = self._price_rows.setdefault(ticker, len(self._price_rows))
+        if i == len(self._price_arr):
+            self._price_arr = np.resize(self._price_arr, 2 * i)
+        self._price_arr[i] = price
 
     def get_account_info(self) -> AccountInfo:
-        total_holdings_value = sum(
-            h.current_price * h.quantity for h in self._holdings.values()
-        )
+        n = self._n
+        total_holdings_value = float(self._qty[:n] @ self._current_price[:n])
         total_assets = self.cash + total_holdings_value
         total_profit = total_assets - self.initial_cash
         profit_rate = total_profit / self.initial_cash * 100 if self.initial_cash > 0 else 0.0
@@ -169,7 +225,45 @@ class MockBroker(BrokerAPI):
         return self.cash
 
     def get_holdings(self) -> list[Holding]:
-        return list(self._holdings.values())
+        # Holding 객체는 외부에서 요청할 때만 생성
+        return [
+            Holding(
+                ticker=ticker,
+                name=ticker,
+                quantity=int(self._qty[i]),
+                avg_price=float(self._total_cost[i] / self._qty[i]),
+                current_price=float(self._current_price[i]),
+                profit=0.0,
+                profit_rate=0.0,
+            )
+            for i, ticker in enumerate(self._tickers)
+        ]
+
+    def _add_row(self, ticker: str) -> int:
+        """새 보유 종목 행 추가 (배열이 가득 차면 두 배로 확장)."""
+        i = self._n
+        if i == len(self._qty):
+            size = 2 * len(self._qty)
+            self._qty = np.resize(self._qty, size)
+            self._total_cost = np.resize(self._total_cost, size)
+            self._current_price = np.resize(self._current_price, size)
+        self._rows[ticker] = i
+        self._tickers.append(ticker)
+        self._n += 1
+        return i
+
+    def _remove_row(self, ticker: str) -> None:
+        """보유 종목 행 제거 (마지막 행을 빈 자리로 옮겨 앞쪽 _n개 행을 유지)."""
+        i = self._rows.pop(ticker)
+        last = self._n - 1
+        last_ticker = self._tickers.pop()
+        if i != last:
+            self._qty[i] = self._qty[last]
+            self._total_cost[i] = self._total_cost[last]
+            self._current_price[i] = self._current_price[last]
+            self._tickers[i] = last_ticker
+            self._rows[last_ticker] = i
+        self._n = last
 
     def buy_order(
         self,
@@ -178,15 +272,16 @@ class MockBroker(BrokerAPI):
         price: Optional[float] = None,
         order_type: OrderType = OrderType.MARKET,
     ) -> OrderResult:
-        order_id = str(uuid.uuid4())[:8]
+        order_id = self._new_order_id()
 
         if price is None:
-            price = self._prices.get(ticker, 0.0)
+            price = self.get_current_price(ticker)
 
         # 슬리피지 적용 (매수 시 가격 상승)
-        exec_price = price * (1 + self.slippage_rate)
-        commission = exec_price * quantity * self.commission_rate
-        total_cost = exec_price * quantity + commission
+        exec_price = price * self._buy_price_factor
+        amount = exec_price * quantity
+        commission = amount * self.commission_rate
+        total_cost = amount + commission
 
         if total_cost > self.cash:
             return OrderResult(
@@ -200,23 +295,15 @@ class MockBroker(BrokerAPI):
 
         self.cash -= total_cost
 
-        # 보유 종목 업데이트
-        if ticker in self._holdings:
-            h = self._holdings[ticker]
-            total_qty = h.quantity + quantity
-            avg_price = (h.avg_price * h.quantity + exec_price * quantity) / total_qty
-            h.quantity = total_qty
-            h.avg_price = avg_price
-        else:
-            self._holdings[ticker] = Holding(
-                ticker=ticker,
-                name=ticker,
-                quantity=quantity,
-                avg_price=exec_price,
-                current_price=exec_price,
-                profit=0.0,
-                profit_rate=0.0,
-            )
+        # 보유 종목 업데이트 (신규 종목은 빈 행을 만든 뒤 같은 누적 경로로 처리)
+        i = self._rows.get(ticker)
+        if i is None:
+            i = self._add_row(ticker)
+            self._qty[i] = 0
+            self._total_cost[i] = 0.0
+            self._current_price[i] = exec_price
+        self._total_cost[i] += amount
+        self._qty[i] += quantity
 
         result = OrderResult(
             order_id=order_id,
@@ -237,9 +324,10 @@ class MockBroker(BrokerAPI):
         price: Optional[float] = None,
         order_type: OrderType = OrderType.MARKET,
     ) -> OrderResult:
-        order_id = str(uuid.uuid4())[:8]
+        order_id = self._new_order_id()
 
-        if ticker not in self._holdings or self._holdings[ticker].quantity < quantity:
+        i = self._rows.get(ticker)
+        if i is None or self._qty[i] < quantity:
             return OrderResult(
                 order_id=order_id,
                 ticker=ticker,
@@ -250,20 +338,25 @@ class MockBroker(BrokerAPI):
             )
 
         if price is None:
-            price = self._prices.get(ticker, 0.0)
+            price = self.get_current_price(ticker)
 
         # 슬리피지 적용 (매도 시 가격 하락)
-        exec_price = price * (1 - self.slippage_rate)
-        commission = exec_price * quantity * self.commission_rate
-        tax = exec_price * quantity * self.tax_rate
-        revenue = exec_price * quantity - commission - tax
+        exec_price = price * self._sell_price_factor
+        amount = exec_price * quantity
+        commission = amount * self.commission_rate
+        tax = amount * self.tax_rate
+        revenue = amount - commission - tax
 
         self.cash += revenue
 
-        h = self._holdings[ticker]
-        h.quantity -= quantity
-        if h.quantity == 0:
-            del self._holdings[ticker]
+        held = int(self._qty[i])
+        remaining = held - quantity
+        if remaining == 0:
+            self._remove_row(ticker)
+        else:
+            # 남은 수량만큼 누적 매수금액을 줄여 평균 매수가는 그대로 유지
+            self._total_cost[i] *= remaining / held
+            self._qty[i] = remaining
 
         result = OrderResult(
             order_id=order_id,
@@ -278,7 +371,8 @@ class MockBroker(BrokerAPI):
         return result
 
     def get_current_price(self, ticker: str) -> float:
-        return self._prices.get(ticker, 0.0)
+        i = self._price_rows.get(ticker)
+        return 0.0 if i is None else float(self._price_arr[i])
 
     def cancel_order(self, order_id: str) -> bool:
         if order_id in self._orders:
@@ -16,28 +16,28 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from enum import Enum
+from enum import IntEnum
 from typing import Optional
 
 
 # ─── 주문 관련 Enum / Dataclass ─────────────────────────────────────────────
 
-class OrderType(Enum):
+class OrderType(IntEnum):
     """주문 타입: 시장가(MARKET) 또는 지정가(LIMIT)."""
-    MARKET = "market"
-    LIMIT = "limit"
+    MARKET = 0
+    LIMIT = 1
 
 
-class OrderStatus(Enum):
+class OrderStatus(IntEnum):
     """주문 상태 추적용."""
-    PENDING = "pending"
-    FILLED = "filled"
-    PARTIALLY_FILLED = "partially_filled"
-    CANCELLED = "cancelled"
-    FAILED = "failed"
+    PENDING = 0
+    FILLED = 1
+    PARTIALLY_FILLED = 2
+    CANCELLED = 3
+    FAILED = 4
 
 
-@dataclass
+@dataclass(slots=True)
 class OrderResult:
     """buy_order(), sell_order()의 반환값. 주문 체결 결과를 담는다."""
     order_id: str
@@ -50,7 +50,7 @@ class OrderResult:
     message: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class AccountInfo:
     """get_account_info()의 반환값."""
     account_id: str
@@ -60,7 +60,7 @@ class AccountInfo:
     profit_rate: float      # 총 수익률 (%)
 
 
-@dataclass
+@dataclass(slots=True)
 class Holding:
     """get_holdings()에서 반환하는 개별 보유 종목 정보."""
     ticker: str
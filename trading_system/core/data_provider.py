@@ -21,7 +21,7 @@ from datetime import date
 import pandas as pd
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class OHLCV:
     """단일 봉(캔들) 데이터. get_current_ohlcv()의 반환값."""
     date: date
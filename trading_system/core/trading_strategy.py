@@ -19,32 +19,92 @@
 """
 
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import IntEnum
+from types import MappingProxyType
 from typing import Any
 
 import pandas as pd
 
 
-class SignalType(Enum):
-    """전략이 반환하는 시그널 종류."""
-    BUY = "buy"
-    SELL = "sell"
-    HOLD = "hold"
+class SignalType(IntEnum):
+    """전략이 반환하는 시그널 종류. int 값이라 numpy int8 배열에도 그대로 담을 수 있다."""
+    BUY = 0
+    SELL = 1
+    HOLD = 2
 
 
-@dataclass
+class LazyReason:
+    """str()로 변환될 때 포맷하는 시그널 사유.
+
+    HOLD 등 주문으로 이어지지 않는 시그널의 사유는 대부분 버려지므로,
+    천 단위 구분 포맷(:,.0f) 같은 문자열 생성을 실제로 출력/기록할 때까지 미룬다.
+
+    사용 예:
+        LazyReason("홀딩 (현재가: {:,.0f})", current_price)
+    """
+    __slots__ = ("template", "args")
+
+    def __init__(self, template: str, *args: Any):
+        self.template = template
+        self.args = args
+
+    def __str__(self) -> str:
+        return self.template.format(*self.args)
+
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+
+# 시그널/조건 판단 사유: 문자열 또는 지연 포맷 사유
+Reason = str | LazyReason
+
+
+# 메타데이터가 없는 시그널이 공유하는 읽기 전용 빈 매핑
+_EMPTY_METADATA: Mapping[str, Any] = MappingProxyType({})
+
+
+@dataclass(frozen=True, slots=True)
 class Signal:
-    """generate_signal()의 반환값. 엔진에 전달되어 주문으로 변환됨."""
+    """generate_signal()의 반환값. 엔진에 전달되어 주문으로 변환됨.
+
+    불변 객체이므로 hold_signal()처럼 여러 호출에서 같은 인스턴스를 공유해도 안전하다.
+    metadata로 넘긴 dict는 읽기 전용 매핑으로 복사된다.
+    """
     signal_type: SignalType
     ticker: str
     price: float = 0.0       # 시그널 발생 시점 가격
     quantity: int = 0        # 주문 수량
-    reason: str = ""         # 시그널 발생 사유 (로깅용)
-    metadata: dict[str, Any] = field(default_factory=dict)
+    reason: Reason = ""      # 시그널 발생 사유 (로깅용, 출력 시 str()로 변환)
+    metadata: Mapping[str, Any] = field(default_factory=lambda: _EMPTY_METADATA)
+
+    def __post_init__(self) -> None:
+        if self.metadata is not _EMPTY_METADATA:
+            object.__setattr__(self, "metadata", MappingProxyType(dict(self.metadata)))
+
+
+# (ticker, 사유) → 공유 HOLD 시그널. hold_signal()에서 채움
+_HOLD_SIGNALS: dict[tuple[str, str], Signal] = {}
+# _HOLD_SIGNALS 최대 항목 수. 넘으면 비우고 다시 채운다 (종목 수 × 사유 종류만큼 커지지 않도록)
+HOLD_SIGNAL_CACHE_SIZE = 4096
 
 
-@dataclass
+def hold_signal(ticker: str, reason: str) -> Signal:
+    """고정 사유의 HOLD 시그널을 (종목, 사유)별로 하나만 만들어 재사용.
+
+    HOLD는 엔진이 주문 없이 버리므로 매번 새 Signal을 만들 필요가 없다.
+    (Signal은 불변이므로 공유해도 안전하다)
+    """
+    signal = _HOLD_SIGNALS.get((ticker, reason))
+    if signal is None:
+        if len(_HOLD_SIGNALS) >= HOLD_SIGNAL_CACHE_SIZE:
+            _HOLD_SIGNALS.clear()
+        signal = _HOLD_SIGNALS[(ticker, reason)] = Signal(signal_type=SignalType.HOLD, ticker=ticker, reason=reason)
+    return signal
+
+
+@dataclass(slots=True)
 class PositionInfo:
     """현재 보유 현황. backtest/engine.py가 Portfolio에서 구성하여 전략에 전달."""
     ticker: str
@@ -64,8 +124,18 @@ class TradingStrategy(ABC):
     - calculate_position_size(): 주문 수량 결정
     - should_buy(): 매수 조건 판단
     - should_sell(): 매도 조건 판단
+
+    DataFrame 대신 종가/거래량 배열로 판단할 수 있는 전략은 supports_fast_path = True로 두고
+    generate_signal_fast(closes, volumes, row, position_info, available_cash)를 구현한다.
+    엔진은 이 전략에 대해 매일 DataFrame 슬라이스를 만드는 대신 배열 뷰를 넘겨 호출한다.
+    - closes: 현재일까지의 종가 배열 (generate_signal()의 market_data와 같은 구간)
+    - volumes: closes와 같은 구간의 거래량 배열
+    - row: closes[-1]의 prepare() 데이터 기준 행 위치
     """
 
+    # generate_signal_fast() 구현 여부 (엔진이 배열 기반 호출 경로를 쓸지 판단)
+    supports_fast_path: bool = False
+
     def __init__(self, name: str, params: dict[str, Any] | None = None):
         self.name = name
         self.params = params or {}  # config.yaml에서 로드된 전략 파라미터
@@ -112,7 +182,7 @@ class TradingStrategy(ABC):
         market_data: pd.DataFrame,
         position_info: PositionInfo,
         available_cash: float,
-    ) -> tuple[bool, str]:
+    ) -> tuple[bool, Reason]:
         """매수 조건 판단.
 
         Returns:
@@ -125,10 +195,18 @@ class TradingStrategy(ABC):
         self,
         market_data: pd.DataFrame,
         position_info: PositionInfo,
-    ) -> tuple[bool, str]:
+    ) -> tuple[bool, Reason]:
         """매도 조건 판단.
 
         Returns:
             (매도 여부, 사유)
         """
         ...
+
+    def prepare(self, ticker: str, market_data: pd.DataFrame) -> None:
+        """백테스트 시작 시 종목별 전체 데이터로 한 번 호출되는 훅 (기본: 아무것도 하지 않음).
+
+        지표를 전체 구간에 대해 미리 계산해 두고 generate_signal()에서 재사용하려는 전략이 오버라이드한다.
+        market_data는 엔진이 정렬/인덱스 초기화한 종목 전체 데이터이며,
+        이후 generate_signal()에는 이 DataFrame의 위치 슬라이스가 전달된다.
+        """
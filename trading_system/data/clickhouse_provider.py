@@ -14,14 +14,34 @@ ClickHouse 기반 DataProvider 구현.
     - 실전 매매 시 MarketDataManager를 통해 사용
 """
 
+import calendar
+import time
+from collections import OrderedDict
 from datetime import date
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 from clickhouse_connect.driver import Client
 
 from trading_system.core.data_provider import DataProvider, OHLCV
-from trading_system.ingestion.clickhouse_schema import get_client
+from trading_system.ingestion.clickhouse_schema import get_client, get_ohlcv_source
+
+# get_ohlcv로 조회 가능한 가격 컬럼 (기본값: 전체)
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+
+# get_ohlcv(freq=...) 봉 단위 → 봉 시작일을 구하는 ClickHouse 함수
+BAR_PERIOD_FUNCTIONS = {"W": "toMonday", "M": "toStartOfMonth"}
+
+
+def _next_month(d: date) -> date:
+    """d가 속한 달의 다음 달 1일."""
+    return date(d.year + 1, 1, 1) if d.month == 12 else date(d.year, d.month + 1, 1)
+
+
+def _is_month_end(d: date) -> bool:
+    """d가 그 달의 마지막 날인지."""
+    return d.day == calendar.monthrange(d.year, d.month)[1]
 
 
 class ClickHouseDataProvider(DataProvider):
@@ -40,6 +60,9 @@ class ClickHouseDataProvider(DataProvider):
         user: str = "default",
         password: str = "password",
         use_adjusted_close: bool = True,
+        range_cache_size: int = 64,
+        range_cache_ttl: float = 3600.0,
+        metadata_ttl: float = 300.0,
     ):
         """
         Args:
@@ -49,15 +72,36 @@ class ClickHouseDataProvider(DataProvider):
             user: 사용자 이름
             password: 비밀번호
             use_adjusted_close: True이면 adjusted_close를 사용, False이면 close 사용
+            range_cache_size: 월 단위로 맞춘 get_ohlcv 조회 결과 캐시 크기 (0이면 캐시 안 함)
+            range_cache_ttl: 캐시된 조회 결과의 유효 시간 (초). 지난 달 데이터도
+                재수집(update_data의 겹침 구간)으로 바뀔 수 있으므로 이 시간이 지나면 다시 조회
+            metadata_ttl: 종목 목록/날짜 범위/레코드 수 캐시의 유효 시간 (초).
+                MarketDataManager처럼 오래 사는 provider도 새로 적재된 데이터를 반영하도록 주기적으로 다시 조회
         """
         self.client: Client = get_client(host, port, database, user, password)
+        # 'stock_ohlcv FINAL' (변환 전 MergeTree 테이블이면 FINAL 없이 읽음)
+        self._ohlcv_source = get_ohlcv_source(self.client)
         self.use_adjusted_close = use_adjusted_close
+        self.range_cache_size = range_cache_size
+        self.range_cache_ttl = range_cache_ttl
+        self.metadata_ttl = metadata_ttl
+        # (ticker, columns, 월초, 월말) → (만료 시각, 일봉 DataFrame), LRU 순서 유지
+        self._range_cache: OrderedDict[tuple, tuple[float, pd.DataFrame]] = OrderedDict()
+        # (close 컬럼, columns, freq) 등 → SQL 문자열
+        self._sql_cache: dict[tuple, str] = {}
+        # 종목 목록/날짜 범위/레코드 수 (첫 조회 시와 metadata_ttl 만료 후 _prime_metadata()가 한 번에 채움)
+        self._tickers: Optional[list[str]] = None
+        self._metadata_expires = 0.0
+        self._date_ranges: dict[str, tuple[date, date]] = {}
+        self._counts: dict[str, int] = {}
 
     def get_ohlcv(
         self,
         ticker: str,
         start_date: date,
         end_date: date,
+        columns: tuple[str, ...] = PRICE_COLUMNS,
+        freq: Optional[str] = None,
     ) -> pd.DataFrame:
         """OHLCV 데이터 조회.
 
@@ -65,48 +109,247 @@ class ClickHouseDataProvider(DataProvider):
             ticker: 종목 코드 (예: '^GSPC', '005930.KS')
             start_date: 시작일
             end_date: 종료일
+            columns: 조회할 가격 컬럼 (date는 항상 포함).
+                종가만 필요하면 ("close",)로 지정해 전송량을 줄인다
+            freq: None이면 일봉, 'W'(주봉) / 'M'(월봉)이면 ClickHouse에서 집계해서 반환.
+                date는 각 봉의 시작일 (주: 월요일, 월: 1일).
+                월봉은 stock_ohlcv_monthly 구체화 뷰를 사용 (initialize_schema로 생성)
 
         Returns:
-            DataFrame with columns: [date, open, high, low, close, volume]
+            DataFrame with columns: [date, *columns]
             - close 컬럼은 use_adjusted_close 옵션에 따라 adjusted_close 또는 close
         """
+        unknown = [c for c in columns if c not in PRICE_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown columns: {unknown}")
+        if freq is not None and freq not in BAR_PERIOD_FUNCTIONS:
+            raise ValueError(f"Unsupported freq: {freq} (use one of {list(BAR_PERIOD_FUNCTIONS)})")
+
+        if freq is None and self.range_cache_size > 0:
+            return self._get_ohlcv_month_aligned(ticker, start_date, end_date, columns)
+        return self._query_ohlcv(ticker, start_date, end_date, columns, freq)
+
+    def _get_ohlcv_month_aligned(
+        self,
+        ticker: str,
+        start_date: date,
+        end_date: date,
+        columns: tuple[str, ...],
+    ) -> pd.DataFrame:
+        """조회 구간을 월 경계로 넓혀 조회/캐시한 뒤 요청 구간만 잘라서 반환.
+
+        하루씩 밀리는 구간(walk-forward 등)을 반복 조회해도 같은 월 구간이면
+        서버 왕복 없이 캐시된 결과를 재사용한다.
+        당월(오늘 이후 포함) 구간은 데이터가 계속 추가되므로 캐시하지 않고,
+        지난 구간도 range_cache_ttl이 지나면 다시 조회한다.
+        """
+        q_start = start_date.replace(day=1)
+        q_end = end_date.replace(day=calendar.monthrange(end_date.year, end_date.month)[1])
+        key = (ticker, tuple(columns), q_start, q_end)
+
+        now = time.monotonic()
+        cached = self._range_cache.get(key)
+        if cached is not None and cached[0] > now:
+            df = cached[1]
+            self._range_cache.move_to_end(key)
+        else:
+            df = self._query_ohlcv(ticker, q_start, q_end, columns)
+            if q_end < date.today():
+                self._range_cache[key] = (now + self.range_cache_ttl, df)
+                self._range_cache.move_to_end(key)
+                if len(self._range_cache) > self.range_cache_size:
+                    self._range_cache.popitem(last=False)
+
+        # 날짜순 정렬된 결과에서 이진 탐색으로 요청 구간 위치를 찾아 슬라이스
+        dates = df['date'].to_numpy(dtype='datetime64[D]')
+        lo = np.searchsorted(dates, np.datetime64(start_date, 'D'), side='left')
+        hi = np.searchsorted(dates, np.datetime64(end_date, 'D'), side='right')
+        return df.iloc[lo:hi].reset_index(drop=True)
+
+    def _query_ohlcv(
+        self,
+        ticker: str,
+        start_date: date,
+        end_date: date,
+        columns: tuple[str, ...],
+        freq: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """get_ohlcv의 실제 ClickHouse 조회."""
+        query = self._ohlcv_sql(tuple(columns), freq)
+
+        parameters = {
+            "ticker": ticker,
+            "start_date": start_date,
+            "end_date": end_date,
+        }
+        if freq == "M":
+            # 기간 안에 온전히 포함된 달의 범위 [full_start, full_end)
+            first_month = start_date if start_date.day == 1 else _next_month(start_date)
+            parameters["full_start"] = first_month
+            parameters["full_end"] = _next_month(end_date) if _is_month_end(end_date) else end_date.replace(day=1)
+
+        # 결과 행을 파이썬 튜플로 풀지 않고 컬럼 단위(Native 포맷)로 바로 DataFrame 구성
+        df = self.client.query_df(query, parameters=parameters)
+
+        if df.empty:
+            return pd.DataFrame(columns=['date', *columns])
+
+        if freq is not None:
+            df = df.rename(columns={'bar_date': 'date'})
+
+        # date 컬럼을 datetime으로 변환 (pandas에서 표준, 이미 datetime64면 그대로)
+        df['date'] = pd.to_datetime(df['date'])
+        return df
+
+    def _ohlcv_sql(self, columns: tuple[str, ...], freq: Optional[str] = None) -> str:
+        """get_ohlcv SQL 생성 (같은 컬럼/봉 조합은 한 번만 만들고 재사용).
+
+        조회마다 바뀌는 것은 바인딩 파라미터(ticker, 기간)뿐이므로 SQL 문자열은 캐시한다.
+        """
         # close 컬럼 선택
         close_column = "adjusted_close" if self.use_adjusted_close else "close"
+        key = (close_column, columns, freq)
+        sql = self._sql_cache.get(key)
+        if sql is not None:
+            return sql
+
+        if freq is None:
+            select_list = ", ".join(
+                ["date"] + [f"{close_column} as close" if c == "close" else c for c in columns]
+            )
+            sql = f"""
+                SELECT {select_list}
+                FROM {self._ohlcv_source}
+                WHERE ticker = %(ticker)s
+                  AND date >= %(start_date)s
+                  AND date <= %(end_date)s
+                ORDER BY date ASC
+            """
+        elif freq == "M":
+            # 월봉: 기간 안에 온전히 포함된 달은 stock_ohlcv_monthly 구체화 뷰의 집계 상태를 병합하고
+            # (종목당 월 1행), 앞뒤 경계의 일부 달만 일봉 테이블에서 집계해 합친다.
+            # %(full_start)s <= month < %(full_end)s 가 뷰에서 읽는 달
+            merges = {
+                "open": "argMinMerge(open_state)",
+                "high": "maxMerge(high_state)",
+                "low": "minMerge(low_state)",
+                "close": f"argMaxMerge({close_column}_state)",
+                "volume": "arraySum(maxMapMerge(volume_state).2)",
+            }
+            aggregates = {
+                "open": "argMin(open, date)",
+                "high": "max(high)",
+                "low": "min(low)",
+                "close": f"argMax({close_column}, date)",
+                "volume": "sum(volume)",
+            }
+            view_select = ", ".join(["month as bar_date"] + [f"{merges[c]} as {c}" for c in columns])
+            edge_select = ", ".join(
+                ["toStartOfMonth(date) as bar_date"] + [f"{aggregates[c]} as {c}" for c in columns]
+            )
+            sql = f"""
+                SELECT * FROM (
+                    SELECT {view_select}
+                    FROM stock_ohlcv_monthly
+                    WHERE ticker = %(ticker)s
+                      AND month >= %(full_start)s
+                      AND month < %(full_end)s
+                    GROUP BY month
+                    UNION ALL
+                    SELECT {edge_select}
+                    FROM {self._ohlcv_source}
+                    WHERE ticker = %(ticker)s
+                      AND date >= %(start_date)s
+                      AND date <= %(end_date)s
+                      AND (date < %(full_start)s OR date >= %(full_end)s)
+                    GROUP BY bar_date
+                )
+                ORDER BY bar_date ASC
+            """
+        else:
+            # 봉 단위 집계는 서버에서 수행 (시가=첫날 시가, 종가=마지막날 종가)
+            # 집계 함수 안의 date가 별칭으로 바뀌지 않도록 봉 시작일은 bar_date로 받는다
+            aggregates = {
+                "open": "argMin(open, date)",
+                "high": "max(high)",
+                "low": "min(low)",
+                "close": f"argMax({close_column}, date)",
+                "volume": "sum(volume)",
+            }
+            select_list = ", ".join(
+                [f"{BAR_PERIOD_FUNCTIONS[freq]}(date) as bar_date"]
+                + [f"{aggregates[c]} as {c}" for c in columns]
+            )
+            sql = f"""
+                SELECT {select_list}
+                FROM {self._ohlcv_source}
+                WHERE ticker = %(ticker)s
+                  AND date >= %(start_date)s
+                  AND date <= %(end_date)s
+                GROUP BY bar_date
+                ORDER BY bar_date ASC
+            """
+
+        self._sql_cache[key] = sql
+        return sql
+
+    def get_ohlcv_multi(
+        self,
+        tickers: list[str],
+        start_date: date,
+        end_date: date,
+    ) -> pd.DataFrame:
+        """여러 종목의 OHLCV 데이터를 한 번의 쿼리로 조회.
 
+        종목마다 get_ohlcv()를 호출하면 종목 수만큼 왕복이 발생하므로,
+        WHERE ticker IN (...) 으로 묶어서 한 번에 가져온다.
+
+        Args:
+            tickers: 종목 코드 리스트
+            start_date: 시작일
+            end_date: 종료일
+
+        Returns:
+            DataFrame with columns: [ticker, date, open, high, low, close, volume]
+            - (ticker, date) 순으로 정렬
+            - open/high/low/close는 float32
+        """
+        close_column = "adjusted_close" if self.use_adjusted_close else "close"
+
+        # PREWHERE로 (ticker, date) 조건에 맞는 그래뉼만 먼저 읽은 뒤 나머지 컬럼을 읽는다.
+        # (ticker, date)가 정렬 키이므로 FINAL 중복 제거 전에 PREWHERE로 걸러도 결과가 같다.
+        # 가격은 Float32로 받아 전송량과 DataFrame 메모리를 절반으로 줄인다.
+        # volume은 지수(^GSPC 등)에서 Int32 범위를 넘으므로 그대로 둔다.
         query = f"""
             SELECT
+                ticker,
                 date,
-                open,
-                high,
-                low,
-                {close_column} as close,
+                toFloat32(open) as open,
+                toFloat32(high) as high,
+                toFloat32(low) as low,
+                toFloat32({close_column}) as close,
                 volume
-            FROM stock_ohlcv
-            WHERE ticker = %(ticker)s
+            FROM {self._ohlcv_source}
+            PREWHERE ticker IN %(tickers)s
               AND date >= %(start_date)s
               AND date <= %(end_date)s
-            ORDER BY date ASC
+            ORDER BY ticker ASC, date ASC
         """
 
-        result = self.client.query(
+        # 결과 행을 파이썬 튜플로 풀지 않고 컬럼 단위(Native 포맷)로 바로 DataFrame 구성
+        df = self.client.query_df(
             query,
             parameters={
-                "ticker": ticker,
+                "tickers": tuple(tickers),
                 "start_date": start_date,
                 "end_date": end_date,
             }
         )
 
-        # DataFrame으로 변환
-        df = pd.DataFrame(
-            result.result_rows,
-            columns=['date', 'open', 'high', 'low', 'close', 'volume']
-        )
-
-        # date 컬럼을 datetime으로 변환 (pandas에서 표준)
-        if not df.empty:
-            df['date'] = pd.to_datetime(df['date'])
+        if df.empty:
+            return pd.DataFrame(columns=['ticker', 'date', 'open', 'high', 'low', 'close', 'volume'])
 
+        df['date'] = pd.to_datetime(df['date'])
         return df
 
     def get_current_ohlcv(self, ticker: str) -> OHLCV:
@@ -127,19 +370,24 @@ class ClickHouseDataProvider(DataProvider):
         # close 컬럼 선택
         close_column = "adjusted_close" if self.use_adjusted_close else "close"
 
-        query = f"""
-            SELECT
-                date,
-                open,
-                high,
-                low,
-                {close_column} as close,
-                volume
-            FROM stock_ohlcv
-            WHERE ticker = %(ticker)s
-            ORDER BY date DESC
-            LIMIT 1
-        """
+        # 매 호출마다 같은 SQL을 다시 만들지 않도록 캐시
+        key = (close_column, "current")
+        query = self._sql_cache.get(key)
+        if query is None:
+            query = f"""
+                SELECT
+                    date,
+                    open,
+                    high,
+                    low,
+                    {close_column} as close,
+                    volume
+                FROM {self._ohlcv_source}
+                WHERE ticker = %(ticker)s
+                ORDER BY date DESC
+                LIMIT 1
+            """
+            self._sql_cache[key] = query
 
         result = self.client.query(query, parameters={"ticker": ticker})
 
@@ -156,15 +404,47 @@ class ClickHouseDataProvider(DataProvider):
             volume=int(row[5])
         )
 
+    def _prime_metadata(self) -> None:
+        """종목별 날짜 범위/레코드 수를 한 번의 쿼리로 조회해서 캐시.
+
+        get_tickers / get_date_range / get_record_count가 각각 서버에 왕복하지 않고
+        이 결과를 공유한다. metadata_ttl이 지나면 다음 조회 때 다시 채우며,
+        즉시 반영하려면 reload_metadata()를 호출.
+        """
+        query = f"""
+            SELECT ticker, MIN(date), MAX(date), COUNT(*)
+            FROM {self._ohlcv_source}
+            GROUP BY ticker
+            ORDER BY ticker
+        """
+        result = self.client.query(query)
+
+        self._tickers = []
+        self._date_ranges = {}
+        self._counts = {}
+        for ticker, min_date, max_date, count in result.result_rows:
+            self._tickers.append(ticker)
+            self._date_ranges[ticker] = (min_date, max_date)
+            self._counts[ticker] = int(count)
+        self._metadata_expires = time.monotonic() + self.metadata_ttl
+
+    def _ensure_metadata(self) -> None:
+        """메타데이터 캐시가 없거나 만료되었으면 다시 조회."""
+        if self._tickers is None or time.monotonic() >= self._metadata_expires:
+            self._prime_metadata()
+
+    def reload_metadata(self) -> None:
+        """캐시된 종목 메타데이터를 버리고 다시 조회."""
+        self._prime_metadata()
+
     def get_tickers(self) -> list[str]:
         """조회 가능한 종목 코드 목록.
 
         Returns:
             티커 리스트 (알파벳 순 정렬)
         """
-        query = "SELECT DISTINCT ticker FROM stock_ohlcv ORDER BY ticker"
-        result = self.client.query(query)
-        return [row[0] for row in result.result_rows]
+        self._ensure_metadata()
+        return list(self._tickers)
 
     def get_date_range(self, ticker: str) -> Optional[tuple[date, date]]:
         """특정 티커의 날짜 범위 조회.
@@ -175,19 +455,8 @@ class ClickHouseDataProvider(DataProvider):
         Returns:
             (최소 날짜, 최대 날짜) 튜플, 데이터가 없으면 None
         """
-        query = """
-            SELECT MIN(date) as min_date, MAX(date) as max_date
-            FROM stock_ohlcv
-            WHERE ticker = %(ticker)s
-        """
-        result = self.client.query(query, parameters={"ticker": ticker})
-
-        if result.result_rows:
-            min_date, max_date = result.result_rows[0]
-            if min_date and max_date:
-                return (min_date, max_date)
-
-        return None
+        self._ensure_metadata()
+        return self._date_ranges.get(ticker)
 
     def get_record_count(self, ticker: Optional[str] = None) -> int:
         """레코드 수 조회.
@@ -198,14 +467,10 @@ class ClickHouseDataProvider(DataProvider):
         Returns:
             레코드 수
         """
+        self._ensure_metadata()
         if ticker:
-            query = "SELECT COUNT(*) FROM stock_ohlcv WHERE ticker = %(ticker)s"
-            result = self.client.query(query, parameters={"ticker": ticker})
-        else:
-            query = "SELECT COUNT(*) FROM stock_ohlcv"
-            result = self.client.query(query)
-
-        return result.result_rows[0][0] if result.result_rows else 0
+            return self._counts.get(ticker, 0)
+        return sum(self._counts.values())
 
     def close(self):
         """ClickHouse 연결 종료."""
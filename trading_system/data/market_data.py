@@ -13,13 +13,18 @@
     - 백테스트에서는 engine.py가 직접 DataFrame을 다루므로 미사용
 """
 
-from datetime import date
+from collections import OrderedDict
+from datetime import date, timedelta
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 
 from trading_system.core.data_provider import DataProvider
 
+# get_latest_data 롤링 윈도우: 캐시 범위를 벗어나면 이만큼(일) 넉넉히 한 번에 조회
+WINDOW_FETCH_DAYS = 730
+
 
 class MarketDataManager:
     """DataProvider 위에 캐싱 레이어를 추가한 매니저.
@@ -30,9 +35,14 @@ class MarketDataManager:
         df = manager.get_market_data("005930", start, end)
     """
 
-    def __init__(self, data_provider: DataProvider):
+    def __init__(self, data_provider: DataProvider, max_cache_size: int = 256):
         self.provider = data_provider
-        self._cache: dict[str, pd.DataFrame] = {}  # "ticker_start_end" → DataFrame
+        self.max_cache_size = max_cache_size  # 캐시 최대 항목 수 (초과 시 가장 오래 안 쓴 항목 제거)
+        # (ticker, start, end) → DataFrame, LRU 순서 유지
+        self._cache: OrderedDict[tuple[str, date, date], pd.DataFrame] = OrderedDict()
+        # ticker → (조회한 시작일, 종료일, DataFrame, 날짜 배열) - get_latest_data용 롤링 윈도우
+        self._full: dict[str, tuple[date, date, pd.DataFrame, np.ndarray]] = {}
+        self._close: dict[str, np.ndarray] = {}  # ticker → 롤링 윈도우의 종가 배열 (N일 전 종가 조회용)
 
     def get_market_data(
         self,
@@ -46,14 +56,19 @@ class MarketDataManager:
         Returns:
             DataFrame with columns: [date, open, high, low, close, volume]
         """
-        cache_key = f"{ticker}_{start_date}_{end_date}"
+        cache_key = (ticker, start_date, end_date)
 
-        if use_cache and cache_key in self._cache:
-            return self._cache[cache_key]
+        if use_cache:
+            df = self._cache.get(cache_key)
+            if df is not None:
+                self._cache.move_to_end(cache_key)
+                return df
 
         df = self.provider.get_ohlcv(ticker, start_date, end_date)
         if use_cache:
             self._cache[cache_key] = df
+            if len(self._cache) > self.max_cache_size:
+                self._cache.popitem(last=False)
         return df
 
     def get_latest_data(
@@ -62,10 +77,38 @@ class MarketDataManager:
         end_date: date,
         lookback_days: int = 30,
     ) -> pd.DataFrame:
-        """최근 N일간 데이터 조회."""
-        start = pd.Timestamp(end_date) - pd.Timedelta(days=lookback_days * 2)
-        df = self.get_market_data(ticker, start.date(), end_date)
-        return df.tail(lookback_days)
+        """최근 N일간 데이터 조회.
+
+        end_date를 하루씩 옮기며 반복 호출해도 매번 재조회하지 않도록
+        종목별로 넓은 구간을 한 번 조회해 두고(_full) 위치 슬라이스로 반환한다.
+        """
+        start = end_date - timedelta(days=lookback_days * 2)
+        df, dates = self._window(ticker, start, end_date)
+        lo = np.searchsorted(dates, np.datetime64(start, "D"), side="left")
+        hi = np.searchsorted(dates, np.datetime64(end_date, "D"), side="right")
+        return df.iloc[max(lo, hi - lookback_days):hi]
+
+    def _window(self, ticker: str, start_date: date, end_date: date) -> tuple[pd.DataFrame, np.ndarray]:
+        """[start_date, end_date]를 포함하는 종목별 롤링 윈도우 (DataFrame, 날짜 배열) 반환.
+
+        캐시된 구간을 벗어나면 앞뒤로 WINDOW_FETCH_DAYS만큼 넓혀 다시 조회한다.
+        오늘 이후는 아직 데이터가 없으므로 조회 종료일은 end_date와 어제 중 늦은 날로 제한한다.
+        """
+        cached = self._full.get(ticker)
+        if cached is not None and cached[0] <= start_date and end_date <= cached[1]:
+            return cached[2], cached[3]
+
+        fetch_start = min(start_date, end_date - timedelta(days=WINDOW_FETCH_DAYS))
+        yesterday = date.today() - timedelta(days=1)
+        fetch_end = max(end_date, min(end_date + timedelta(days=WINDOW_FETCH_DAYS), yesterday))
+        df = self.provider.get_ohlcv(ticker, fetch_start, fetch_end)
+        # 데이터가 없으면 (컬럼 없는 빈 DataFrame 포함) 캐시하지 않고 빈 윈도우 반환
+        if df.empty or "date" not in df.columns:
+            return df, np.empty(0, "datetime64[D]")
+        dates = df["date"].to_numpy(dtype="datetime64[D]")
+        self._full[ticker] = (fetch_start, fetch_end, df, dates)
+        self._close[ticker] = df["close"].to_numpy(dtype=np.float64)
+        return df, dates
 
     def get_n_days_ago_close(
         self,
@@ -73,12 +116,21 @@ class MarketDataManager:
         current_date: date,
         n: int = 1,
     ) -> Optional[float]:
-        """N일 전 종가 조회."""
-        df = self.get_latest_data(ticker, current_date, lookback_days=n + 5)
-        if len(df) < n + 1:
+        """N일 전 종가 조회.
+
+        DataFrame을 잘라내지 않고 롤링 윈도우의 종가 배열을 정수 인덱싱한다.
+        (current_date 이하 마지막 거래일 기준 n거래일 전, 최근 2*(n+5)일 범위 내)
+        """
+        start = current_date - timedelta(days=(n + 5) * 2)
+        _, dates = self._window(ticker, start, current_date)
+        lo = np.searchsorted(dates, np.datetime64(start, "D"), side="left")
+        i = np.searchsorted(dates, np.datetime64(current_date, "D"), side="right") - 1 - n
+        if i < lo:
             return None
-        return float(df.iloc[-(n + 1)]["close"])
+        return float(self._close[ticker][i])
 
     def clear_cache(self) -> None:
         """캐시 초기화."""
         self._cache.clear()
+        self._full.clear()
+        self._close.clear()
@@ -16,11 +16,13 @@
     - backtest/metrics.py에서 portfolio.trade_history로 성과 계산
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, fields
 from typing import Any
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True)
 class Position:
     """개별 종목 포지션. Portfolio 내부에서 종목별로 관리됨."""
     ticker: str
@@ -35,12 +37,13 @@ class Position:
         return self.quantity * self.avg_price
 
     def update_on_buy(self, quantity: int, price: float) -> None:
-        """매수 시 포지션 업데이트."""
-        total_cost = self.avg_price * self.quantity + price * quantity
+        """매수 시 포지션 업데이트 (quantity > 0, Portfolio.execute_buy에서 검증)."""
+        amount = price * quantity
+        total_cost = self.avg_price * self.quantity + amount
         self.quantity += quantity
-        self.avg_price = total_cost / self.quantity if self.quantity > 0 else 0.0
+        self.avg_price = total_cost / self.quantity
         self.buy_count += 1
-        self.total_invested += price * quantity
+        self.total_invested += amount
 
     def update_on_sell(self, quantity: int) -> float:
         """매도 시 포지션 업데이트. 실현 손익 반환."""
@@ -61,7 +64,7 @@ class Position:
         self.total_invested = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class TradeRecord:
     """개별 거래 기록. metrics.py에서 승률/수익 계산에 사용됨."""
     date: str
@@ -76,25 +79,35 @@ class TradeRecord:
     reason: str = ""          # 시그널 사유 (로깅용)
 
 
+# Portfolio가 거래 내역을 컬럼별 리스트로 저장할 때의 컬럼 순서 (TradeRecord 필드 순서와 동일)
+TRADE_COLUMNS = tuple(f.name for f in fields(TradeRecord))
+
+
 class Portfolio:
     """포트폴리오 관리 클래스.
 
     BacktestEngine이 소유하며, 매수/매도 실행 결과를 반영.
-    trade_history는 백테스트 종료 후 metrics 계산에 사용됨.
+    거래 내역은 TradeRecord 객체 대신 컬럼별 리스트(SoA)로 쌓고,
+    metrics 계산은 profit_array()로 배열을 바로 받아 사용한다.
     """
 
     def __init__(self, initial_cash: float):
         self.initial_cash = initial_cash
         self.cash = initial_cash                    # 가용 현금
         self.positions: dict[str, Position] = {}    # ticker → Position
-        self.trade_history: list[TradeRecord] = []  # 전체 거래 내역
+        # 전체 거래 내역 (컬럼명 → 거래 순서대로 값 리스트)
+        self._trade_cols: dict[str, list] = {name: [] for name in TRADE_COLUMNS}
+        self._trade_records: list[TradeRecord] = []  # trade_history 요청 시에만 채우는 객체 캐시
         self._daily_loss: float = 0.0               # 당일 누적 손실 (리스크 관리용)
         self._last_trade_date: str = ""
+        # 매수/매도 시 증분 갱신 (조회마다 positions 전체를 순회하지 않도록)
+        self._invested_value: float = 0.0           # Σ 평균가 × 수량
+        self.holdings: dict[str, Position] = {}     # 수량 > 0인 종목만 (ticker → Position)
 
     @property
     def total_invested(self) -> float:
-        """총 투자 금액."""
-        return sum(p.avg_price * p.quantity for p in self.positions.values())
+        """총 투자 금액 (보유 종목의 평균가 × 수량 합)."""
+        return self._invested_value
 
     @property
     def total_assets(self) -> float:
@@ -115,9 +128,11 @@ class Portfolio:
 
     def get_position(self, ticker: str) -> Position:
         """종목 포지션 조회. 없으면 빈 포지션 생성."""
-        if ticker not in self.positions:
-            self.positions[ticker] = Position(ticker=ticker)
-        return self.positions[ticker]
+        # 이미 있는 경우(대부분)는 dict 조회 한 번으로 끝나도록
+        position = self.positions.get(ticker)
+        if position is None:
+            position = self.positions[ticker] = Position(ticker=ticker)
+        return position
 
     def execute_buy(
         self,
@@ -129,23 +144,20 @@ class Portfolio:
         reason: str = "",
     ) -> bool:
         """매수 실행."""
+        if quantity <= 0:
+            return False
         total_cost = price * quantity + commission
         if total_cost > self.cash:
             return False
 
         self.cash -= total_cost
         position = self.get_position(ticker)
+        if position.quantity == 0:
+            self.holdings[ticker] = position
         position.update_on_buy(quantity, price)
+        self._invested_value += price * quantity
 
-        self.trade_history.append(TradeRecord(
-            date=date,
-            ticker=ticker,
-            side="buy",
-            quantity=quantity,
-            price=price,
-            commission=commission,
-            reason=reason,
-        ))
+        self._record_trade(date, ticker, "buy", quantity, price, commission, 0.0, 0.0, 0.0, reason)
         return True
 
     def execute_sell(
@@ -171,6 +183,13 @@ class Portfolio:
         profit_rate = (price - avg_price) / avg_price * 100 if avg_price > 0 else 0.0
 
         position.update_on_sell(quantity)
+        self._invested_value -= avg_price * quantity
+        if position.quantity == 0:
+            # 0주 매도(보유하지 않은 종목 포함)도 기존처럼 허용하므로 없을 수 있다
+            self.holdings.pop(ticker, None)
+            if not self.holdings:
+                # 전량 청산 시 누적된 부동소수점 오차 제거
+                self._invested_value = 0.0
 
         # 일일 손실 추적
         if date != self._last_trade_date:
@@ -179,20 +198,46 @@ class Portfolio:
         if profit < 0:
             self._daily_loss += abs(profit)
 
-        self.trade_history.append(TradeRecord(
-            date=date,
-            ticker=ticker,
-            side="sell",
-            quantity=quantity,
-            price=price,
-            commission=commission,
-            tax=tax,
-            profit=profit,
-            profit_rate=profit_rate,
-            reason=reason,
-        ))
+        self._record_trade(date, ticker, "sell", quantity, price, commission, tax, profit, profit_rate, reason)
         return True
 
+    def _record_trade(self, *values: Any) -> None:
+        """거래 한 건을 컬럼별 리스트에 추가 (values는 TRADE_COLUMNS 순서)."""
+        for name, value in zip(TRADE_COLUMNS, values):
+            self._trade_cols[name].append(value)
+
+    @property
+    def trade_count(self) -> int:
+        """전체 거래 수 (매수 + 매도)."""
+        return len(self._trade_cols["date"])
+
+    @property
+    def trade_history(self) -> list[TradeRecord]:
+        """전체 거래 내역 (TradeRecord 리스트).
+
+        객체는 처음 요청될 때 만들고, 이후에는 새로 추가된 거래만 덧붙인다.
+        """
+        built = len(self._trade_records)
+        if built < self.trade_count:
+            cols = [self._trade_cols[name][built:] for name in TRADE_COLUMNS]
+            self._trade_records.extend(TradeRecord(*row) for row in zip(*cols))
+        return self._trade_records
+
+    def trade_column(self, name: str) -> list:
+        """거래 내역의 한 컬럼 (거래 순서대로). 반환된 리스트는 수정하지 말 것."""
+        return self._trade_cols[name]
+
+    def profit_array(self, side: str | None = None) -> np.ndarray:
+        """거래별 실현 손익 배열 (float64).
+
+        Args:
+            side: "buy" / "sell"이면 해당 거래만, None이면 전체
+        """
+        profits = np.asarray(self._trade_cols["profit"], dtype=np.float64)
+        if side is None:
+            return profits
+        return profits[np.asarray(self._trade_cols["side"]) == side]
+
     @property
     def daily_loss(self) -> float:
         """당일 손실 금액."""
@@ -200,7 +245,7 @@ class Portfolio:
 
     def get_holding_tickers(self) -> list[str]:
         """보유 종목 코드 목록."""
-        return [t for t, p in self.positions.items() if p.quantity > 0]
+        return list(self.holdings)
 
     def get_summary(self) -> dict[str, Any]:
         """포트폴리오 요약."""
@@ -211,6 +256,6 @@ class Portfolio:
             "total_assets": self.total_assets,
             "total_profit": self.total_profit,
             "total_profit_rate": self.total_profit_rate,
-            "num_holdings": len(self.get_holding_tickers()),
-            "num_trades": len(self.trade_history),
+            "num_holdings": len(self.holdings),
+            "num_trades": self.trade_count,
         }
@@ -1,10 +1,56 @@
 """
 ClickHouse 데이터베이스 스키마 정의 및 연결 관리
 """
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple, Union
 from datetime import date, datetime
+import logging
+import time
 import clickhouse_connect
-from clickhouse_connect.driver import Client
+from clickhouse_connect.driver import Client, httputil
+from clickhouse_connect.driver.exceptions import OperationalError
+
+logger = logging.getLogger(__name__)
+
+# stock_ohlcv 삽입 컬럼과 ClickHouse 타입
+# 타입을 명시하면 insert 마다 DESCRIBE TABLE 왕복 조회를 하지 않는다
+OHLCV_INSERT_COLUMNS = ['ticker', 'date', 'open', 'high', 'low', 'close', 'adjusted_close', 'volume']
+# 가격은 Float32 (전송량과 저장 공간이 절반)
+# 유효숫자 약 7자리: 100만원짜리 종목도 표현 간격 0.0625원, 지수 4만 포인트도 0.004 수준으로
+# 호가 단위보다 훨씬 작아 일봉 백테스트에는 영향이 없다
+OHLCV_INSERT_COLUMN_TYPES = ['String', 'Date', 'Float32', 'Float32', 'Float32', 'Float32', 'Float32', 'UInt64']
+OHLCV_PRICE_COLUMNS = ['open', 'high', 'low', 'close', 'adjusted_close']
+
+# ingestion_log 삽입 컬럼 순서
+INGESTION_LOG_COLUMNS = ['ticker', 'last_date', 'last_ingestion', 'record_count', 'status']
+
+# 삽입 재시도 대기 시간 상한 (초)
+MAX_RETRY_DELAY = 30
+
+# stock_ohlcv 테이블 정의 ({table}에 테이블 이름)
+# ReplacingMergeTree: 같은 (ticker, date)를 다시 삽입하면 최신 ingestion_time 행만 남으므로
+# 증분 업데이트가 겹치는 구간을 재수집해도 중복되지 않는다 (조회 시 FINAL 사용).
+# 이전 버전에서 MergeTree로 만든 테이블은 migrate_ohlcv_table()로 변환한다.
+OHLCV_TABLE_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        ticker String,
+        date Date,
+        open Float32,
+        high Float32,
+        low Float32,
+        close Float32,
+        adjusted_close Float32,
+        volume UInt64,
+        source String DEFAULT 'yahoo',
+        ingestion_time DateTime DEFAULT now()
+    )
+    ENGINE = ReplacingMergeTree(ingestion_time)
+    PARTITION BY toYYYYMM(date)
+    ORDER BY (ticker, date)
+    SETTINGS index_granularity = 8192
+"""
+
+# stock_ohlcv가 갖춰야 하는 엔진 (FINAL 조회, 증분 업데이트의 겹침 재수집 전제)
+OHLCV_TABLE_ENGINE = 'ReplacingMergeTree'
 
 
 def get_client(
@@ -13,6 +59,10 @@ def get_client(
     database: str = "default",
     user: str = "default",
     password: str = "password",
+    compress: Union[str, bool] = "lz4",
+    pool_maxsize: int = 16,
+    connect_timeout: int = 30,
+    send_receive_timeout: int = 300,
 ) -> Client:
     """
     ClickHouse 클라이언트 연결 생성
@@ -23,6 +73,13 @@ def get_client(
         database: 데이터베이스 이름
         user: 사용자 이름
         password: 비밀번호
+        compress: HTTP 전송 압축 방식 ('lz4', 'zstd', True/False).
+            OHLCV 데이터는 압축률이 높아 삽입/조회 전송량이 크게 줄어든다
+        pool_maxsize: keep-alive HTTP 연결 풀 크기.
+            클라이언트 하나를 스크립트 전체(및 스레드 간)에서 재사용할 때
+            쿼리마다 TCP 연결을 새로 맺지 않도록 충분히 크게 둔다
+        connect_timeout: 연결 타임아웃(초)
+        send_receive_timeout: 요청 송수신 타임아웃(초)
 
     Returns:
         ClickHouse 클라이언트 객체
@@ -33,6 +90,10 @@ def get_client(
         database=database,
         username=user,
         password=password,
+        compress=compress,
+        connect_timeout=connect_timeout,
+        send_receive_timeout=send_receive_timeout,
+        pool_mgr=httputil.get_pool_manager(maxsize=pool_maxsize, block=False),
     )
     return client
 
@@ -45,24 +106,9 @@ def initialize_schema(client: Client) -> None:
         client: ClickHouse 클라이언트
     """
     # stock_ohlcv 테이블 생성 (메인 데이터)
-    create_ohlcv_table = """
-    CREATE TABLE IF NOT EXISTS stock_ohlcv (
-        ticker String,
-        date Date,
-        open Float64,
-        high Float64,
-        low Float64,
-        close Float64,
-        adjusted_close Float64,
-        volume UInt64,
-        source String DEFAULT 'yahoo',
-        ingestion_time DateTime DEFAULT now()
-    )
-    ENGINE = MergeTree()
-    PARTITION BY toYYYYMM(date)
-    ORDER BY (ticker, date)
-    SETTINGS index_granularity = 8192
-    """
+    # 이미 있는 이전 버전(MergeTree) 테이블은 먼저 ReplacingMergeTree로 변환
+    migrate_ohlcv_table(client)
+    create_ohlcv_table = OHLCV_TABLE_DDL.format(table='stock_ohlcv')
 
     # ingestion_log 테이블 생성 (메타데이터)
     create_log_table = """
@@ -77,11 +123,194 @@ def initialize_schema(client: Client) -> None:
     ORDER BY ticker
     """
 
+    # stock_ohlcv_monthly 구체화 뷰 (월봉 집계 상태)
+    # stock_ohlcv에 삽입될 때마다 월 단위 집계 상태가 갱신되어, 장기 구간 월봉 조회 시
+    # 일봉 전체 대신 종목당 월 1행만 읽는다 (ClickHouseDataProvider.get_ohlcv(freq='M')).
+    # 증분 업데이트가 같은 날짜를 다시 삽입해도 결과가 변하지 않도록
+    #   - 종가는 (date, ingestion_time) 기준 argMax → 같은 날짜면 최신 삽입 값
+    #   - 거래량은 날짜별 maxMap으로 날짜당 한 값만 남긴 뒤 합산
+    # POPULATE로 뷰 생성 시점의 기존 데이터도 채운다.
+    create_monthly_view = """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS stock_ohlcv_monthly
+    ENGINE = AggregatingMergeTree
+    PARTITION BY toYear(month)
+    ORDER BY (ticker, month)
+    POPULATE
+    AS SELECT
+        ticker,
+        toStartOfMonth(date) AS month,
+        argMinState(open, date) AS open_state,
+        maxState(high) AS high_state,
+        minState(low) AS low_state,
+        argMaxState(close, (date, ingestion_time)) AS close_state,
+        argMaxState(adjusted_close, (date, ingestion_time)) AS adjusted_close_state,
+        maxMapState([date], [volume]) AS volume_state
+    FROM stock_ohlcv
+    GROUP BY ticker, month
+    """
+
     client.command(create_ohlcv_table)
     client.command(create_log_table)
+    client.command(create_monthly_view)
     print("테이블 생성 완료 (또는 이미 존재)")
 
 
+def get_table_engine(client: Client, table: str) -> Optional[str]:
+    """
+    현재 데이터베이스에 있는 테이블의 엔진 이름 조회
+
+    Args:
+        client: ClickHouse 클라이언트
+        table: 테이블 이름
+
+    Returns:
+        엔진 이름 (예: 'MergeTree', 'ReplacingMergeTree'), 테이블이 없으면 None
+    """
+    result = client.query(
+        "SELECT engine FROM system.tables WHERE database = currentDatabase() AND name = %(table)s",
+        parameters={"table": table},
+    )
+    return result.result_rows[0][0] if result.result_rows else None
+
+
+def get_ohlcv_source(client: Client) -> str:
+    """
+    stock_ohlcv 조회 쿼리의 FROM 절에 쓸 테이블 표현
+
+    ReplacingMergeTree이면 'stock_ohlcv FINAL'로 아직 병합되지 않은 재수집 행을 하나로 합쳐 읽는다.
+    변환 전(migrate_ohlcv_table)의 MergeTree 테이블은 FINAL을 지원하지 않으므로(ILLEGAL_FINAL)
+    'stock_ohlcv'를 반환한다 (이 경우 update_data가 겹침 재수집을 하지 않으므로 중복 행도 없다).
+
+    Args:
+        client: ClickHouse 클라이언트
+
+    Returns:
+        'stock_ohlcv FINAL' 또는 'stock_ohlcv'
+    """
+    if get_table_engine(client, 'stock_ohlcv') == OHLCV_TABLE_ENGINE:
+        return 'stock_ohlcv FINAL'
+    return 'stock_ohlcv'
+
+
+def migrate_ohlcv_table(client: Client) -> bool:
+    """
+    이전 버전의 stock_ohlcv(MergeTree, Float64 가격)를 현재 정의로 변환
+
+    새 정의(OHLCV_TABLE_DDL)로 stock_ohlcv_migrating을 만들어 기존 행을 모두 복사한 뒤
+    EXCHANGE TABLES로 이름을 맞바꾼다. 기존 테이블은 stock_ohlcv_migrating 이름으로
+    남겨 두므로 결과를 확인한 후 직접 삭제한다 (DROP TABLE stock_ohlcv_migrating).
+    월봉 구체화 뷰는 원본 테이블을 기준으로 만들어졌으므로 삭제하고,
+    initialize_schema()가 새 테이블 기준으로 다시 생성(POPULATE)한다.
+
+    엔진은 이미 ReplacingMergeTree이고 가격 컬럼만 Float64이면
+    ALTER TABLE ... MODIFY COLUMN으로 Float32로 바꾼다 (삽입 시 OHLCV_INSERT_COLUMN_TYPES와 일치).
+
+    Args:
+        client: ClickHouse 클라이언트
+
+    Returns:
+        변환했으면 True, 테이블이 없거나 이미 변환되어 있으면 False
+    """
+    engine = get_table_engine(client, 'stock_ohlcv')
+    if engine is None:
+        return False
+    if engine == OHLCV_TABLE_ENGINE:
+        return _convert_price_columns(client)
+
+    if get_table_engine(client, 'stock_ohlcv_migrating') is not None:
+        raise RuntimeError(
+            "stock_ohlcv_migrating 테이블이 이미 있습니다. 이전 변환 결과를 확인하고 삭제한 뒤 다시 실행하세요."
+        )
+
+    logger.info(f"stock_ohlcv 변환 시작 ({engine} → {OHLCV_TABLE_ENGINE})")
+    client.command(OHLCV_TABLE_DDL.format(table='stock_ohlcv_migrating'))
+    client.command("""
+        INSERT INTO stock_ohlcv_migrating
+        SELECT ticker, date, open, high, low, close, adjusted_close, volume, source, ingestion_time
+        FROM stock_ohlcv
+    """)
+    client.command("EXCHANGE TABLES stock_ohlcv AND stock_ohlcv_migrating")
+    client.command("DROP VIEW IF EXISTS stock_ohlcv_monthly")
+    logger.info("stock_ohlcv 변환 완료 (기존 테이블: stock_ohlcv_migrating)")
+    return True
+
+
+def _convert_price_columns(client: Client) -> bool:
+    """stock_ohlcv의 Float32가 아닌 가격 컬럼을 Float32로 변경. 변경했으면 True."""
+    result = client.query(
+        "SELECT name, type FROM system.columns WHERE database = currentDatabase() AND table = 'stock_ohlcv'"
+    )
+    column_types = dict(result.result_rows)
+    columns = [c for c in OHLCV_PRICE_COLUMNS if column_types.get(c, 'Float32') != 'Float32']
+    if not columns:
+        return False
+
+    logger.info(f"stock_ohlcv 가격 컬럼을 Float32로 변경: {columns}")
+    client.command(
+        "ALTER TABLE stock_ohlcv " + ", ".join(f"MODIFY COLUMN {c} Float32" for c in columns)
+    )
+    return True
+
+
+def insert_ohlcv_df(
+    client: Client,
+    df,
+    context=None,
+    max_retries: int = 5,
+    retry_delay: float = 1.0,
+) -> int:
+    """
+    OHLCV DataFrame을 stock_ohlcv에 삽입 (연결 오류 시 지수 백오프로 재시도)
+
+    연결 끊김/타임아웃(OperationalError)만 재시도하고, 스키마 불일치 등
+    서버가 거부한 오류는 재시도해도 같으므로 바로 예외를 발생시킨다.
+
+    Args:
+        client: ClickHouse 클라이언트
+        df: OHLCV_INSERT_COLUMNS 순서의 DataFrame
+        context: 재사용할 insert context (None이면 OHLCV_INSERT_COLUMN_TYPES로 삽입)
+        max_retries: 최대 시도 횟수
+        retry_delay: 첫 재시도 대기 시간 (초), 이후 2배씩 증가 (최대 MAX_RETRY_DELAY)
+
+    Returns:
+        삽입된 레코드 수
+    """
+    for attempt in range(max_retries):
+        try:
+            if context is None:
+                client.insert_df('stock_ohlcv', df, column_type_names=OHLCV_INSERT_COLUMN_TYPES)
+            else:
+                client.insert_df(df=df, context=context)
+            return len(df)
+        except OperationalError as e:
+            if attempt == max_retries - 1:
+                raise
+            delay = min(retry_delay * 2 ** attempt, MAX_RETRY_DELAY)
+            logger.warning(
+                f"Insert failed (attempt {attempt + 1}/{max_retries}): {e}. Retrying in {delay:.0f}s..."
+            )
+            time.sleep(delay)
+    return 0
+
+
+def flush_ingestion_log(client: Client, log_rows: list) -> None:
+    """
+    모아둔 ingestion_log 행을 하나의 INSERT로 삽입
+
+    Args:
+        client: ClickHouse 클라이언트
+        log_rows: 스크립트의 update_ingestion_log(..., log_rows=...)로 모은 행 리스트
+    """
+    if not log_rows:
+        return
+
+    try:
+        client.insert('ingestion_log', log_rows, column_names=INGESTION_LOG_COLUMNS)
+        logger.info(f"Updated ingestion_log for {len(log_rows)} tickers")
+    except Exception as e:
+        logger.error(f"Error updating ingestion_log: {e}")
+
+
 def verify_connection(client: Client) -> bool:
     """
     ClickHouse 연결 검증
@@ -152,11 +381,12 @@ def get_record_count(client: Client, ticker: Optional[str] = None) -> int:
     Returns:
         레코드 수
     """
+    source = get_ohlcv_source(client)
     if ticker:
-        query = "SELECT COUNT(*) FROM stock_ohlcv WHERE ticker = %(ticker)s"
+        query = f"SELECT COUNT(*) FROM {source} WHERE ticker = %(ticker)s"
         result = client.query(query, parameters={"ticker": ticker})
     else:
-        query = "SELECT COUNT(*) FROM stock_ohlcv"
+        query = f"SELECT COUNT(*) FROM {source}"
         result = client.query(query)
 
     return result.result_rows[0][0] if result.result_rows else 0
@@ -186,3 +416,27 @@ def get_last_ingestion_date(client: Client, ticker: str) -> Optional[date]:
         return result.result_rows[0][0]
 
     return None
+
+
+def get_last_ingestion_dates(client: Client, tickers: list[str]) -> Dict[str, date]:
+    """
+    여러 티커의 마지막 수집 날짜를 한 번의 쿼리로 조회 (ingestion_log에서)
+
+    Args:
+        client: ClickHouse 클라이언트
+        tickers: 티커 심볼 리스트
+
+    Returns:
+        {ticker: 마지막 수집 날짜} 딕셔너리 (기록이 없는 티커는 제외)
+    """
+    if not tickers:
+        return {}
+
+    query = """
+        SELECT ticker, argMax(last_date, last_ingestion)
+        FROM ingestion_log
+        WHERE ticker IN %(tickers)s
+        GROUP BY ticker
+    """
+    result = client.query(query, parameters={"tickers": tuple(tickers)})
+    return {row[0]: row[1] for row in result.result_rows}
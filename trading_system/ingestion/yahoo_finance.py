@@ -2,22 +2,74 @@
 Yahoo Finance 데이터 수집 모듈
 """
 import yfinance as yf
+import numpy as np
 import pandas as pd
 from datetime import date, datetime, timedelta
 import time
 import logging
-from typing import Optional
+from typing import Dict, Optional
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 재시도 대기 시간 상한 (초)
+MAX_RETRY_DELAY = 60
+
+# fetch_ticker_data 반환 컬럼 (stock_ohlcv 삽입 컬럼 순서와 동일)
+OHLCV_COLUMNS = ['ticker', 'date', 'open', 'high', 'low', 'close', 'adjusted_close', 'volume']
+
+# 프로세스 내 yf.Ticker 객체 재사용
+_ticker_objects: dict = {}
+
+
+def _get_ticker(ticker: str, session=None) -> yf.Ticker:
+    """
+    티커 심볼별 yf.Ticker 객체를 한 번만 생성하여 재사용
+
+    yfinance는 모든 Ticker가 하나의 HTTP 세션(keep-alive 연결 풀)을 공유하므로
+    session을 지정하지 않아도 티커마다 TCP/TLS 연결을 새로 맺지 않는다.
+    session을 지정하면 그 세션이 공유 세션으로 설정된다 (프록시 등).
+    """
+    obj = _ticker_objects.get(ticker)
+    if obj is None or session is not None:
+        obj = yf.Ticker(ticker, session=session)
+        _ticker_objects[ticker] = obj
+    return obj
+
+
+def _to_ohlcv_frame(df: pd.DataFrame, ticker: str) -> pd.DataFrame:
+    """
+    yfinance 결과(Date 인덱스, Open/High/.../Adj Close/Volume)를 OHLCV_COLUMNS 형식으로 변환
+    """
+    # reset_index → rename → 컬럼 선택으로 중간 DataFrame을 만들지 않고,
+    # 필요한 컬럼 배열만 꺼내서 OHLCV_COLUMNS 형식 DataFrame을 한 번에 구성
+
+    # 날짜 인덱스를 timezone 없는 datetime64로 정규화
+    # (datetime.date 객체 컬럼 대신 벡터 연산/ClickHouse Date 변환이 빠른 dtype 유지)
+    dates = pd.DatetimeIndex(df.index)
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+
+    # 가격 컬럼은 float32로 (stock_ohlcv의 Float32 컬럼과 일치, 메모리/전송량 절반)
+    return pd.DataFrame({
+        'ticker': ticker,
+        'date': dates.normalize(),
+        'open': df['Open'].to_numpy(dtype='float32'),
+        'high': df['High'].to_numpy(dtype='float32'),
+        'low': df['Low'].to_numpy(dtype='float32'),
+        'close': df['Close'].to_numpy(dtype='float32'),
+        'adjusted_close': df['Adj Close'].to_numpy(dtype='float32'),
+        'volume': df['Volume'].to_numpy(),
+    })
+
 
 def fetch_ticker_data(
     ticker: str,
     start_date: date,
     end_date: date,
-    max_retries: int = 3,
-    retry_delay: int = 5
+    max_retries: int = 5,
+    retry_delay: int = 2,
+    session=None
 ) -> Optional[pd.DataFrame]:
     """
     Yahoo Finance에서 티커 데이터를 수집합니다.
@@ -27,10 +79,12 @@ def fetch_ticker_data(
         start_date: 시작 날짜
         end_date: 종료 날짜
         max_retries: 최대 재시도 횟수
-        retry_delay: 재시도 간 대기 시간 (초)
+        retry_delay: 첫 재시도 대기 시간 (초), 이후 2배씩 증가 (최대 MAX_RETRY_DELAY)
+        session: yfinance에 넘길 curl_cffi 세션 (None이면 yfinance 공유 세션 사용)
 
     Returns:
-        DataFrame with columns: [Open, High, Low, Close, Adj Close, Volume]
+        DataFrame with columns: OHLCV_COLUMNS
+        (ticker, date, open, high, low, close, adjusted_close, volume)
         또는 실패 시 None
     """
     for attempt in range(max_retries):
@@ -38,7 +92,7 @@ def fetch_ticker_data(
             logger.info(f"Fetching {ticker} from {start_date} to {end_date} (attempt {attempt + 1}/{max_retries})")
 
             # yfinance로 데이터 다운로드
-            ticker_obj = yf.Ticker(ticker)
+            ticker_obj = _get_ticker(ticker, session)
             df = ticker_obj.history(
                 start=start_date,
                 end=end_date + timedelta(days=1),  # end_date 포함
@@ -50,26 +104,7 @@ def fetch_ticker_data(
                 logger.warning(f"No data found for {ticker}")
                 return None
 
-            # 인덱스(날짜)를 컬럼으로 변환
-            df = df.reset_index()
-
-            # 컬럼명 표준화
-            df = df.rename(columns={
-                'Date': 'date',
-                'Open': 'open',
-                'High': 'high',
-                'Low': 'low',
-                'Close': 'close',
-                'Adj Close': 'adj_close',
-                'Volume': 'volume'
-            })
-
-            # 필요한 컬럼만 선택
-            df = df[['date', 'open', 'high', 'low', 'close', 'adj_close', 'volume']]
-
-            # date 컬럼을 datetime.date로 변환 (timezone 제거)
-            if pd.api.types.is_datetime64_any_dtype(df['date']):
-                df['date'] = df['date'].dt.date
+            df = _to_ohlcv_frame(df, ticker)
 
             # 데이터 검증
             if validate_data(df, ticker):
@@ -82,8 +117,10 @@ def fetch_ticker_data(
         except Exception as e:
             logger.error(f"Error fetching {ticker} (attempt {attempt + 1}/{max_retries}): {e}")
             if attempt < max_retries - 1:
-                logger.info(f"Retrying in {retry_delay} seconds...")
-                time.sleep(retry_delay)
+                # 429(rate limit) 등 일시적 오류는 지수 백오프로 대기 후 재시도
+                delay = min(retry_delay * 2 ** attempt, MAX_RETRY_DELAY)
+                logger.info(f"Retrying in {delay} seconds...")
+                time.sleep(delay)
             else:
                 logger.error(f"Max retries reached for {ticker}")
                 return None
@@ -91,6 +128,73 @@ def fetch_ticker_data(
     return None
 
 
+def fetch_ticker_batch(
+    tickers: list[str],
+    start_date: date,
+    end_date: date,
+    threads: int = 4
+) -> Dict[str, Optional[pd.DataFrame]]:
+    """
+    여러 티커를 yf.download 한 번의 호출로 수집합니다.
+
+    티커마다 fetch_ticker_data를 호출하는 대신 yfinance가 내부적으로 묶어서
+    (threads개 스레드로) 받아오게 한다. 모든 티커에 같은 기간을 적용하므로
+    티커별 기간이 다른 증분 업데이트에는 fetch_ticker_data를 사용한다.
+
+    Args:
+        tickers: 티커 심볼 리스트
+        start_date: 시작 날짜
+        end_date: 종료 날짜
+        threads: yfinance 내부 동시 요청 수
+
+    Returns:
+        {ticker: OHLCV_COLUMNS 형식 DataFrame 또는 실패 시 None}
+    """
+    logger.info(f"Fetching {len(tickers)} tickers from {start_date} to {end_date} (batch)")
+    try:
+        raw = yf.download(
+            tickers,
+            start=start_date,
+            end=end_date + timedelta(days=1),  # end_date 포함
+            group_by='ticker',
+            auto_adjust=False,  # Adj Close를 별도로 가져옴
+            actions=False,  # Dividends, Stock Splits 제외
+            threads=threads,
+            progress=False
+        )
+    except Exception as e:
+        logger.error(f"Error fetching batch {tickers}: {e}")
+        return {ticker: None for ticker in tickers}
+
+    results = {}
+    fetched = set(raw.columns.get_level_values(0)) if raw is not None else set()
+    for ticker in tickers:
+        if ticker not in fetched:
+            logger.warning(f"No data found for {ticker}")
+            results[ticker] = None
+            continue
+
+        # 여러 티커의 날짜를 합친 인덱스이므로 이 티커에 없는 날짜(전부 NaN)는 제거
+        df = raw[ticker].dropna(how='all')
+        if df.empty:
+            logger.warning(f"No data found for {ticker}")
+            results[ticker] = None
+            continue
+
+        df = _to_ohlcv_frame(df, ticker)
+        # NaN 행 때문에 float로 바뀐 volume을 정수로 복원
+        df['volume'] = df['volume'].fillna(0).astype('int64')
+
+        if validate_data(df, ticker):
+            logger.info(f"Successfully fetched {len(df)} rows for {ticker}")
+            results[ticker] = df
+        else:
+            logger.warning(f"Data validation failed for {ticker}")
+            results[ticker] = None
+
+    return results
+
+
 def validate_data(df: pd.DataFrame, ticker: str) -> bool:
     """
     수집한 데이터를 검증합니다.
@@ -107,33 +211,38 @@ def validate_data(df: pd.DataFrame, ticker: str) -> bool:
         return False
 
     # 필수 컬럼 확인
-    required_columns = ['date', 'open', 'high', 'low', 'close', 'adj_close', 'volume']
+    required_columns = ['date', 'open', 'high', 'low', 'close', 'adjusted_close', 'volume']
     missing_columns = set(required_columns) - set(df.columns)
     if missing_columns:
         logger.error(f"Missing columns for {ticker}: {missing_columns}")
         return False
 
+    # 정상 데이터에서는 전체 검사 한 번씩으로 끝나도록, 문제가 있는 경우에만 컬럼별 개수를 센다
+
     # NULL 값 확인
-    null_counts = df[required_columns].isnull().sum()
-    if null_counts.any():
-        logger.warning(f"NULL values found in {ticker}: {null_counts[null_counts > 0].to_dict()}")
+    null_mask = df[required_columns].isna().to_numpy()
+    if null_mask.any():
+        null_counts = null_mask.sum(axis=0)
+        bad = {col: int(n) for col, n in zip(required_columns, null_counts) if n}
+        logger.warning(f"NULL values found in {ticker}: {bad}")
         # NULL이 있어도 일단 통과 (ClickHouse에서 처리)
 
-    # 가격 검증 (음수 또는 0 확인)
-    price_columns = ['open', 'high', 'low', 'close', 'adj_close']
-    for col in price_columns:
-        if (df[col] <= 0).any():
-            invalid_count = (df[col] <= 0).sum()
-            logger.warning(f"Invalid {col} values (<=0) for {ticker}: {invalid_count} rows")
+    # 가격 검증 (음수 또는 0 확인): 가격 컬럼을 한 배열로 모아 비교 한 번
+    price_columns = ['open', 'high', 'low', 'close', 'adjusted_close']
+    prices = df[price_columns].to_numpy(dtype=np.float64)
+    invalid = prices <= 0
+    bad_cols = invalid.any(axis=0)
+    for i in np.flatnonzero(bad_cols):
+        logger.warning(f"Invalid {price_columns[i]} values (<=0) for {ticker}: {int(invalid[:, i].sum())} rows")
 
     # OHLC 관계 검증 (high >= low)
-    if (df['high'] < df['low']).any():
-        invalid_count = (df['high'] < df['low']).sum()
+    invalid_count = int(np.count_nonzero(prices[:, 1] < prices[:, 2]))
+    if invalid_count:
         logger.warning(f"Invalid OHLC relationship (high < low) for {ticker}: {invalid_count} rows")
 
     # Volume 검증 (음수 확인)
-    if (df['volume'] < 0).any():
-        invalid_count = (df['volume'] < 0).sum()
+    invalid_count = int(np.count_nonzero(df['volume'].to_numpy() < 0))
+    if invalid_count:
         logger.warning(f"Invalid volume values (<0) for {ticker}: {invalid_count} rows")
 
     return True
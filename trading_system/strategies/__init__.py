@@ -4,12 +4,15 @@
 [ 전략 등록 방식 ]
     @register("전략이름") 데코레이터를 붙이면 STRATEGY_REGISTRY에 자동 등록.
     run_backtest.py에서 이름만으로 전략 클래스를 찾아 생성할 수 있다.
+    create_strategy()는 _STRATEGY_MODULES에서 요청된 전략의 모듈만 임포트하고,
+    목록에 없는 이름이면 이 디렉토리의 전략 모듈을 모두 임포트해서 찾는다.
 
 [ 새 전략 추가 방법 ]
     1. 이 디렉토리에 새 .py 파일 생성
     2. TradingStrategy를 상속받는 클래스 작성
     3. @register("이름") 데코레이터 추가
-    4. config.yaml에서 strategy.name을 해당 이름으로 설정
+    4. _STRATEGY_MODULES에 "이름": 모듈 경로 추가 (생략해도 동작하지만 전체 모듈을 임포트함)
+    5. config.yaml에서 strategy.name을 해당 이름으로 설정
     → 끝. run_backtest.py 수정 불필요.
 """
 
@@ -19,9 +22,17 @@ from typing import Any
 
 from trading_system.core.trading_strategy import TradingStrategy
 
-# 전략 이름 → 전략 클래스 매핑
+# 전략 이름 → 전략 클래스 매핑 (모듈이 임포트되어 @register가 실행된 전략만)
 STRATEGY_REGISTRY: dict[str, type[TradingStrategy]] = {}
 
+# 전략 이름 → 모듈 경로 (create_strategy()가 요청된 전략 모듈만 임포트할 때 사용)
+_STRATEGY_MODULES: dict[str, str] = {
+    "split_buy": "trading_system.strategies.split_buy_strategy",
+    "ma_strategy": "trading_system.strategies.ma_strategy",
+    "ma_cross": "trading_system.strategies.ma_cross_strategy",
+    "weighted_ma": "trading_system.strategies.weighted_ma_strategy",
+}
+
 
 def register(name: str):
     """전략 클래스를 STRATEGY_REGISTRY에 등록하는 데코레이터."""
@@ -41,6 +52,13 @@ def create_strategy(name: str, params: dict[str, Any] | None = None) -> TradingS
     Raises:
         ValueError: 등록되지 않은 전략 이름
     """
+    if name not in STRATEGY_REGISTRY:
+        module_name = _STRATEGY_MODULES.get(name)
+        if module_name is not None:
+            import_module(module_name)
+        if name not in STRATEGY_REGISTRY:
+            # _STRATEGY_MODULES에 없는 전략 (또는 다른 이름으로 등록된 전략)
+            _import_all()
     if name not in STRATEGY_REGISTRY:
         available = ", ".join(sorted(STRATEGY_REGISTRY.keys()))
         raise ValueError(f"알 수 없는 전략: '{name}'. 사용 가능: {available}")
@@ -48,19 +66,15 @@ def create_strategy(name: str, params: dict[str, Any] | None = None) -> TradingS
 
 
 def list_strategies() -> list[str]:
-    """등록된 전략 이름 목록 반환."""
+    """등록된 전략 이름 목록 반환 (모든 전략 모듈을 임포트)."""
+    _import_all()
     return sorted(STRATEGY_REGISTRY.keys())
 
 
-def _auto_discover():
-    """이 디렉토리의 모든 전략 모듈을 자동 임포트하여 @register가 실행되게 한다."""
+def _import_all():
+    """이 디렉토리의 모든 전략 모듈을 임포트하여 @register가 실행되게 한다."""
     strategies_dir = Path(__file__).parent
     for py_file in strategies_dir.glob("*.py"):
         if py_file.name.startswith("_"):
             continue
-        module_name = f"trading_system.strategies.{py_file.stem}"
-        import_module(module_name)
-
-
-# 모듈 로드 시 자동 탐색
-_auto_discover()
+        import_module(f"trading_system.strategies.{py_file.stem}")
@@ -23,13 +23,18 @@
 
 from typing import Any
 
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 from trading_system.core.trading_strategy import (
+    LazyReason,
     PositionInfo,
+    Reason,
     Signal,
     SignalType,
     TradingStrategy,
+    hold_signal,
 )
 from trading_system.strategies import register
 
@@ -48,34 +53,80 @@ class MACrossStrategy(TradingStrategy):
     def __init__(self, params: dict[str, Any] | None = None):
         merged = {**self.DEFAULT_PARAMS, **(params or {})}
         super().__init__(name="ma_cross", params=merged)
+        # ticker → (전체 종가 배열, 행별 MA 배열). prepare()에서 채움
+        self._prepared: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        # 매 봉마다 호출되는 경로에서 dict 조회 + 형변환을 반복하지 않도록 생성 시 한 번만 변환
+        self.ma_period: int = int(merged["ma_period"])
+        self.position_size_pct: float = float(merged["position_size_pct"])
+        self.min_volume_threshold: int = int(merged["min_volume_threshold"])
+        self._total_seed: float = float(merged["total_seed"])
+
+    @classmethod
+    def compute_signals(cls, close: np.ndarray, ma_period: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """전체 종가 배열에 대해 MA와 돌파/이탈 시점을 한 번에 계산.
+
+        Args:
+            close: 날짜순 종가 배열
+            ma_period: 이동평균 기간
 
-    @property
-    def ma_period(self) -> int:
-        return int(self.params["ma_period"])
-
-    @property
-    def position_size_pct(self) -> float:
-        return float(self.params["position_size_pct"])
-
-    @property
-    def min_volume_threshold(self) -> int:
-        return int(self.params["min_volume_threshold"])
-
-    def is_above_ma(self, market_data: pd.DataFrame) -> tuple[bool, float, float | None]:
+        Returns:
+            (ma, entries, exits)
+            - ma: 행별 MA (앞쪽 ma_period - 1개 행은 NaN)
+            - entries: 가격이 MA 위로 올라선 행 (전일에는 MA 이하)
+            - exits: 가격이 MA 아래로 내려간 행 (전일에는 MA 이상)
+        """
+        ma = np.full(len(close), np.nan)
+        if len(close) >= ma_period:
+            # 행별 슬라이스 평균과 같은 값이 나오도록 윈도우마다 float64로 합산
+            ma[ma_period - 1:] = sliding_window_view(close, ma_period).mean(axis=1, dtype=np.float64)
+
+        above = close > ma
+        below = close < ma
+        entries = above.copy()
+        entries[1:] &= ~above[:-1]
+        exits = below.copy()
+        exits[1:] &= ~below[:-1]
+        return ma, entries, exits
+
+    def prepare(self, ticker: str, market_data: pd.DataFrame) -> None:
+        """백테스트 시작 시 종목 전체 구간의 MA를 미리 계산 (매일 윈도우 평균을 다시 내지 않음)."""
+        close = market_data["close"].to_numpy()
+        ma, _, _ = self.compute_signals(close, self.ma_period)
+        self._prepared[ticker] = (close, ma)
+
+    def is_above_ma(
+        self,
+        market_data: pd.DataFrame,
+        ticker: str | None = None,
+    ) -> tuple[bool, float, float | None]:
         """현재가가 이동평균선 위에 있는지 판단.
 
+        ticker를 주고 market_data가 prepare()에 넘긴 데이터의 슬라이스이면
+        미리 계산한 MA를 행 위치로 읽는다.
+
         Returns:
             (가격 > MA 여부, 현재가, MA값 또는 None)
         """
         if market_data.empty:
             return False, 0.0, None
 
-        current_price = float(market_data.iloc[-1]["close"])
+        # Series 연산 대신 종가 ndarray 한 번만 꺼내서 사용
+        closes = market_data["close"].to_numpy()
+        current_price = float(closes[-1])
 
-        if len(market_data) < self.ma_period:
+        if len(closes) < self.ma_period:
             return False, current_price, None
 
-        ma_value = float(market_data["close"].tail(self.ma_period).mean())
+        prepared = self._prepared.get(ticker)
+        if prepared is not None:
+            full_close, ma = prepared
+            row = market_data.index[-1]
+            # 엔진이 전달하는 슬라이스는 prepare()에 넘긴 데이터와 버퍼를 공유하고 인덱스가 행 위치
+            if 0 <= row < len(ma) and np.may_share_memory(closes, full_close) and full_close[row] == closes[-1]:
+                ma_value = float(ma[row])
+                return current_price > ma_value, current_price, ma_value
+
+        ma_value = float(closes[-self.ma_period:].mean(dtype=np.float64))
         return current_price > ma_value, current_price, ma_value
 
     def should_buy(
@@ -83,9 +134,13 @@ class MACrossStrategy(TradingStrategy):
         market_data: pd.DataFrame,
         position_info: PositionInfo,
         available_cash: float,
-    ) -> tuple[bool, str]:
-        """매수 조건: 미보유 + 가격 > MA."""
-        above, current_price, ma_value = self.is_above_ma(market_data)
+        ma_state: tuple[bool, float, float | None] | None = None,
+    ) -> tuple[bool, Reason]:
+        """매수 조건: 미보유 + 가격 > MA.
+
+        ma_state: 호출자가 이미 계산한 is_above_ma() 결과 (없으면 여기서 계산)
+        """
+        above, current_price, ma_value = ma_state or self.is_above_ma(market_data, position_info.ticker)
 
         if ma_value is None:
             return False, f"데이터 부족 (최소 {self.ma_period}일 필요)"
@@ -94,12 +149,12 @@ class MACrossStrategy(TradingStrategy):
             return False, "이미 보유 중"
 
         if not above:
-            return False, f"가격이 MA 이하 (현재: {current_price:,.0f}, MA{self.ma_period}: {ma_value:,.0f})"
+            return False, LazyReason("가격이 MA 이하 (현재: {:,.0f}, MA{}: {:,.0f})", current_price, self.ma_period, ma_value)
 
         if self.min_volume_threshold > 0:
-            current_volume = int(market_data.iloc[-1]["volume"])
+            current_volume = int(market_data["volume"].iat[-1])
             if current_volume < self.min_volume_threshold:
-                return False, f"거래량 부족 ({current_volume:,} < {self.min_volume_threshold:,})"
+                return False, LazyReason("거래량 부족 ({:,} < {:,})", current_volume, self.min_volume_threshold)
 
         diff_pct = (current_price - ma_value) / ma_value * 100
         return True, f"가격이 MA{self.ma_period} 돌파 (현재: {current_price:,.0f}, MA: {ma_value:,.0f}, +{diff_pct:.2f}%)"
@@ -108,12 +163,16 @@ class MACrossStrategy(TradingStrategy):
         self,
         market_data: pd.DataFrame,
         position_info: PositionInfo,
-    ) -> tuple[bool, str]:
-        """매도 조건: 보유 중 + 가격 < MA → 전량 매도."""
+        ma_state: tuple[bool, float, float | None] | None = None,
+    ) -> tuple[bool, Reason]:
+        """매도 조건: 보유 중 + 가격 < MA → 전량 매도.
+
+        ma_state: 호출자가 이미 계산한 is_above_ma() 결과 (없으면 여기서 계산)
+        """
         if position_info.quantity <= 0:
             return False, "보유 수량 없음"
 
-        above, current_price, ma_value = self.is_above_ma(market_data)
+        above, current_price, ma_value = ma_state or self.is_above_ma(market_data, position_info.ticker)
 
         if ma_value is None:
             return False, "MA 계산 불가"
@@ -122,7 +181,7 @@ class MACrossStrategy(TradingStrategy):
             profit_rate = (current_price - position_info.avg_price) / position_info.avg_price * 100 if position_info.avg_price > 0 else 0
             return True, f"가격이 MA{self.ma_period} 하회 (현재: {current_price:,.0f}, MA: {ma_value:,.0f}, 수익률: {profit_rate:.2f}%)"
 
-        return False, f"홀딩 (현재가: {current_price:,.0f} > MA{self.ma_period}: {ma_value:,.0f})"
+        return False, LazyReason("홀딩 (현재가: {:,.0f} > MA{}: {:,.0f})", current_price, self.ma_period, ma_value)
 
     def generate_signal(
         self,
@@ -133,18 +192,16 @@ class MACrossStrategy(TradingStrategy):
         """매매 시그널 생성. 매도 우선 판단 후 매수 판단."""
         ticker = position_info.ticker
 
-        if market_data.empty or len(market_data) < self.ma_period:
-            return Signal(
-                signal_type=SignalType.HOLD,
-                ticker=ticker,
-                reason=f"데이터 부족 (최소 {self.ma_period}일 필요)",
-            )
+        if len(market_data) < self.ma_period:
+            return hold_signal(ticker, f"데이터 부족 (최소 {self.ma_period}일 필요)")
 
-        current_price = float(market_data.iloc[-1]["close"])
+        # MA 판단은 한 번만 하고 매도/매수 판단에 그대로 넘긴다
+        ma_state = self.is_above_ma(market_data, ticker)
+        _, current_price, ma_value = ma_state
 
         # 매도 우선
         if position_info.quantity > 0:
-            sell, reason = self.should_sell(market_data, position_info)
+            sell, reason = self.should_sell(market_data, position_info, ma_state=ma_state)
             if sell:
                 return Signal(
                     signal_type=SignalType.SELL,
@@ -155,7 +212,7 @@ class MACrossStrategy(TradingStrategy):
                 )
 
         # 매수
-        buy, reason = self.should_buy(market_data, position_info, available_cash)
+        buy, reason = self.should_buy(market_data, position_info, available_cash, ma_state=ma_state)
         if buy:
             qty = self.calculate_position_size(available_cash, Signal(
                 signal_type=SignalType.BUY,
@@ -171,12 +228,14 @@ class MACrossStrategy(TradingStrategy):
                     reason=reason,
                 )
 
-        _, _, ma_value = self.is_above_ma(market_data)
-        ma_str = f"{ma_value:,.0f}" if ma_value else "N/A"
+        if ma_value:
+            reason = LazyReason("조건 미충족 (현재가: {:,.0f}, MA{}: {:,.0f})", current_price, self.ma_period, ma_value)
+        else:
+            reason = LazyReason("조건 미충족 (현재가: {:,.0f}, MA{}: N/A)", current_price, self.ma_period)
         return Signal(
             signal_type=SignalType.HOLD,
             ticker=ticker,
-            reason=f"조건 미충족 (현재가: {current_price:,.0f}, MA{self.ma_period}: {ma_str})",
+            reason=reason,
         )
 
     def calculate_position_size(self, available_cash: float, signal: Signal) -> int:
@@ -184,6 +243,6 @@ class MACrossStrategy(TradingStrategy):
         if signal.price <= 0:
             return 0
 
-        position_size = float(self.params["total_seed"]) * self.position_size_pct / 100
+        position_size = self._total_seed * self.position_size_pct / 100
         buy_amount = min(position_size, available_cash)
         return int(buy_amount // signal.price)
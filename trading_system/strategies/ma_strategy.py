@@ -30,21 +30,29 @@
 
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 from trading_system.core.trading_strategy import (
+    LazyReason,
     PositionInfo,
+    Reason,
     Signal,
     SignalType,
     TradingStrategy,
+    hold_signal,
 )
 from trading_system.strategies import register
+from trading_system.strategies.ma_cross_strategy import MACrossStrategy
 
 
 @register("ma_strategy")
 class MovingAverageStrategy(TradingStrategy):
     """이동평균선 기반 전략 구현체."""
 
+    # generate_signal_fast() 구현 (엔진이 DataFrame 대신 배열 뷰로 호출)
+    supports_fast_path = True
+
     # config.yaml에서 오버라이드 가능한 기본값
     DEFAULT_PARAMS = {
         "total_seed": 10_000_000,        # 총 시드머니
@@ -58,24 +66,34 @@ class MovingAverageStrategy(TradingStrategy):
         # DEFAULT_PARAMS를 기본으로 하고, 전달된 params로 오버라이드
         merged = {**self.DEFAULT_PARAMS, **(params or {})}
         super().__init__(name="ma_strategy", params=merged)
-
-    @property
-    def ma_period(self) -> int:
-        return int(self.params["ma_period"])
-
-    @property
-    def position_size_pct(self) -> float:
-        return float(self.params["position_size_pct"])
-
-    @property
-    def min_volume_threshold(self) -> int:
-        return int(self.params["min_volume_threshold"])
-
-    def calculate_ma(self, market_data: pd.DataFrame) -> float | None:
+        # ticker → (전체 종가 배열, 행별 MA 배열). prepare()에서 채움
+        self._prepared: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        # 매 봉마다 호출되는 경로에서 dict 조회 + 형변환을 반복하지 않도록 생성 시 한 번만 변환
+        self.ma_period: int = int(merged["ma_period"])
+        self.position_size_pct: float = float(merged["position_size_pct"])
+        self.min_volume_threshold: int = int(merged["min_volume_threshold"])
+        # 1회 매수 금액 (total_seed × position_size_pct / 100)
+        self._position_size: float = float(merged["total_seed"]) * self.position_size_pct / 100
+
+    def prepare(self, ticker: str, market_data: pd.DataFrame) -> None:
+        """백테스트 시작 시 종목 전체 구간의 MA를 미리 계산 (매일 ma_period개 종가를 다시 합산하지 않음)."""
+        close = market_data["close"].to_numpy()
+        ma, _, _ = MACrossStrategy.compute_signals(close, self.ma_period)
+        self._prepared[ticker] = (close, ma)
+
+    def calculate_ma(
+        self,
+        market_data: pd.DataFrame,
+        ticker: str | None = None,
+        *,
+        closes: np.ndarray | None = None,
+    ) -> float | None:
         """이동평균선 계산.
 
         Args:
             market_data: OHLCV 데이터
+            ticker: 종목 코드. prepare()에 넘긴 데이터의 슬라이스이면 미리 계산한 MA를 행 위치로 읽음
+            closes: 호출자가 이미 꺼낸 종가 배열 (없으면 여기서 조회)
 
         Returns:
             이동평균선 값 또는 None (데이터 부족 시)
@@ -83,10 +101,24 @@ class MovingAverageStrategy(TradingStrategy):
         if len(market_data) < self.ma_period:
             return None
 
-        # 최근 ma_period 일간의 종가 평균
-        recent_closes = market_data["close"].tail(self.ma_period)
-        ma_value = float(recent_closes.mean())
-        return ma_value
+        if closes is None:
+            closes = market_data["close"].to_numpy()
+        # 엔진이 넘긴 슬라이스면 인덱스가 prepare() 데이터 기준 행 위치
+        row = market_data.index[-1] if ticker in self._prepared else -1
+        return self._ma_at(ticker, row, closes)
+
+    def _ma_at(self, ticker: str | None, row: int, closes: np.ndarray) -> float:
+        """closes[-1] 시점의 MA. prepare()한 데이터의 row행이면 미리 계산한 값을 읽음 (len(closes) >= ma_period 가정)."""
+        prepared = self._prepared.get(ticker)
+        if prepared is not None:
+            full_close, ma = prepared
+            # 엔진이 전달하는 데이터는 prepare()에 넘긴 데이터와 버퍼를 공유하고 row가 행 위치
+            if 0 <= row < len(ma) and np.may_share_memory(closes, full_close) and full_close[row] == closes[-1]:
+                return float(ma[row])
+
+        # 최근 ma_period 일간의 종가 평균 (Series.tail/mean 대신 ndarray 슬라이스)
+        recent_closes = closes[-self.ma_period:]
+        return float(recent_closes.mean(dtype=np.float64))
 
     def generate_signal(
         self,
@@ -95,28 +127,46 @@ class MovingAverageStrategy(TradingStrategy):
         available_cash: float,
     ) -> Signal:
         """매매 시그널 생성. 매도 우선 판단 후 매수 판단."""
-        if market_data.empty or len(market_data) < self.ma_period:
-            return Signal(
-                signal_type=SignalType.HOLD,
-                ticker=position_info.ticker,
-                reason=f"데이터 부족 (최소 {self.ma_period}일 필요)"
-            )
-
-        current_price = float(market_data.iloc[-1]["close"])
+        if len(market_data) < self.ma_period:
+            return hold_signal(position_info.ticker, f"데이터 부족 (최소 {self.ma_period}일 필요)")
+
+        # 종가 배열은 한 번만 꺼내서 MA 계산/should_sell/should_buy에 넘김
+        closes = market_data["close"].to_numpy()
+        row = market_data.index[-1] if position_info.ticker in self._prepared else -1
+        return self._decide(market_data, closes, None, row, position_info, available_cash)
+
+    def generate_signal_fast(
+        self,
+        closes: np.ndarray,
+        volumes: np.ndarray,
+        row: int,
+        position_info: PositionInfo,
+        available_cash: float,
+    ) -> Signal:
+        """종가/거래량 배열로 시그널 생성 (generate_signal()과 같은 판단)."""
+        if len(closes) < self.ma_period:
+            return hold_signal(position_info.ticker, f"데이터 부족 (최소 {self.ma_period}일 필요)")
+        return self._decide(None, closes, volumes, row, position_info, available_cash)
+
+    def _decide(
+        self,
+        market_data: pd.DataFrame | None,
+        closes: np.ndarray,
+        volumes: np.ndarray | None,
+        row: int,
+        position_info: PositionInfo,
+        available_cash: float,
+    ) -> Signal:
+        """generate_signal/generate_signal_fast 공통 판단. 매도 우선 판단 후 매수 판단."""
+        current_price = float(closes[-1])
         ticker = position_info.ticker
 
         # 이동평균선 계산
-        ma_value = self.calculate_ma(market_data)
-        if ma_value is None:
-            return Signal(
-                signal_type=SignalType.HOLD,
-                ticker=ticker,
-                reason="이동평균선 계산 실패"
-            )
+        ma_value = self._ma_at(ticker, row, closes)
 
         # 매도를 먼저 체크 → 손실을 빠르게 방지하기 위해
         if position_info.quantity > 0:
-            should_sell, sell_reason = self.should_sell(market_data, position_info, ma_value)
+            should_sell, sell_reason = self.should_sell(market_data, position_info, ma_value, closes=closes)
             if should_sell:
                 return Signal(
                     signal_type=SignalType.SELL,
@@ -127,7 +177,9 @@ class MovingAverageStrategy(TradingStrategy):
                 )
 
         # 매수 조건 체크
-        should_buy, buy_reason = self.should_buy(market_data, position_info, available_cash, ma_value)
+        should_buy, buy_reason = self.should_buy(
+            market_data, position_info, available_cash, ma_value, closes=closes, volumes=volumes
+        )
         if should_buy:
             qty = self.calculate_position_size(available_cash, Signal(
                 signal_type=SignalType.BUY,
@@ -146,7 +198,7 @@ class MovingAverageStrategy(TradingStrategy):
         return Signal(
             signal_type=SignalType.HOLD,
             ticker=ticker,
-            reason=f"조건 미충족 (현재가: {current_price:,.0f}, MA{self.ma_period}: {ma_value:,.0f})"
+            reason=LazyReason("조건 미충족 (현재가: {:,.0f}, MA{}: {:,.0f})", current_price, self.ma_period, ma_value)
         )
 
     def calculate_position_size(self, available_cash: float, signal: Signal) -> int:
@@ -159,8 +211,7 @@ class MovingAverageStrategy(TradingStrategy):
         if signal.price <= 0:
             return 0
 
-        position_size = float(self.params["total_seed"]) * self.position_size_pct / 100
-        buy_amount = min(position_size, available_cash)
+        buy_amount = min(self._position_size, available_cash)
         quantity = int(buy_amount // signal.price)
         return quantity
 
@@ -170,33 +221,36 @@ class MovingAverageStrategy(TradingStrategy):
         position_info: PositionInfo,
         available_cash: float,
         ma_value: float,
-    ) -> tuple[bool, str]:
+        *,
+        closes: np.ndarray | None = None,
+        volumes: np.ndarray | None = None,
+    ) -> tuple[bool, Reason]:
         """매수 조건 판단.
 
         조건: 현재가 > 이동평균선
+        closes/volumes: 호출자가 이미 꺼낸 종가/거래량 배열 (없으면 market_data에서 조회)
         """
-        if len(market_data) < self.ma_period:
+        if len(closes if closes is not None else market_data) < self.ma_period:
             return False, "데이터 부족"
 
-        current_price = float(market_data.iloc[-1]["close"])
-        current_volume = int(market_data.iloc[-1]["volume"])
-
         # 이미 보유 중이면 매수하지 않음 (단일 포지션 전략)
         if position_info.quantity > 0:
             return False, "이미 보유 중"
 
         # 가용 현금 체크
-        position_size = float(self.params["total_seed"]) * self.position_size_pct / 100
-        if available_cash < position_size * 0.5:  # 최소 절반은 있어야
+        if available_cash < self._position_size * 0.5:  # 최소 절반은 있어야
             return False, "가용 현금 부족"
 
+        # 컬럼 조회(Series 생성)는 앞의 조건을 통과한 경우에만, 필요한 시점에 한 번씩
         # 거래량 조건
+        current_volume = int(volumes[-1] if volumes is not None else market_data["volume"].iat[-1])
         if current_volume < self.min_volume_threshold:
-            return False, f"거래량 부족 ({current_volume:,} < {self.min_volume_threshold:,})"
+            return False, LazyReason("거래량 부족 ({:,} < {:,})", current_volume, self.min_volume_threshold)
 
         # 가격이 이동평균선보다 높아야 매수
+        current_price = float(closes[-1]) if closes is not None else float(market_data["close"].iat[-1])
         if current_price <= ma_value:
-            return False, f"가격이 MA 이하 (현재: {current_price:,.0f}, MA{self.ma_period}: {ma_value:,.0f})"
+            return False, LazyReason("가격이 MA 이하 (현재: {:,.0f}, MA{}: {:,.0f})", current_price, self.ma_period, ma_value)
 
         price_diff_pct = (current_price - ma_value) / ma_value * 100
         return True, f"가격이 MA{self.ma_period} 돌파 (현재: {current_price:,.0f}, MA: {ma_value:,.0f}, +{price_diff_pct:.2f}%)"
@@ -206,15 +260,18 @@ class MovingAverageStrategy(TradingStrategy):
         market_data: pd.DataFrame,
         position_info: PositionInfo,
         ma_value: float,
-    ) -> tuple[bool, str]:
+        *,
+        closes: np.ndarray | None = None,
+    ) -> tuple[bool, Reason]:
         """매도 조건 판단.
 
         조건: 현재가 < 이동평균선 (전량 매도)
+        closes: 호출자가 이미 꺼낸 종가 배열 (없으면 여기서 조회)
         """
         if position_info.quantity <= 0 or position_info.avg_price <= 0:
             return False, "보유 수량 없음"
 
-        current_price = float(market_data.iloc[-1]["close"])
+        current_price = float(closes[-1]) if closes is not None else float(market_data["close"].iat[-1])
         avg_price = position_info.avg_price
 
         profit_rate = (current_price - avg_price) / avg_price * 100
@@ -223,4 +280,6 @@ class MovingAverageStrategy(TradingStrategy):
         if current_price < ma_value:
             return True, f"가격이 MA{self.ma_period} 하회 (현재: {current_price:,.0f}, MA: {ma_value:,.0f}, 수익률: {profit_rate:.2f}%)"
 
-        return False, f"홀딩 (현재가: {current_price:,.0f} > MA{self.ma_period}: {ma_value:,.0f}, 수익률: {profit_rate:.2f}%)"
+        return False, LazyReason(
+            "홀딩 (현재가: {:,.0f} > MA{}: {:,.0f}, 수익률: {:.2f}%)", current_price, self.ma_period, ma_value, profit_rate
+        )
@@ -33,13 +33,17 @@
 
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 from trading_system.core.trading_strategy import (
+    LazyReason,
     PositionInfo,
+    Reason,
     Signal,
     SignalType,
     TradingStrategy,
+    hold_signal,
 )
 from trading_system.strategies import register
 
@@ -48,6 +52,9 @@ from trading_system.strategies import register
 class SplitBuyStrategy(TradingStrategy):
     """분할매수-목표수익 전략 구현체."""
 
+    # generate_signal_fast() 구현 (엔진이 DataFrame 대신 배열 뷰로 호출)
+    supports_fast_path = True
+
     # config.yaml에서 오버라이드 가능한 기본값
     DEFAULT_PARAMS = {
         "total_seed": 10_000_000,        # 총 시드머니
@@ -65,34 +72,62 @@ class SplitBuyStrategy(TradingStrategy):
         # DEFAULT_PARAMS를 기본으로 하고, 전달된 params로 오버라이드
         merged = {**self.DEFAULT_PARAMS, **(params or {})}
         super().__init__(name="split_buy", params=merged)
-
-    @property
-    def split_count(self) -> int:
-        return int(self.params["split_count"])
-
-    @property
-    def buy_threshold(self) -> float:
-        return float(self.params["buy_threshold"])
-
-    @property
-    def lookback_days(self) -> int:
-        return int(self.params["lookback_days"])
-
-    @property
-    def sell_profit_rate(self) -> float:
-        return float(self.params["sell_profit_rate"])
-
-    @property
-    def stop_loss_rate(self) -> float:
-        return float(self.params["stop_loss_rate"])
-
-    @property
-    def min_volume_threshold(self) -> int:
-        return int(self.params["min_volume_threshold"])
-
-    @property
-    def max_loss_per_day(self) -> float:
-        return float(self.params["max_loss_per_day"])
+        # 매 봉마다 호출되는 경로에서 dict 조회 + 형변환을 반복하지 않도록 생성 시 한 번만 변환
+        self.split_count: int = int(merged["split_count"])
+        self.buy_threshold: float = float(merged["buy_threshold"])
+        self.lookback_days: int = int(merged["lookback_days"])
+        self.sell_profit_rate: float = float(merged["sell_profit_rate"])
+        self.stop_loss_rate: float = float(merged["stop_loss_rate"])
+        self.min_volume_threshold: int = int(merged["min_volume_threshold"])
+        self.max_loss_per_day: float = float(merged["max_loss_per_day"])
+        # 1회 매수 금액 (total_seed / split_count)
+        self._position_size: float = float(merged["total_seed"]) / self.split_count
+        # ticker → (전체 종가 배열, 행별 매수 후보 여부). prepare()에서 채움
+        self._prepared: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+
+    def compute_buy_candidates(self, close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+        """전체 구간에 대해 포지션 상태와 무관한 매수 조건(하락률, 거래량)을 한 번에 계산.
+
+        Args:
+            close: 날짜순 종가 배열
+            volume: 날짜순 거래량 배열
+
+        Returns:
+            행별 bool 배열. False인 행은 보유 상태/현금과 관계없이 should_buy()가 False
+        """
+        candidates = np.zeros(len(close), dtype=bool)
+        k = self.lookback_days
+        if len(close) > k:
+            # should_buy()와 같은 값이 나오도록 float64로 올려서 같은 순서로 계산
+            close = close.astype(np.float64)
+            prev, cur = close[:-k], close[k:]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                drop_rate = (prev - cur) / prev * 100
+            candidates[k:] = (
+                (prev > 0)
+                & (drop_rate > self.buy_threshold)
+                & (volume[k:] >= self.min_volume_threshold)
+            )
+        return candidates
+
+    def prepare(self, ticker: str, market_data: pd.DataFrame) -> None:
+        """백테스트 시작 시 종목 전체 구간의 매수 후보 행을 미리 계산 (후보가 아닌 날은 should_buy()를 건너뜀)."""
+        if self.lookback_days < 1:
+            return
+        close = market_data["close"].to_numpy()
+        volume = market_data["volume"].to_numpy()
+        self._prepared[ticker] = (close, self.compute_buy_candidates(close, volume))
+
+    def _is_buy_candidate(self, ticker: str, row: int, closes: np.ndarray) -> bool:
+        """prepare()로 계산한 매수 후보 여부. 미리 계산한 값을 쓸 수 없으면 True (should_buy()로 판단)."""
+        prepared = self._prepared.get(ticker)
+        if prepared is None:
+            return True
+        full_close, candidates = prepared
+        # 엔진이 전달하는 데이터는 prepare()에 넘긴 데이터와 버퍼를 공유하고 row가 행 위치
+        if 0 <= row < len(candidates) and np.may_share_memory(closes, full_close) and full_close[row] == closes[-1]:
+            return bool(candidates[row])
+        return True
 
     def generate_signal(
         self,
@@ -101,15 +136,44 @@ class SplitBuyStrategy(TradingStrategy):
         available_cash: float,
     ) -> Signal:
         """매매 시그널 생성. 매도 우선 판단 후 매수 판단."""
-        if market_data.empty or len(market_data) < self.lookback_days + 1:
-            return Signal(signal_type=SignalType.HOLD, ticker=position_info.ticker, reason="데이터 부족")
+        if len(market_data) < self.lookback_days + 1:
+            return hold_signal(position_info.ticker, "데이터 부족")
+
+        # 종가 배열은 한 번만 꺼내서 should_sell/should_buy에 넘김
+        closes = market_data["close"].to_numpy()
+        # 엔진이 넘긴 슬라이스면 인덱스가 prepare() 데이터 기준 행 위치
+        row = market_data.index[-1] if position_info.ticker in self._prepared else -1
+        return self._decide(market_data, closes, None, row, position_info, available_cash)
 
-        current_price = float(market_data.iloc[-1]["close"])
+    def generate_signal_fast(
+        self,
+        closes: np.ndarray,
+        volumes: np.ndarray,
+        row: int,
+        position_info: PositionInfo,
+        available_cash: float,
+    ) -> Signal:
+        """종가/거래량 배열로 시그널 생성 (generate_signal()과 같은 판단)."""
+        if len(closes) < self.lookback_days + 1:
+            return hold_signal(position_info.ticker, "데이터 부족")
+        return self._decide(None, closes, volumes, row, position_info, available_cash)
+
+    def _decide(
+        self,
+        market_data: pd.DataFrame | None,
+        closes: np.ndarray,
+        volumes: np.ndarray | None,
+        row: int,
+        position_info: PositionInfo,
+        available_cash: float,
+    ) -> Signal:
+        """generate_signal/generate_signal_fast 공통 판단. 매도 우선 판단 후 매수 판단."""
+        current_price = float(closes[-1])
         ticker = position_info.ticker
 
         # 매도를 먼저 체크 → 익절/손절 기회를 놓치지 않기 위해
         if position_info.quantity > 0:
-            should_sell, sell_reason = self.should_sell(market_data, position_info)
+            should_sell, sell_reason = self.should_sell(market_data, position_info, closes=closes)
             if should_sell:
                 return Signal(
                     signal_type=SignalType.SELL,
@@ -119,8 +183,14 @@ class SplitBuyStrategy(TradingStrategy):
                     reason=sell_reason,
                 )
 
+        # 하락률/거래량 조건을 만족하지 않는 날은 매수 판단 자체를 생략
+        if not self._is_buy_candidate(ticker, row, closes):
+            return hold_signal(ticker, "조건 미충족")
+
         # 매수 조건 체크
-        should_buy, buy_reason = self.should_buy(market_data, position_info, available_cash)
+        should_buy, buy_reason = self.should_buy(
+            market_data, position_info, available_cash, closes=closes, volumes=volumes
+        )
         if should_buy:
             qty = self.calculate_position_size(available_cash, Signal(
                 signal_type=SignalType.BUY,
@@ -136,7 +206,7 @@ class SplitBuyStrategy(TradingStrategy):
                     reason=buy_reason,
                 )
 
-        return Signal(signal_type=SignalType.HOLD, ticker=ticker, reason="조건 미충족")
+        return hold_signal(ticker, "조건 미충족")
 
     def calculate_position_size(self, available_cash: float, signal: Signal) -> int:
         """1회 매수 수량 계산.
@@ -148,8 +218,7 @@ class SplitBuyStrategy(TradingStrategy):
         if signal.price <= 0:
             return 0
 
-        position_size = float(self.params["total_seed"]) / self.split_count
-        buy_amount = min(position_size, available_cash)
+        buy_amount = min(self._position_size, available_cash)
         quantity = int(buy_amount // signal.price)
         return quantity
 
@@ -158,36 +227,43 @@ class SplitBuyStrategy(TradingStrategy):
         market_data: pd.DataFrame,
         position_info: PositionInfo,
         available_cash: float,
-    ) -> tuple[bool, str]:
-        """매수 조건 판단."""
-        if len(market_data) < self.lookback_days + 1:
-            return False, "데이터 부족"
+        *,
+        closes: np.ndarray | None = None,
+        volumes: np.ndarray | None = None,
+    ) -> tuple[bool, Reason]:
+        """매수 조건 판단.
 
-        current_price = float(market_data.iloc[-1]["close"])
-        current_volume = int(market_data.iloc[-1]["volume"])
-        n_days_ago_close = float(market_data.iloc[-(self.lookback_days + 1)]["close"])
+        closes/volumes: 호출자가 이미 꺼낸 종가/거래량 배열 (없으면 market_data에서 조회)
+        """
+        if len(closes if closes is not None else market_data) < self.lookback_days + 1:
+            return False, "데이터 부족"
 
         # 매수 가능 횟수 체크
         if position_info.buy_count >= self.split_count:
             return False, f"최대 매수 횟수({self.split_count}) 도달"
 
         # 가용 현금 체크
-        position_size = float(self.params["total_seed"]) / self.split_count
-        if available_cash < position_size * 0.5:  # 최소 절반은 있어야
+        if available_cash < self._position_size * 0.5:  # 최소 절반은 있어야
             return False, "가용 현금 부족"
 
+        # 컬럼 조회(Series 생성)는 앞의 조건을 통과한 경우에만, 필요한 시점에 한 번씩
         # 거래량 조건
+        current_volume = int(volumes[-1] if volumes is not None else market_data["volume"].iat[-1])
         if current_volume < self.min_volume_threshold:
-            return False, f"거래량 부족 ({current_volume} < {self.min_volume_threshold})"
+            return False, LazyReason("거래량 부족 ({} < {})", current_volume, self.min_volume_threshold)
 
         # 가격 하락 조건: n일 전 종가 대비 buy_threshold% 초과 하락
         # buy_threshold=0이면 조금이라도 떨어지면 매수 (같으면 안 사고, 떨어져야 삼)
+        if closes is None:
+            closes = market_data["close"].to_numpy()
+        current_price = float(closes[-1])
+        n_days_ago_close = float(closes[-(self.lookback_days + 1)])
         if n_days_ago_close <= 0:
             return False, "기준가 오류"
 
         drop_rate = (n_days_ago_close - current_price) / n_days_ago_close * 100
         if drop_rate <= self.buy_threshold:  # < 에서 <= 로 변경 (가격이 떨어져야만 매수)
-            return False, f"하락률 부족 ({drop_rate:.2f}% <= {self.buy_threshold}%)"
+            return False, LazyReason("하락률 부족 ({:.2f}% <= {}%)", drop_rate, self.buy_threshold)
 
         return True, f"{self.lookback_days}일 전 대비 {drop_rate:.2f}% 하락"
 
@@ -195,12 +271,17 @@ class SplitBuyStrategy(TradingStrategy):
         self,
         market_data: pd.DataFrame,
         position_info: PositionInfo,
-    ) -> tuple[bool, str]:
-        """매도 조건 판단."""
+        *,
+        closes: np.ndarray | None = None,
+    ) -> tuple[bool, Reason]:
+        """매도 조건 판단.
+
+        closes: 호출자가 이미 꺼낸 종가 배열 (없으면 여기서 조회)
+        """
         if position_info.quantity <= 0 or position_info.avg_price <= 0:
             return False, "보유 수량 없음"
 
-        current_price = float(market_data.iloc[-1]["close"])
+        current_price = float(closes[-1]) if closes is not None else float(market_data["close"].iat[-1])
         avg_price = position_info.avg_price
 
         profit_rate = (current_price - avg_price) / avg_price * 100
@@ -213,4 +294,4 @@ class SplitBuyStrategy(TradingStrategy):
         if self.stop_loss_rate > 0 and profit_rate <= -self.stop_loss_rate:
             return True, f"손절 ({profit_rate:.2f}% <= -{self.stop_loss_rate}%)"
 
-        return False, f"현재 수익률: {profit_rate:.2f}%"
+        return False, LazyReason("현재 수익률: {:.2f}%", profit_rate)
@@ -24,9 +24,11 @@ from typing import Any
 import pandas as pd
 
 from trading_system.core.trading_strategy import (
+    LazyReason,
     PositionInfo,
     Signal,
     SignalType,
+    hold_signal,
 )
 from trading_system.strategies import register
 from trading_system.strategies.ma_cross_strategy import MACrossStrategy
@@ -45,10 +47,8 @@ class WeightedMAStrategy(MACrossStrategy):
         merged = {**self.DEFAULT_PARAMS, **(params or {})}
         super().__init__(params=merged)
         self.name = "weighted_ma"
-
-    @property
-    def weights(self) -> dict[str, float]:
-        return dict(self.params.get("weights", {}))
+        # 매 봉마다 params에서 복사하지 않도록 생성 시 한 번만 만들어 둠
+        self.weights: dict[str, float] = dict(merged.get("weights", {}))
 
     def generate_signal(
         self,
@@ -61,28 +61,16 @@ class WeightedMAStrategy(MACrossStrategy):
 
         # weights에 없는 티커는 거래하지 않음
         if ticker not in self.weights:
-            return Signal(
-                signal_type=SignalType.HOLD,
-                ticker=ticker,
-                reason=f"weights에 미포함 ({ticker})",
-            )
+            return hold_signal(ticker, "weights에 미포함")
 
-        if market_data.empty or len(market_data) < self.ma_period:
-            return Signal(
-                signal_type=SignalType.HOLD,
-                ticker=ticker,
-                reason=f"데이터 부족 (최소 {self.ma_period}일 필요)",
-            )
+        if len(market_data) < self.ma_period:
+            return hold_signal(ticker, f"데이터 부족 (최소 {self.ma_period}일 필요)")
 
-        current_price = float(market_data.iloc[-1]["close"])
-        above, _, ma_value = self.is_above_ma(market_data)
+        # 현재가도 is_above_ma가 꺼낸 종가 배열에서 함께 받는다 (close 컬럼 조회 한 번)
+        above, current_price, ma_value = self.is_above_ma(market_data, ticker)
 
         if ma_value is None:
-            return Signal(
-                signal_type=SignalType.HOLD,
-                ticker=ticker,
-                reason="MA 계산 불가",
-            )
+            return hold_signal(ticker, "MA 계산 불가")
 
         weight = self.weights[ticker]
 
@@ -99,8 +87,7 @@ class WeightedMAStrategy(MACrossStrategy):
 
         # 가격 > MA → 목표 비중만큼 매수 (이미 보유분 차감)
         if above:
-            total_seed = float(self.params["total_seed"])
-            target_amount = total_seed * weight
+            target_amount = self._total_seed * weight
             current_holding_value = position_info.quantity * current_price
             deficit = target_amount - current_holding_value
 
@@ -116,11 +103,16 @@ class WeightedMAStrategy(MACrossStrategy):
                         reason=f"목표 비중 매수 (MA{self.ma_period} 상회, 비중: {weight:.0%}, 목표: {target_amount:,.0f}, 현재: {current_holding_value:,.0f})",
                     )
 
-        ma_str = f"{ma_value:,.0f}" if ma_value else "N/A"
+        if ma_value:
+            reason = LazyReason(
+                "조건 미충족 (현재가: {:,.0f}, MA{}: {:,.0f}, 비중: {:.0%})", current_price, self.ma_period, ma_value, weight
+            )
+        else:
+            reason = LazyReason("조건 미충족 (현재가: {:,.0f}, MA{}: N/A, 비중: {:.0%})", current_price, self.ma_period, weight)
         return Signal(
             signal_type=SignalType.HOLD,
             ticker=ticker,
-            reason=f"조건 미충족 (현재가: {current_price:,.0f}, MA{self.ma_period}: {ma_str}, 비중: {weight:.0%})",
+            reason=reason,
         )
 
     def calculate_position_size(self, available_cash: float, signal: Signal) -> int:
@@ -128,7 +120,6 @@ class WeightedMAStrategy(MACrossStrategy):
         if signal.price <= 0:
             return 0
 
-        total_seed = float(self.params["total_seed"])
         # 전체 비중의 합으로 나눔 (기본적으로 전체 시드를 사용)
-        buy_amount = min(total_seed, available_cash)
+        buy_amount = min(self._total_seed, available_cash)
         return int(buy_amount // signal.price)
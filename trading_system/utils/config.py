@@ -17,13 +17,12 @@
     - 엔진 생성 시 config.backtest의 값을 사용
 """
 
+import copy
 import json
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
-import yaml
-
 
 @dataclass
 class StrategyConfig:
@@ -68,6 +67,16 @@ class DataIngestionConfig:
     retry_delay: int = 5
 
 
+# _from_dict에서 섹션 키를 거를 때 쓰는 필드명 집합 (모듈 로드 시 한 번만 계산)
+_BACKTEST_FIELDS = frozenset(BacktestConfig.__dataclass_fields__)
+_DATABASE_FIELDS = frozenset(DatabaseConfig.__dataclass_fields__)
+_DATA_INGESTION_FIELDS = frozenset(DataIngestionConfig.__dataclass_fields__)
+
+# from_yaml 결과 캐시: (클래스, 절대 경로) → (파일 mtime_ns, Config)
+# 같은 파일을 여러 번 로드해도 파일이 바뀌지 않았으면 YAML을 다시 파싱하지 않음
+_config_cache: dict[tuple[type, str], tuple[int, "Config"]] = {}
+
+
 @dataclass
 class Config:
     """전체 설정. from_yaml() 또는 from_json()으로 파일에서 로드."""
@@ -80,18 +89,46 @@ class Config:
 
     @classmethod
     def from_yaml(cls, path: str | Path) -> "Config":
-        """YAML 파일에서 설정 로드."""
+        """YAML 파일에서 설정 로드.
+
+        파일의 mtime이 마지막 로드 때와 같으면 캐시된 설정의 복사본을 반환한다.
+        (반환값을 수정해도 캐시에는 영향 없음)
+        """
         path = Path(path)
+        key = (cls, str(path.resolve()))
+        mtime_ns = path.stat().st_mtime_ns
+        cached = _config_cache.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            return copy.deepcopy(cached[1])
+
+        # yaml은 YAML 파일을 다룰 때만 import (from_json 등 다른 경로의 import 비용 절감)
+        import yaml
+
+        # libyaml이 있으면 C 로더 사용 (순수 Python 로더보다 훨씬 빠름)
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
         with open(path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
-        return cls._from_dict(data)
+            data = yaml.load(f, Loader=loader)
+        config = cls._from_dict(data)
+        _config_cache[key] = (mtime_ns, config)
+        return copy.deepcopy(config)
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """from_yaml 캐시 비우기."""
+        _config_cache.clear()
 
     @classmethod
     def from_json(cls, path: str | Path) -> "Config":
         """JSON 파일에서 설정 로드."""
         path = Path(path)
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        # orjson이 설치되어 있으면 사용 (표준 json보다 빠름), 없으면 표준 json
+        try:
+            import orjson
+        except ImportError:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        else:
+            data = orjson.loads(path.read_bytes())
         return cls._from_dict(data)
 
     @classmethod
@@ -118,17 +155,10 @@ class Config:
             tickers=strategy_tickers,
             params=strategy_params,
         )
-        backtest = BacktestConfig(**{
-            k: v for k, v in backtest_data.items()
-            if k in BacktestConfig.__dataclass_fields__
-        })
-        database = DatabaseConfig(**{
-            k: v for k, v in database_data.items()
-            if k in DatabaseConfig.__dataclass_fields__
-        })
+        backtest = BacktestConfig(**{k: backtest_data[k] for k in _BACKTEST_FIELDS & backtest_data.keys()})
+        database = DatabaseConfig(**{k: database_data[k] for k in _DATABASE_FIELDS & database_data.keys()})
         data_ingestion = DataIngestionConfig(**{
-            k: v for k, v in data_ingestion_data.items()
-            if k in DataIngestionConfig.__dataclass_fields__
+            k: data_ingestion_data[k] for k in _DATA_INGESTION_FIELDS & data_ingestion_data.keys()
         })
 
         return cls(
@@ -147,6 +177,8 @@ class Config:
 
     def save_yaml(self, path: str | Path) -> None:
         """YAML 파일로 저장."""
+        import yaml
+
         path = Path(path)
         path.parent.mkdir(parents=True, exist_ok=True)
         with open(path, "w", encoding="utf-8") as f:
@@ -7,24 +7,43 @@
 [ 로그 파일 위치 ]
     {log_dir}/{name}_{YYYYMMDD}.log (예: logs/trading_system_20240601.log)
 
+[ 파일 기록 방식 ]
+    로거에는 QueueHandler만 붙이고, 실제 파일 쓰기는 QueueListener 스레드가
+    MemoryHandler(1024건 단위 또는 ERROR 이상에서 flush) → FileHandler로 처리한다.
+    백테스트 루프에서 로그를 남겨도 디스크 I/O를 기다리지 않는다.
+    콘솔 출력은 print()와 순서가 섞이지 않도록 기존처럼 로거에서 바로 출력한다.
+    프로세스 종료 시(atexit) stop_log_queue()로 남은 로그를 모두 기록한다.
+    ProcessPoolExecutor 워커는 리스너 스레드를 물려받지 못하고 atexit도 실행되지 않으므로
+    initializer로 init_worker_logger()를 지정해 큐 없이 FileHandler로 바로 기록한다.
+
 [ 호출하는 곳 ]
     - run_backtest.py에서 setup_logger() 호출
     - backtest/engine.py에서 logging.getLogger("trading_system.backtest") 사용
 """
 
+import atexit
 import logging
+import queue
 import sys
 from datetime import datetime
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
 from pathlib import Path
 
+# 로거 이름 → (QueueListener, MemoryHandler). stop_log_queue()에서 정리
+_log_queues: dict[str, tuple[QueueListener, MemoryHandler]] = {}
+
 
 def setup_logger(
     name: str = "trading_system",
     level: str = "INFO",
     log_dir: str = "logs",
     console: bool = True,
+    queue_file: bool = True,
 ) -> logging.Logger:
-    """로거 설정. 파일 핸들러(일별) + 콘솔 핸들러 등록."""
+    """로거 설정. 파일 핸들러(일별) + 콘솔 핸들러 등록.
+
+    queue_file=False이면 파일 핸들러를 큐/버퍼 없이 로거에 바로 붙인다.
+    """
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, level.upper()))
 
@@ -36,16 +55,20 @@ def setup_logger(
         datefmt="%Y-%m-%d %H:%M:%S",
     )
 
-    # 파일 핸들러
+    # 파일 핸들러 (기본은 큐 → 별도 스레드에서 모아서 기록, 파일은 첫 기록 시점에 열림)
     log_path = Path(log_dir)
     log_path.mkdir(parents=True, exist_ok=True)
     today = datetime.now().strftime("%Y%m%d")
     file_handler = logging.FileHandler(
         log_path / f"{name}_{today}.log",
         encoding="utf-8",
+        delay=True,
     )
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    if not queue_file:
+        logger.addHandler(file_handler)
+    else:
+        _start_log_queue(logger, name, file_handler)
 
     # 콘솔 핸들러
     if console:
@@ -54,3 +77,42 @@ def setup_logger(
         logger.addHandler(console_handler)
 
     return logger
+
+
+def _start_log_queue(logger: logging.Logger, name: str, file_handler: logging.Handler) -> None:
+    """QueueHandler → QueueListener 스레드 → MemoryHandler → file_handler 연결."""
+    memory_handler = MemoryHandler(capacity=1024, flushLevel=logging.ERROR, target=file_handler)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, memory_handler)
+    listener.start()
+    if not _log_queues:
+        atexit.register(stop_log_queue)
+    _log_queues[name] = (listener, memory_handler)
+    logger.addHandler(QueueHandler(log_queue))
+
+
+def init_worker_logger(name: str = "trading_system", level: str = "INFO", log_dir: str = "logs") -> None:
+    """ProcessPoolExecutor 워커용 로거 재설정 (initializer로 사용).
+
+    fork된 워커는 부모의 QueueHandler만 물려받고 리스너 스레드는 없으므로
+    그대로 두면 파일 로그가 아무도 읽지 않는 큐에 쌓인다. 물려받은 핸들러를 떼고
+    파일에 바로 기록하는 핸들러로 다시 설정한다.
+    """
+    logger = logging.getLogger(name)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    # 부모 프로세스의 리스너 항목이므로 워커에서 멈추지 않고 버린다
+    _log_queues.clear()
+    setup_logger(name, level=level, log_dir=log_dir, queue_file=False)
+
+
+def stop_log_queue(name: str | None = None) -> None:
+    """파일 로그 큐를 멈추고 버퍼에 남은 로그를 파일에 기록. name이 None이면 전체."""
+    names = list(_log_queues) if name is None else [name]
+    for key in names:
+        entry = _log_queues.pop(key, None)
+        if entry is None:
+            continue
+        listener, memory_handler = entry
+        listener.stop()          # 큐에 남은 레코드를 모두 처리한 뒤 스레드 종료
+        memory_handler.flush()